@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+Parser LL(1) generado para grammars/python_subset.g
+(sha256 de la gramática: 3784e6249d7d2a305aa70411c857caa97197df705ee1ae835696f7ce9b1fe690)
+
+Generado por src/syntax/codegen.py; no editar a mano. Regenerar con:
+    python -m src.main --mode compile --grammar grammars/python_subset.g
+
+parse(tokens) recibe tuplas (tipo, lexema, linea, col) (lista o cualquier
+iterable) y retorna (ok, mensaje), igual que parse_ll1 con esta gramática.
+"""
+
+from typing import Dict, Iterable, List, NamedTuple, Tuple
+
+Token = Tuple[str, str, int, int]  # (tipo, lexema, linea, col)
+
+GRAMMAR_SHA256 = '3784e6249d7d2a305aa70411c857caa97197df705ee1ae835696f7ce9b1fe690'
+START = 'S'
+
+# Símbolos: no-terminales 0..8, terminales 9..; END marca el fondo de la pila
+NT_COUNT = 9
+START_ID = 0
+END = -1
+NO_TERM = -2
+NAMES = ('S', 'stmt', 'assign', 'printStmt', 'expr', "expr'", 'term', "term'", 'factor', '$', 'id', '=', 'print', '(', ')', '+', '*', 'NUM')
+TERM_IDS = {'$': 9, 'id': 10, '=': 11, 'print': 12, '(': 13, ')': 14, '+': 15, '*': 16, 'NUM': 17}
+
+# Producciones (A, rhs), su rhs como texto (para deriv) y, por id, el rhs
+# invertido listo para apilar
+PRODUCTIONS = (('S', ('stmt', 'S')), ('S', ('ε',)), ('stmt', ('assign',)), ('stmt', ('printStmt',)), ('assign', ('id', '=', 'expr')), ('printStmt', ('print', '(', 'expr', ')')), ('expr', ('term', "expr'")), ("expr'", ('+', 'term', "expr'")), ("expr'", ('ε',)), ('term', ('factor', "term'")), ("term'", ('*', 'factor', "term'")), ("term'", ('ε',)), ('factor', ('(', 'expr', ')')), ('factor', ('id',)), ('factor', ('NUM',)))
+PROD_STRS = ('stmt S', 'ε', 'assign', 'printStmt', 'id = expr', 'print ( expr )', "term expr'", "+ term expr'", 'ε', "factor term'", "* factor term'", 'ε', '( expr )', 'id', 'NUM')
+RHS_REV = ((0, 1), (), (2,), (3,), (4, 11, 10), (14, 4, 13, 12), (5, 6), (5, 6, 15), (), (7, 8), (7, 8, 16), (), (14, 4, 13), (10,), (17,))
+
+# Tabla LL(1): por no-terminal, id de terminal -> id de producción (primera de la celda)
+ROWS = ({10: 0, 12: 0, 9: 1}, {10: 2, 12: 3}, {10: 4}, {12: 5}, {10: 6, 13: 6, 17: 6}, {15: 7, 9: 8, 10: 8, 12: 8, 14: 8}, {10: 9, 13: 9, 17: 9}, {16: 10, 9: 11, 10: 11, 12: 11, 14: 11, 15: 11}, {13: 12, 10: 13, 17: 14})
+# Orden de columnas de cada fila (desempate si el tipo del token satisface dos)
+ROW_POS = ({10: 0, 12: 1, 9: 2}, {10: 0, 12: 1}, {10: 0}, {12: 0}, {10: 0, 13: 1, 17: 2}, {15: 0, 9: 1, 10: 2, 12: 3, 14: 4}, {10: 0, 13: 1, 17: 2}, {16: 0, 9: 1, 10: 2, 12: 3, 14: 4, 15: 5}, {13: 0, 10: 1, 17: 2})
+EXPECTED = ('$", "id", "print', 'id", "print', 'id', 'print', '(", "NUM", "id', '$", ")", "+", "id", "print', '(", "NUM", "id', '$", ")", "*", "+", "id", "print', '(", "NUM", "id')
+
+SYMBOL_TERMS = frozenset({'!=', '(', ')', '*', '+', ',', '-', '.', '/', ':', ';', '<', '<=', '=', '==', '>', '>=', '[', ']', '{', '}'})
+TYPE_ALIASES = {'identificador': 'id', 'tk_entero': 'NUM'}
+OK_MESSAGE = 'El analisis sintactico ha finalizado exitosamente.'
+
+# --- Copiado de src/syntax/program.py ---
+
+class ParseProgram(NamedTuple):
+    start_id: int
+    nt_count: int
+    names: Tuple[str, ...]  # id -> símbolo
+    term_ids: Dict[str, int]  # terminal -> id
+    productions: Tuple[Tuple[str, Tuple[str, ...]], ...]  # id -> (A, rhs)
+    prod_strs: Tuple[str, ...]  # id -> rhs como en la tabla ("X Y Z" o "ε"), para deriv
+    rhs_rev: Tuple[Tuple[int, ...], ...]  # id -> rhs invertido, sin ε
+    rows: Tuple[Dict[int, int], ...]  # no-terminal -> {terminal: producción}
+    row_pos: Tuple[Dict[int, int], ...]  # no-terminal -> {terminal: orden en la fila}
+    expected: Tuple[str, ...]  # no-terminal -> texto "se esperaba"
+
+def _type_cols(prog: ParseProgram, ttype: str) -> Tuple[int, ...]:
+    """Ids de los terminales que un token de tipo `ttype` satisface por su tipo
+    (lo mismo que parser_ll1.type_columns, en ids)."""
+    names = []
+    if ttype in TYPE_ALIASES:
+        names.append(TYPE_ALIASES[ttype])
+    if ttype not in SYMBOL_TERMS:
+        names.append(ttype)
+    return tuple(prog.term_ids[n] for n in names if n in prog.term_ids)
+
+def _by_type(prog: ParseProgram, X: int, tc: Tuple[int, ...]) -> int | None:
+    row = prog.rows[X]
+    hits = [c for c in tc if c in row]
+    if not hits:
+        return None
+    if len(hits) > 1:
+        hits.sort(key=prog.row_pos[X].__getitem__)
+    return row[hits[0]]
+
+class _TypeClasses:
+    """Tipos de token vistos en un parse, numerados a medida que aparecen:
+    columnas de cada tipo (tcs[k]) y, por no-terminal, la producción que toca
+    cuando solo decide el tipo (by_type[X][k]). Así la celda de un token que
+    no es terminal por su lexema (identificadores, enteros) sale de una lista."""
+
+    def __init__(self, prog: ParseProgram):
+        self.prog = prog
+        self.ids: Dict[str, int] = {}
+        self.tcs: List[Tuple[int, ...]] = []
+        self.by_type: List[List[int | None]] = [[] for _ in range(prog.nt_count)]
+
+    def add(self, ttype: str) -> int:
+        k = self.ids.get(ttype)
+        if k is None:
+            k = self.ids[ttype] = len(self.tcs)
+            tc = _type_cols(self.prog, ttype)
+            self.tcs.append(tc)
+            for X, row in enumerate(self.by_type):
+                row.append(_by_type(self.prog, X, tc))
+        return k
+
+def _error(prog: ParseProgram, X: int, lex: str, line: int, col: int) -> str:
+    if X == END:
+        return f"<{line},{col}> Error sintactico: se encontro: \"{lex}\"; se esperaba fin de entrada"
+    what = prog.names[X] if X >= prog.nt_count else prog.expected[X]
+    return f"<{line},{col}> Error sintactico: se encontro: \"{lex}\"; se esperaba: \"{what}\""
+
+def _parse_iter(prog: ParseProgram, tokens: Iterable[Token], deriv) -> Tuple[bool, str]:
+    rows, rhs_rev, term_ids, nt_count = prog.rows, prog.rhs_rev, prog.term_ids.get, prog.nt_count
+    prod_strs, names = prog.prod_strs, prog.names
+    classes = _TypeClasses(prog)
+    type_ids, tcs, by_type, add_type = classes.ids, classes.tcs, classes.by_type, classes.add
+    stack = [END, prog.start_id]
+    pop, extend = stack.pop, stack.extend
+    # Una lista se recorre tal cual (sin copiarla); un generador, a demanda
+    it = iter(tokens)
+    tok = next(it, None) or ("EOF", "$", 1, 1)
+    lex = tok[1]
+    lt = term_ids(lex, NO_TERM)
+    k = add_type(tok[0])
+    tc = tcs[k]
+
+    while True:
+        X = pop()
+        if X >= nt_count:
+            if X == lt or X in tc:
+                tok = next(it, None) or ("EOF", "$", tok[2], tok[3])
+                lex = tok[1]
+                lt = term_ids(lex, NO_TERM)
+                k = type_ids.get(tok[0])
+                if k is None:
+                    k = add_type(tok[0])
+                tc = tcs[k]
+                continue
+            return False, _error(prog, X, lex, tok[2], tok[3])
+        if X == END:
+            if lex == "$":
+                return True, OK_MESSAGE
+            return False, _error(prog, X, lex, tok[2], tok[3])
+        p = rows[X].get(lt)
+        if p is None:
+            p = by_type[X][k]
+            if p is None:
+                return False, _error(prog, X, lex, tok[2], tok[3])
+        if deriv is not None:
+            deriv(names[X], prod_strs[p])
+        extend(rhs_rev[p])
+
+# --- Fin de lo copiado ---
+
+PROGRAM = ParseProgram(
+    start_id=START_ID,
+    nt_count=NT_COUNT,
+    names=NAMES,
+    term_ids=TERM_IDS,
+    productions=PRODUCTIONS,
+    prod_strs=PROD_STRS,
+    rhs_rev=RHS_REV,
+    rows=ROWS,
+    row_pos=ROW_POS,
+    expected=EXPECTED,
+)
+
+def parse(tokens, deriv=None):
+    """Retorna (ok, mensaje); con `deriv` se le pasa cada producción aplicada (A, "X Y Z")."""
+    return _parse_iter(PROGRAM, tokens, deriv)
@@ -2,19 +2,22 @@
 # ------------------------------------------------------------
 # Script: bench.sh
 # Descripción:
-# Ejecuta pruebas de rendimiento sobre el analizador LL(1)
-# usando diferentes entradas del proyecto.
+# Benchmark por fases del analizador LL(1) (src/bench.py):
+# gramática, FIRST/FOLLOW, PREDICT, tabla, lexer y parser por
+# separado, con entradas de distintos tamaños.
+#
+# Variables opcionales:
+#   SIZES     tamaños de entrada (por defecto 64K,1M,8M)
+#   LEXER     motor léxico (classic, regex, compact)
+#   OUT       destino del reporte JSON (por defecto outputs/bench.json)
+#   BASELINE  reporte previo para detectar regresiones
 # ------------------------------------------------------------
 
-GRAMMAR="grammars/ejemplo_p6.g"
-INPUTS=("examples/python/ok/expresion1.txt" "examples/python/ok/expresion2.txt")
+GRAMMAR="grammars/python_subset.g"
+ARGS=(--grammar "$GRAMMAR" --sizes "${SIZES:-64K,1M,8M}" --lexer "${LEXER:-classic}" --out "${OUT:-outputs/bench.json}")
+if [ -n "$BASELINE" ]; then
+  ARGS+=(--compare "$BASELINE")
+fi
 
 echo "== Benchmark de Analizador LL(1) =="
-for INPUT in "${INPUTS[@]}"; do
-  echo "Probando con: $INPUT"
-  /usr/bin/time -f "Tiempo total: %E (%S cpu)" python -m src.main \
-    --mode parse \
-    --grammar "$GRAMMAR" \
-    --input "$INPUT" \
-    > /dev/null
-done
+python -m src.bench "${ARGS[@]}"
@@ -3,17 +3,12 @@
 # Script: run_parse.sh
 # Descripción:
 # Corre el analizador sintáctico LL(1) sobre los ejemplos válidos e inválidos.
+# Usa el modo por lotes: un solo intérprete y la gramática compilada una vez.
 # ------------------------------------------------------------
 
 GRAMMAR="grammars/python_subset.g"
 
 echo "== Pruebas de Parsing =="
-for FILE in examples/python/ok/*.py; do
-  echo "[OK] Probando $FILE"
-  python -m src.main --mode parse --grammar "$GRAMMAR" --input "$FILE"
-done
-
-for FILE in examples/python/bad/*.py; do
-  echo "[BAD] Probando $FILE"
-  python -m src.main --mode parse --grammar "$GRAMMAR" --input "$FILE"
-done
+python -m src.main --mode parse --grammar "$GRAMMAR" \
+  --batch examples/python/ok examples/python/bad \
+  --summary "${SUMMARY:--}"
@@ -0,0 +1,6 @@
+# -*- coding: utf-8 -*-
+"""Proyecto Corte 2: analizador léxico + sintáctico LL(1)."""
+
+# Versión de la herramienta. Forma parte de la clave de los artefactos en
+# caché (gramáticas compiladas), así que debe subirse cuando cambie el análisis.
+__version__ = "0.2.0"
@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+"""
+analyzer.py
+-----------
+API en proceso del analizador, para usarlo como biblioteca sin pasar por la
+CLI (run_lex/run_parse trabajan con rutas, imprimen y devuelven códigos de
+salida).
+
+    from src.analyzer import Analyzer
+    an = Analyzer()
+    cg = an.load("grammars/python_subset.g")      # o an.compile(texto)
+    res = an.parse(cg, "x = 1\\n")
+    res.ok, res.status, res.exit_code, res.message, res.errors
+
+- Las gramáticas compiladas quedan en un LRU acotado (max_grammars) con clave
+  en el hash de su contenido: la misma gramática bajo dos rutas, o como texto,
+  se compila una sola vez. load() además recuerda (mtime, tamaño) por ruta para
+  no releer el archivo si no cambió. stats() da aciertos, fallos y desalojos
+- Las gramáticas se guardan congeladas (grammar_cache.freeze_grammar): son de
+  solo lectura y se pueden compartir entre hilos; el LRU se protege con un lock
+- tokenize() y parse() aceptan str o bytes (UTF-8) y devuelven un
+  AnalysisResult; los errores léxicos y sintácticos van en el resultado, no
+  como excepciones. La recuperación léxica usa el motor regex tolerante: con
+  ella `lexer` debe ser classic (por defecto) o regex, que dan los mismos
+  tokens; otro motor es un ValueError
+- FOLLOW (para --recover) se arma una vez por gramática en memoria
+"""
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Sequence, Set, Tuple
+
+from .lexer.engines import LEXERS
+from .lexer.regex_scanner import tokenize_tolerant
+from .syntax.conflicts import parse_ll1_resolve
+from .syntax.cst import CST
+from .syntax.grammar_cache import (
+    CompiledGrammar, compile_grammar, compile_grammar_cached, freeze_grammar, grammar_digest,
+)
+from .syntax.parser_ll1 import parse_ll1
+from .syntax.program import parse_program, program_for
+from .syntax.recovery import DEFAULT_MAX_ERRORS, parse_ll1_recover
+
+Token = Tuple[str, str, int, int]  # (tipo, lexema, linea, col)
+
+DEFAULT_MAX_GRAMMARS = 64
+
+OK_MESSAGE = "El analisis sintactico ha finalizado exitosamente."
+
+class AnalysisResult(NamedTuple):
+    status: str  # ok | lex_error | syntax_error
+    exit_code: int  # el mismo que daría la CLI: 0, 1 o 2
+    message: str
+    errors: Tuple[str, ...]  # errores léxicos y sintácticos, en orden
+    tokens: Sequence[Token] | None = None
+    tree: CST | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "ok"
+
+# Motores compatibles con la recuperación léxica (regex_scanner.tokenize_tolerant)
+RECOVER_LEXERS = ("classic", "regex")
+
+def _text(source: str | bytes) -> str:
+    return source.decode("utf-8") if isinstance(source, (bytes, bytearray, memoryview)) else source
+
+def _check_lexer(lexer: str, recover: bool) -> None:
+    if lexer not in LEXERS:
+        raise ValueError(f"lexer desconocido: {lexer!r}")
+    if recover and lexer not in RECOVER_LEXERS:
+        raise ValueError(f"la recuperación léxica usa el motor regex; no se combina con lexer={lexer!r}")
+
+class Analyzer:
+    def __init__(self, max_grammars: int = DEFAULT_MAX_GRAMMARS, cache_dir: str | None = None, use_cache: bool = True):
+        self.max_grammars = max_grammars
+        self.cache_dir = cache_dir
+        self.use_cache = use_cache
+        self.hits = self.misses = self.evictions = 0
+        self._grammars: "OrderedDict[str, CompiledGrammar]" = OrderedDict()  # hash -> gramática
+        self._paths: Dict[str, Tuple[Tuple[int, int], str]] = {}  # ruta -> ((mtime, tamaño), hash)
+        self._follow: Dict[str, Dict[str, Set[str]]] = {}  # hash -> FOLLOW (gramáticas del LRU)
+        self._lock = threading.Lock()
+
+    # -- gramáticas ------------------------------------------------------------
+
+    def _lookup(self, digest: str) -> CompiledGrammar | None:
+        with self._lock:
+            cg = self._grammars.get(digest)
+            if cg is not None:
+                self._grammars.move_to_end(digest)
+                self.hits += 1
+            return cg
+
+    def _insert(self, digest: str, cg: CompiledGrammar) -> CompiledGrammar:
+        with self._lock:
+            self.misses += 1
+            # Otro hilo pudo compilarla mientras tanto: se comparte la primera
+            cg = self._grammars.setdefault(digest, cg)
+            self._grammars.move_to_end(digest)
+            while len(self._grammars) > self.max_grammars:
+                old, _ = self._grammars.popitem(last=False)
+                self.evictions += 1
+                self._follow.pop(old, None)
+                for path in [p for p, (_, d) in self._paths.items() if d == old]:
+                    del self._paths[path]
+            return cg
+
+    def compile(self, text: str | bytes, source: str = "<texto>") -> CompiledGrammar:
+        """Gramática compilada (y congelada) a partir de su texto."""
+        text = _text(text)
+        digest = grammar_digest(text)
+        cg = self._lookup(digest)
+        if cg is None:
+            cg = self._insert(digest, freeze_grammar(compile_grammar(text, source=source)))
+        return cg
+
+    def load(self, path: str | os.PathLike) -> CompiledGrammar:
+        """Gramática compilada desde un archivo (usa también la caché en disco)."""
+        key = os.path.abspath(path)
+        try:
+            st = os.stat(key)
+        except OSError:
+            raise FileNotFoundError(f"Gramática no encontrada: {path}")
+        stamp = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            known = self._paths.get(key)
+        if known is not None and known[0] == stamp:
+            cg = self._lookup(known[1])
+            if cg is not None:
+                return cg
+        with open(key, "r", encoding="utf-8") as f:
+            text = f.read()
+        digest = grammar_digest(text)
+        cg = self._lookup(digest)
+        if cg is None:
+            cg = freeze_grammar(compile_grammar_cached(text, key, self.cache_dir, self.use_cache))
+            cg = self._insert(digest, cg)
+        with self._lock:
+            if digest in self._grammars:
+                self._paths[key] = (stamp, digest)
+        return cg
+
+    def follow(self, cg: CompiledGrammar) -> Dict[str, Set[str]]:
+        """FOLLOW de `cg` como conjuntos, armado una vez mientras la gramática
+        esté en el LRU (cg.FOLLOW lo reconstruye desde los bits cada vez)."""
+        digest = cg.meta["digest"]
+        with self._lock:
+            follow = self._follow.get(digest)
+        if follow is None:
+            follow = cg.FOLLOW
+            with self._lock:
+                if self._grammars.get(digest) is cg:
+                    follow = self._follow.setdefault(digest, follow)
+        return follow
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "grammars": len(self._grammars),
+                "max_grammars": self.max_grammars,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "paths": sorted(self._paths),
+            }
+
+    # -- análisis --------------------------------------------------------------
+
+    def tokenize(self, source: str | bytes, lexer: str = "classic", recover: bool = False) -> AnalysisResult:
+        """Tokens de `source`. Con recover se reportan todos los errores léxicos
+        (motor regex tolerante) en lugar de cortar en el primero."""
+        _check_lexer(lexer, recover)
+        src = _text(source)
+        if recover:
+            tokens, errors = tokenize_tolerant(src)
+            if errors:
+                return AnalysisResult("lex_error", 1, errors[0], tuple(errors), tokens)
+            return AnalysisResult("ok", 0, "", (), tokens)
+        try:
+            tokens = LEXERS[lexer](src)
+        except ValueError as e:
+            return AnalysisResult("lex_error", 1, str(e), (str(e),))
+        return AnalysisResult("ok", 0, "", (), tokens)
+
+    def parse(
+        self,
+        grammar: CompiledGrammar | str | os.PathLike,
+        source: str | bytes,
+        lexer: str = "classic",
+        recover: bool = False,
+        lex_recover: bool = False,
+        max_errors: int = DEFAULT_MAX_ERRORS,
+        tokens: bool = False,
+        tree: bool = False,
+        resolve_conflicts: bool = False,
+    ) -> AnalysisResult:
+        """Análisis sintáctico de `source` con `grammar` (compilada o ruta).
+        Mismas opciones que la CLI; con `tokens` / `tree` el resultado incluye
+        los tokens / el CST (este último sin recover; parcial si hubo error)."""
+        _check_lexer(lexer, lex_recover)
+        cg = grammar if isinstance(grammar, CompiledGrammar) else self.load(grammar)
+        src = _text(source)
+        lex_errors = []
+        if lex_recover:
+            toks, lex_errors = tokenize_tolerant(src, error_tokens=recover)
+        else:
+            try:
+                toks = LEXERS[lexer](src)
+            except ValueError as e:
+                return AnalysisResult("lex_error", 1, str(e), (str(e),))
+
+        cst = None
+        if recover:
+            ok, syntax_errors = parse_ll1_recover(cg.start, cg.G, cg.TABLE, toks, self.follow(cg),
+                                                  rows=cg.ROWS, max_errors=max_errors)
+            msg = OK_MESSAGE if ok else syntax_errors[0]
+        else:
+            cst = CST(cg.G) if tree else None
+            if resolve_conflicts and cg.meta["conflicts"]:
+                ok, msg = parse_ll1_resolve(cg.start, cg.G, cg.TABLE, toks, rows=cg.ROWS, tree=cst)
+            elif cst is not None:
+                ok, msg = parse_ll1(cg.start, cg.G, cg.TABLE, toks, rows=cg.ROWS, tree=cst)
+            else:
+                ok, msg = parse_program(program_for(cg), toks)
+            syntax_errors = [] if ok else [msg]
+        if lex_errors:
+            status, code, msg = "lex_error", 1, lex_errors[0]
+        else:
+            status, code = ("ok", 0) if ok else ("syntax_error", 2)
+        return AnalysisResult(status, code, msg, tuple(lex_errors + syntax_errors),
+                              toks if tokens else None, cst)
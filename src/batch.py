@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""
+batch.py
+--------
+Modo por lotes: analiza muchos archivos en un solo proceso (o en un pool de
+procesos) compilando la gramática una sola vez.
+
+- Entradas: directorios (recorridos recursivamente con --pattern), globs
+  (admite **) o rutas sueltas; además una lista de rutas con --files-from
+  (una por línea, '-' = stdin)
+- La gramática compilada se envía una vez a cada proceso del pool
+- La salida de cada archivo se imprime en el orden de las entradas:
+      == ruta ==
+      <misma salida que --mode lex / --mode parse>
+- Al final se emite un resumen JSON (estado, mensaje y tiempos por archivo)
+- Código de salida: 0 si todo OK; 1 si algún archivo tuvo error léxico o de
+  E/S; 2 si solo hubo errores sintácticos (igual que en modo de un archivo)
+- Con --result-cache (modo parse) los archivos que no cambiaron se sirven de
+  la caché de resultados (result_cache.py) sin lexear ni parsear; en el
+  resumen llevan "cached": true. La caché se comparte entre procesos del pool
+"""
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+from .lexer.engines import LEXERS
+from .reporter import format_token
+from .result_cache import DEFAULT_MAX_BYTES, ResultCache
+from .syntax.grammar_cache import CompiledGrammar
+from .syntax.program import parse_program, program_for
+
+_GLOB_CHARS = set("*?[")
+
+def collect_inputs(specs: Iterable[str], files_from: str | None = None, pattern: str = "*.py") -> List[str]:
+    """Expande directorios, globs y listas de archivos; sin duplicados y en orden."""
+    paths: List[str] = []
+    for spec in specs:
+        if os.path.isdir(spec):
+            paths.extend(sorted(str(p) for p in Path(spec).rglob(pattern) if p.is_file()))
+        elif _GLOB_CHARS & set(spec):
+            paths.extend(sorted(p for p in glob.glob(spec, recursive=True) if os.path.isfile(p)))
+        else:
+            paths.append(spec)
+    if files_from:
+        f = sys.stdin if files_from == "-" else open(files_from, "r", encoding="utf-8")
+        try:
+            paths.extend(line.strip() for line in f if line.strip())
+        finally:
+            if f is not sys.stdin:
+                f.close()
+    return list(dict.fromkeys(paths))
+
+# Estado por proceso (lo fija _init_worker una vez por proceso del pool)
+_STATE: Dict[str, object] = {}
+
+def _init_worker(
+    mode: str,
+    cg: CompiledGrammar | None,
+    lexer: str,
+    result_cache: str | None = None,
+    result_cache_size: int = DEFAULT_MAX_BYTES >> 20,
+) -> None:
+    _STATE["mode"] = mode
+    _STATE["cg"] = cg
+    _STATE["lexer"] = lexer
+    use_cache = result_cache and mode == "parse"
+    _STATE["cache"] = ResultCache(result_cache, result_cache_size << 20) if use_cache else None
+
+def _store(cache: ResultCache | None, key: str | None, res: Dict[str, object], output: List[str]) -> None:
+    if cache is not None and key is not None:
+        kept = {k: res[k] for k in ("status", "exit_code", "message", "tokens")}
+        cache.put(key, {"res": kept, "output": "\n".join(output)})
+
+def _analyze_file(path: str) -> Dict[str, object]:
+    """Analiza un archivo y devuelve su resultado (serializable)."""
+    mode, cg, lexer, cache = _STATE["mode"], _STATE["cg"], _STATE["lexer"], _STATE["cache"]
+    t0 = time.perf_counter()
+    res: Dict[str, object] = {"path": path, "status": "ok", "exit_code": 0, "message": "", "tokens": 0}
+    timings: Dict[str, float] = {}
+    output: List[str] = []
+    key = None
+    try:
+        try:
+            data = Path(path).read_bytes()
+            if cache is not None:
+                key = cache.key(data, cg.meta["digest"], {"via": "batch", "lexer": lexer})
+                hit = cache.get(key)
+                if hit is not None:
+                    stored = hit[0]
+                    res.update(stored["res"], cached=True)
+                    output.append(stored["output"])
+                    return res
+            # Saltos de línea universales, como read_text en modo de un archivo
+            src = data.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+        except FileNotFoundError:
+            res.update(status="io_error", exit_code=1, message=f"Archivo no encontrado: {path}")
+            output.append(res["message"])
+            return res
+        except (OSError, UnicodeDecodeError) as e:
+            res.update(status="io_error", exit_code=1, message=str(e))
+            output.append(res["message"])
+            return res
+        t1 = time.perf_counter()
+        timings["read"] = t1 - t0
+        try:
+            tokens = LEXERS[lexer](src)
+        except ValueError as e:
+            res.update(status="lex_error", exit_code=1, message=str(e))
+            output.append(res["message"])
+            _store(cache, key, res, output)
+            return res
+        t2 = time.perf_counter()
+        timings["lex"] = t2 - t1
+        res["tokens"] = len(tokens)
+        if mode == "lex":
+            output.extend(format_token(tok) for tok in tokens)
+            return res
+        ok, msg = parse_program(program_for(cg), tokens)
+        timings["parse"] = time.perf_counter() - t2
+        res["message"] = msg
+        if not ok:
+            res.update(status="syntax_error", exit_code=2)
+        output.append(msg)
+        _store(cache, key, res, output)
+        return res
+    finally:
+        timings["total"] = time.perf_counter() - t0
+        res["timings"] = {k: round(v * 1000, 3) for k, v in timings.items()}  # ms
+        res["output"] = "\n".join(output)
+
+def batch_exit_code(results: Iterable[Dict[str, object]]) -> int:
+    codes = {r["exit_code"] for r in results}
+    if 1 in codes:
+        return 1
+    return 2 if 2 in codes else 0
+
+def run_batch(
+    mode: str,
+    paths: List[str],
+    cg: CompiledGrammar | None = None,
+    lexer: str = "classic",
+    jobs: int = 1,
+    summary_path: str | None = "-",
+    result_cache: str | None = None,
+    result_cache_size: int = DEFAULT_MAX_BYTES >> 20,
+) -> int:
+    """Analiza `paths` (en orden) e imprime la salida de cada uno y el resumen."""
+    t0 = time.perf_counter()
+    results: List[Dict[str, object]] = []
+    if jobs <= 1 or len(paths) <= 1:
+        _init_worker(mode, cg, lexer, result_cache, result_cache_size)
+        mapped = map(_analyze_file, paths)
+        pool = None
+    else:
+        pool = ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(mode, cg, lexer, result_cache, result_cache_size))
+        # map conserva el orden de las entradas; chunksize amortiza el IPC
+        mapped = pool.map(_analyze_file, paths, chunksize=max(1, len(paths) // (jobs * 8)))
+    try:
+        for res in mapped:
+            out = res.pop("output")
+            print(f"== {res['path']} ==")
+            if out:
+                print(out)
+            results.append(res)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    code = batch_exit_code(results)
+    summary = {
+        "mode": mode,
+        "grammar": cg.meta.get("source") if cg is not None else None,
+        "lexer": lexer,
+        "jobs": jobs,
+        "files": results,
+        "totals": {
+            "files": len(results),
+            "ok": sum(1 for r in results if r["exit_code"] == 0),
+            "failed": sum(1 for r in results if r["exit_code"] != 0),
+            "exit_code": code,
+            "elapsed_s": round(time.perf_counter() - t0, 6),
+        },
+    }
+    if summary_path == "-":
+        print(json.dumps(summary, ensure_ascii=False))
+    elif summary_path:
+        Path(summary_path).parent.mkdir(parents=True, exist_ok=True)
+        with open(summary_path, "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+    return code
@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+"""
+bench.py
+--------
+Benchmark por fases del analizador (reemplaza la medición con /usr/bin/time
+de scripts/bench.sh, donde dominaba el arranque del intérprete).
+
+Fases medidas por separado, dentro del mismo proceso:
+- load_grammar : lectura + parse del .g
+- first_follow : FIRST y FOLLOW (máscaras de bits, por componentes conexas)
+- predict      : PREDICT de cada producción
+- table        : tabla LL(1) + índice por filas
+- tokenize     : motor léxico elegido (--lexer), por tamaño de entrada
+- parse        : parse_program (programa de enteros, program.py), el parser por
+                 defecto de --mode parse, sobre los tokens, por tamaño de entrada
+- parse_ll1    : parse_ll1 (parser de tabla, parser_ll1.py) sobre los mismos
+                 tokens, como referencia
+
+Cada fase se ejecuta `warmup` veces sin medir y `repeats` veces medidas; se
+reportan mínimo, mediana y media, el throughput (tokens/s y MB/s en las fases
+que dependen de la entrada) y el pico de memoria (tracemalloc, en una corrida
+aparte para no distorsionar los tiempos).
+
+Las entradas de cada tamaño (--sizes 64K,1M,100M) se arman repitiendo una
+plantilla válida para la gramática (por defecto, los ejemplos de
+examples/python/ok) hasta alcanzar el tamaño pedido, justo antes de medirla, y
+se libera al pasar al siguiente tamaño; con --input se usa un archivo tal cual.
+
+Salida: tabla legible y, con --out, JSON. Con --compare BASE.json se compara
+la mediana de cada fase contra la de la línea base y se marcan como regresión
+las que empeoran más de --threshold (por defecto 10%); las fases que tardan
+menos de --min-time (1 ms) no se marcan, porque ahí domina el ruido. Si hay
+alguna regresión el código de salida es 3.
+
+Ejemplo:
+    python -m src.bench --grammar grammars/python_subset.g --sizes 64K,1M,16M --lexer regex --out bench.json
+    python -m src.bench --sizes 1M --compare bench.json
+"""
+import argparse
+import gc
+import glob
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from . import __version__
+from .lexer.engines import LEXERS
+from .syntax.bitsets import build_alphabet, build_ll1_table_bits, first_bits, follow_bits, predict_bits
+from .syntax.grammar_io import parse_grammar_text
+from .syntax.parser_ll1 import parse_ll1
+from .syntax.program import build_program, parse_program
+from .syntax.table import build_row_index
+
+DEFAULT_SIZES = "64K,1M,8M"
+DEFAULT_TEMPLATE = "examples/python/ok/*.py"
+REGRESSION_EXIT = 3
+DEFAULT_MIN_TIME = 0.001
+
+_UNITS = {"": 1, "K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+
+def parse_size(text: str) -> int:
+    """'64K' -> 65536, '1.5M' -> 1572864, '1000' -> 1000."""
+    t = text.strip().upper().rstrip("B")
+    unit = t[-1] if t and t[-1] in _UNITS else ""
+    return int(float(t[:len(t) - len(unit)]) * _UNITS[unit])
+
+def build_input(template: str, size: int) -> str:
+    """Repite la plantilla (líneas completas) hasta alcanzar `size` caracteres."""
+    if not template.endswith("\n"):
+        template += "\n"
+    reps = max(1, -(-size // len(template)))
+    return template * reps
+
+def load_template(pattern: str) -> str:
+    parts = []
+    for path in sorted(glob.glob(pattern)) or [pattern]:
+        text = Path(path).read_text(encoding="utf-8")
+        parts.append(text if text.endswith("\n") else text + "\n")
+    return "".join(parts)
+
+def time_phase(fn: Callable[[], object], warmup: int, repeats: int, memory: bool) -> Tuple[Dict[str, float], object]:
+    """Ejecuta fn warmup+repeats veces; retorna (estadísticas, último resultado)."""
+    result = None
+    for _ in range(warmup):
+        result = fn()
+    times: List[float] = []
+    for _ in range(repeats):
+        result = None
+        gc.collect()
+        t0 = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - t0)
+    stats = {
+        "min_s": min(times),
+        "median_s": statistics.median(times),
+        "mean_s": statistics.fmean(times),
+        "repeats": repeats,
+    }
+    if memory:
+        # El resultado de esta corrida reemplaza al anterior (no se tienen dos a la vez)
+        result = None
+        gc.collect()
+        tracemalloc.start()
+        try:
+            result = fn()
+            stats["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return stats, result
+
+def run_bench(
+    grammar_path: str,
+    sizes: List[int],
+    lexer: str = "classic",
+    warmup: int = 1,
+    repeats: int = 5,
+    memory: bool = True,
+    input_path: str | None = None,
+    template: str = DEFAULT_TEMPLATE,
+    log=print,
+) -> Dict[str, object]:
+    results: List[Dict[str, object]] = []
+
+    def record(phase: str, stats: Dict[str, float], **extra) -> None:
+        row = {"phase": phase, **extra, **{k: round(v, 9) if isinstance(v, float) else v for k, v in stats.items()}}
+        results.append(row)
+        log(_format_row(row))
+
+    # Fases de gramática (no dependen de la entrada)
+    text = Path(grammar_path).read_text(encoding="utf-8")
+    stats, (start, G) = time_phase(lambda: parse_grammar_text(text), warmup, repeats, memory)
+    record("load_grammar", stats)
+    alphabet = build_alphabet(G)
+    ids = {a: i for i, a in enumerate(alphabet)}
+
+    def first_follow():
+        FIRST = first_bits(G, ids)
+        return FIRST, follow_bits(start, G, FIRST)
+
+    stats, (FIRST, FOLLOW) = time_phase(first_follow, warmup, repeats, memory)
+    record("first_follow", stats)
+    stats, PRED = time_phase(lambda: predict_bits(G, FIRST, FOLLOW), warmup, repeats, memory)
+    record("predict", stats)
+
+    def table():
+        t = build_ll1_table_bits(PRED, alphabet)
+        return t, build_row_index(t)
+
+    stats, (TABLE, ROWS) = time_phase(table, warmup, repeats, memory)
+    record("table", stats)
+
+    # Fases por tamaño de entrada: cada entrada se arma justo antes de medirla
+    if input_path:
+        inputs = [lambda: Path(input_path).read_text(encoding="utf-8")]
+    else:
+        base = load_template(template)
+        inputs = [lambda size=size: build_input(base, size) for size in sizes]
+    lex = LEXERS[lexer]
+    prog = build_program(start, G, ROWS)
+    for make_input in inputs:
+        src = make_input()
+        nbytes = len(src.encode("utf-8"))
+        stats, tokens = time_phase(lambda: lex(src), warmup, repeats, memory)
+        ntok = len(tokens)
+        record("tokenize", _throughput(stats, ntok, nbytes), size_bytes=nbytes, tokens=ntok)
+        for phase, parse in (
+            ("parse", lambda: parse_program(prog, tokens)),
+            ("parse_ll1", lambda: parse_ll1(start, G, TABLE, tokens, rows=ROWS)),
+        ):
+            stats, res = time_phase(parse, warmup, repeats, memory)
+            if not res[0]:
+                raise ValueError(f"La entrada de prueba no es válida para la gramática: {res[1]}")
+            record(phase, _throughput(stats, ntok, nbytes), size_bytes=nbytes, tokens=ntok)
+        del src, tokens
+
+    return {
+        "meta": {
+            "version": __version__,
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "grammar": grammar_path,
+            "lexer": lexer,
+            "warmup": warmup,
+            "repeats": repeats,
+        },
+        "results": results,
+    }
+
+def _throughput(stats: Dict[str, float], ntok: int, nbytes: int) -> Dict[str, float]:
+    t = stats["median_s"] or float("nan")
+    return {**stats, "tokens_per_s": ntok / t, "mb_per_s": nbytes / (1 << 20) / t}
+
+def _key(row: Dict[str, object]) -> Tuple[str, object]:
+    return row["phase"], row.get("size_bytes")
+
+def _format_row(row: Dict[str, object]) -> str:
+    size = f"{row['size_bytes'] / (1 << 20):9.2f} MB" if "size_bytes" in row else " " * 12
+    text = f"{row['phase']:<13}{size}  mediana {row['median_s'] * 1000:10.3f} ms  min {row['min_s'] * 1000:10.3f} ms"
+    if "tokens_per_s" in row:
+        text += f"  {row['tokens_per_s'] / 1e6:7.3f} Mtok/s  {row['mb_per_s']:8.2f} MB/s"
+    if "peak_bytes" in row:
+        text += f"  pico {row['peak_bytes'] / (1 << 20):9.2f} MB"
+    return text
+
+def compare(report: Dict[str, object], baseline: Dict[str, object], threshold: float,
+            min_time: float = DEFAULT_MIN_TIME) -> List[Dict[str, object]]:
+    """Filas (fase, tamaño) cuya mediana empeora más de `threshold` respecto de la
+    base (solo si alguna de las dos medianas supera `min_time` segundos)."""
+    base = {_key(r): r for r in baseline["results"]}
+    regressions = []
+    for row in report["results"]:
+        old = base.get(_key(row))
+        if old is None or not old["median_s"]:
+            continue
+        ratio = row["median_s"] / old["median_s"]
+        row["baseline_median_s"] = old["median_s"]
+        row["ratio"] = round(ratio, 4)
+        if ratio > 1 + threshold and max(row["median_s"], old["median_s"]) >= min_time:
+            regressions.append(row)
+    return regressions
+
+def main(argv: List[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Benchmark por fases del analizador LL(1).")
+    ap.add_argument("--grammar", default="grammars/python_subset.g", help="gramática .g")
+    ap.add_argument("--sizes", default=DEFAULT_SIZES, help=f"tamaños de entrada separados por coma (K/M/G), por defecto {DEFAULT_SIZES}")
+    ap.add_argument("--input", help="usar este archivo como única entrada (ignora --sizes)")
+    ap.add_argument("--template", default=DEFAULT_TEMPLATE, help=f"archivos (glob) que se repiten para armar las entradas, por defecto {DEFAULT_TEMPLATE}")
+    ap.add_argument("--lexer", choices=sorted(LEXERS), default="classic", help="motor léxico a medir")
+    ap.add_argument("--warmup", type=int, default=1, help="corridas previas sin medir")
+    ap.add_argument("--repeats", type=int, default=5, help="corridas medidas por fase")
+    ap.add_argument("--no-memory", action="store_true", help="no medir el pico de memoria (evita la corrida extra con tracemalloc)")
+    ap.add_argument("--out", metavar="RUTA", help="guarda el reporte JSON")
+    ap.add_argument("--compare", metavar="BASE", help="reporte JSON de referencia para detectar regresiones")
+    ap.add_argument("--threshold", type=float, default=0.10, help="empeoramiento relativo tolerado con --compare (por defecto 0.10)")
+    ap.add_argument("--min-time", type=float, default=DEFAULT_MIN_TIME, help="con --compare, no marcar fases más rápidas que esto (segundos)")
+    args = ap.parse_args(argv)
+
+    sizes = [parse_size(s) for s in args.sizes.split(",") if s.strip()]
+    report = run_bench(args.grammar, sizes, lexer=args.lexer, warmup=args.warmup, repeats=args.repeats,
+                       memory=not args.no_memory, input_path=args.input, template=args.template)
+    code = 0
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        regressions = compare(report, baseline, args.threshold, args.min_time)
+        report["regressions"] = [_key(r) for r in regressions]
+        for r in regressions:
+            print(f"✗ Regresión: {r['phase']} {r.get('size_bytes', '')} x{r['ratio']:.2f} "
+                  f"({r['baseline_median_s'] * 1000:.3f} ms -> {r['median_s'] * 1000:.3f} ms)")
+        if regressions:
+            code = REGRESSION_EXIT
+        else:
+            print(f"✓ Sin regresiones (umbral {args.threshold:.0%})")
+    if args.out:
+        Path(args.out).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.out).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    return code
+
+if __name__ == "__main__":
+    sys.exit(main())
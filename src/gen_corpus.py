@@ -0,0 +1,278 @@
+# -*- coding: utf-8 -*-
+"""
+gen_corpus.py
+-------------
+Generador determinista de entradas válidas (y opcionalmente con errores) a
+partir de cualquier gramática .g, para pruebas de carga del lexer y el parser.
+
+Generación (derivación más a la izquierda con una pila, sin recursión):
+- La "columna" de la derivación (el símbolo inicial y, repetidamente, el último
+  símbolo de la producción elegida para ella, p.ej. S -> stmt S) no suma
+  profundidad: mientras no se alcance el tamaño pedido se prefieren sus
+  producciones que la continúan; cada ítem de la columna termina en su línea
+- El resto de los no-terminales suma 1 de profundidad por nivel; se elige al
+  azar entre las producciones que todavía pueden cerrarse dentro de
+  --max-depth (altura mínima), y pasada esa profundidad, solo las de altura
+  mínima, así que la generación siempre termina
+- Misma semilla y mismos parámetros => misma salida, byte a byte
+
+Lexemas: id/identificador -> nombres v0..v63, NUM/tk_entero -> enteros,
+tk_cadena -> 'txt', un nombre de tipo de token (tk_suma) -> su símbolo, y
+cualquier otro terminal (símbolos, reservadas) -> el propio terminal.
+
+Salida en flujo (por bloques, la memoria no depende del tamaño):
+- --format source : texto fuente (para python_subset.g, un .py real)
+- --format tokens : las líneas <tipo, lexema, linea, col> de --mode lex
+
+Errores (--errors lex|syntax|mixed, --error-rate P por token): antes de un
+token se inserta un carácter inválido ($ @ ?) o un terminal que el parser
+LL(1) no acepta en ese punto (se comprueba con la pila de la derivación, que
+en una gramática LL(1) es la misma que tendrá el parser); --manifest escribe una línea JSON por error (tipo, línea, columna,
+lexema; para los léxicos, el mensaje exacto).
+
+Ejemplo:
+    python -m src.gen_corpus --grammar grammars/python_subset.g --size 100M --seed 7 --out /tmp/corpus.py
+"""
+import argparse
+import json
+import random
+import sys
+from typing import Dict, Iterator, List, Tuple
+
+from .bench import parse_size
+from .lexer.regex_scanner import tokenize_regex
+from .lexer.token_defs import TOKENS
+from .reporter import format_token
+from .syntax.grammar_cache import CompiledGrammar, compile_grammar
+from .syntax.grammar_io import EPS
+from .syntax.parser_ll1 import select_production, token_to_symbol
+
+Token = Tuple[str, str, int, int]  # (tipo, lexema, linea, col)
+
+NAMES = tuple(f"v{i}" for i in range(64))
+LEX_ERROR_CHARS = ("$", "@", "?")
+_TYPE_LEXEMES = {ttype: lex for lex, ttype in TOKENS.items()}
+_NL = object()  # marca de fin de ítem de la columna
+
+# Eventos del generador
+TOK, NEWLINE, ERROR = range(3)
+
+def min_heights(G: Dict[str, List[List[str]]]) -> Dict[str, int]:
+    """Altura mínima de un árbol de derivación de cada no-terminal (punto fijo)."""
+    INF = float("inf")
+    h: Dict[str, float] = {A: INF for A in G}
+    changed = True
+    while changed:
+        changed = False
+        for A, prods in G.items():
+            for rhs in prods:
+                v = 1 + max((h[s] if s in G else 0 for s in rhs if s != EPS), default=0)
+                if v < h[A]:
+                    h[A] = v
+                    changed = True
+    bad = [A for A, v in h.items() if v == INF]
+    if bad:
+        raise ValueError(f"Gramática: no-terminales que no derivan ninguna cadena: {', '.join(bad)}")
+    return {A: int(v) for A, v in h.items()}
+
+class _Lexemes:
+    """Lexema y tipo de token para cada terminal."""
+
+    def __init__(self, rng: random.Random):
+        self.rng = rng
+        self._fixed: Dict[str, Tuple[str, str]] = {}
+
+    def __call__(self, term: str) -> Tuple[str, str]:
+        if term in ("id", "identificador"):
+            return "identificador", self.rng.choice(NAMES)
+        if term in ("NUM", "tk_entero"):
+            return "tk_entero", str(self.rng.randrange(1000))
+        fixed = self._fixed.get(term)
+        if fixed is None:
+            lex = "'txt'" if term == "tk_cadena" else _TYPE_LEXEMES.get(term, term)
+            toks = tokenize_regex(lex)
+            if len(toks) != 1:
+                raise ValueError(f"Gramática: el terminal {term!r} no corresponde a un único token")
+            fixed = self._fixed[term] = (toks[0][0], lex)
+        return fixed
+
+def generate(
+    cg: CompiledGrammar,
+    size: int,
+    max_depth: int = 12,
+    seed: int = 0,
+    errors: str | None = None,
+    error_rate: float = 0.0,
+) -> Iterator[tuple]:
+    """Eventos (TOK, tipo, lexema), (NEWLINE,) y (ERROR, kind, tipo, lexema)
+    hasta completar una oración de ~`size` caracteres."""
+    G, rows = cg.G, cg.ROWS
+    rng = random.Random(seed)
+    choice = rng.choice
+    lexeme = _Lexemes(random.Random(seed + 1))
+    heights = min_heights(G)
+
+    def rhs_height(rhs: List[str]) -> int:
+        return max((heights[s] if s in G else 0 for s in rhs if s != EPS), default=0)
+
+    lowest = {A: [r for r in prods if rhs_height(r) == heights[A] - 1] for A, prods in G.items()}
+    # Producciones elegibles por (no-terminal, profundidad); se arman una vez
+    fitting: Dict[Tuple[str, int], List[List[str]]] = {}
+    for A, prods in G.items():
+        for d in range(max_depth):
+            fitting[(A, d)] = [r for r in prods if d + 1 + rhs_height(r) <= max_depth] or lowest[A]
+    continuing = {A: [r for r in prods if r[-1] in G] or prods for A, prods in G.items()}
+    closing = {A: [r for r in prods if r[-1] not in G] or lowest[A] for A, prods in G.items()}
+    terminals = [a for a in cg.ALPHABET if a not in (EPS, "$")]
+    written = 0
+    kinds = ("lex", "syntax") if errors == "mixed" else (errors,)
+
+    def accepts(symbols: List[str], tok: Token) -> bool:
+        """¿El parser LL(1), con esta pila, consume `tok`? (misma lógica que parse_ll1)"""
+        st = list(symbols)
+        while st:
+            X = st.pop()
+            if X == "$":
+                return False
+            if X not in G:
+                return token_to_symbol(X, tok)
+            prods = select_production(rows.get(X), tok[0], tok[1])
+            if not prods:
+                return False
+            rhs = prods[0].split()
+            if rhs != [EPS]:
+                st.extend(reversed(rhs))
+        return False
+
+    # (símbolo, profundidad, en_columna)
+    stack: List[tuple] = [("$", 0, False), (cg.start, 0, True)]
+    # Pila del parser justo después del último terminal: la expansión posterior
+    # ya dependió del terminal siguiente, así que no sirve para probar otro
+    after_last = ["$", cg.start]
+    while len(stack) > 1:
+        X, depth, spine = stack.pop()
+        if X is _NL:
+            yield (NEWLINE,)
+            written += 1
+            continue
+        if X not in G:
+            if errors and rng.random() < error_rate:
+                # Error justo antes de este terminal
+                kind = rng.choice(kinds)
+                if kind == "lex":
+                    yield (ERROR, "lex", "", rng.choice(LEX_ERROR_CHARS))
+                else:
+                    bad = [lexeme(t) for t in terminals]
+                    bad = [(ttype, lex) for ttype, lex in bad if not accepts(after_last, (ttype, lex, 0, 0))]
+                    if bad:
+                        yield (ERROR, "syntax", *rng.choice(bad))
+            ttype, lex = lexeme(X)
+            written += len(lex) + 1
+            if errors:
+                after_last = [s for s, _, _ in stack if s is not _NL]
+            yield (TOK, ttype, lex)
+            continue
+
+        if spine:
+            # Columna: continuarla mientras falte tamaño; si no, cerrarla
+            cands = continuing[X] if written < size else closing[X]
+        elif depth >= max_depth:
+            cands = lowest[X]
+        else:
+            cands = fitting[(X, depth)]
+        rhs = cands[0] if len(cands) == 1 else choice(cands)
+
+        if rhs == [EPS]:
+            continue
+        if spine and rhs[-1] in G:
+            stack.append((rhs[-1], depth, True))
+            stack.append((_NL, depth, False))
+            items = rhs[:-1]
+        else:
+            items = rhs
+        for s in reversed(items):
+            stack.append((s, depth + 1, False))
+
+def write_corpus(events: Iterator[tuple], out, fmt: str = "source", manifest=None, flush_every: int = 1 << 14) -> Dict[str, int]:
+    """Escribe los eventos como fuente o como líneas de tokens, por bloques."""
+    buf: List[str] = []
+    line, col = 1, 1
+    counts = {"tokens": 0, "lines": 0, "errors": 0}
+    at_line_start = True
+    for ev in events:
+        kind = ev[0]
+        if kind == NEWLINE:
+            if not at_line_start:
+                if fmt == "source":
+                    buf.append("\n")
+                line, col = line + 1, 1
+                counts["lines"] += 1
+                at_line_start = True
+            continue
+        if kind == ERROR:
+            _, ekind, ttype, lex = ev
+            if fmt == "tokens" and ekind == "lex":
+                raise ValueError("Los errores léxicos no se pueden representar en --format tokens")
+            counts["errors"] += 1
+            if manifest is not None:
+                pos = col if at_line_start else col + 1
+                entry = {"kind": ekind, "line": line, "col": pos, "lexeme": lex}
+                if ekind == "lex":
+                    entry["message"] = f"Error léxico(linea:{line},posicion:{pos})"
+                manifest.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        else:
+            _, ttype, lex = ev
+        # Un espacio entre lexemas de la misma línea
+        if not at_line_start:
+            col += 1
+            if fmt == "source":
+                buf.append(" ")
+        at_line_start = False
+        if fmt == "source":
+            buf.append(lex)
+        else:
+            buf.append(format_token((ttype, lex, line, col)) + "\n")
+        col += len(lex)
+        if ttype:  # los caracteres inválidos no son tokens
+            counts["tokens"] += 1
+        if len(buf) >= flush_every:
+            out.write("".join(buf))
+            buf.clear()
+    if fmt == "source" and not at_line_start:
+        buf.append("\n")
+    out.write("".join(buf))
+    return counts
+
+def main(argv: List[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Generador determinista de entradas a partir de una gramática .g")
+    ap.add_argument("--grammar", default="grammars/python_subset.g", help="gramática .g")
+    ap.add_argument("--size", default="1M", help="tamaño aproximado de la salida (K/M/G), p.ej. 64K, 100M, 2G")
+    ap.add_argument("--max-depth", type=int, default=12, help="profundidad máxima de anidamiento (fuera de la columna)")
+    ap.add_argument("--seed", type=int, default=0, help="semilla (misma semilla => misma salida)")
+    ap.add_argument("--format", choices=["source", "tokens"], default="source", help="texto fuente o líneas de tokens")
+    ap.add_argument("--errors", choices=["lex", "syntax", "mixed"], help="inyectar errores léxicos, sintácticos o ambos")
+    ap.add_argument("--error-rate", type=float, default=0.001, help="con --errors, probabilidad de error antes de cada token")
+    ap.add_argument("--manifest", metavar="RUTA", help="con --errors, JSON-lines con la posición de cada error")
+    ap.add_argument("--out", default="-", help="archivo de salida ('-' = stdout)")
+    args = ap.parse_args(argv)
+
+    with open(args.grammar, encoding="utf-8") as f:
+        cg = compile_grammar(f.read(), args.grammar)
+    events = generate(cg, parse_size(args.size), args.max_depth, args.seed, args.errors, args.error_rate)
+    out = sys.stdout if args.out == "-" else open(args.out, "w", encoding="utf-8")
+    manifest = open(args.manifest, "w", encoding="utf-8") if args.manifest else None
+    try:
+        counts = write_corpus(events, out, args.format, manifest)
+    except ValueError as e:
+        print(str(e), file=sys.stderr)
+        return 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        if manifest is not None:
+            manifest.close()
+    print(json.dumps(counts), file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
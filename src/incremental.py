@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+"""
+incremental.py
+--------------
+Re-lex y re-parse incremental para entradas que se editan (integración con
+editores que reenvían el archivo en cada tecla).
+
+Uso:
+    state = analyze(src, cg)                      # análisis completo
+    state = apply_edit(state, cg, start, end, txt) # src[start:end] -> txt
+    state.ok, state.message                        # igual que parse_ll1
+
+Re-lex: ningún token cruza un salto de línea (match_string rechaza '\\n' y los
+comentarios terminan en él), así que solo se re-escanean las líneas tocadas por
+la edición; los tokens anteriores y posteriores se reutilizan tal cual. Si la
+edición agregó o quitó líneas, los posteriores no se renumeran: el estado guarda
+tramos de corrimiento (LineShift) que se aplican al leer una posición o al pedir
+`state.tokens`. Cada edición empalma solo esos tramos; si se acumulan más de
+MAX_LINE_SHIFTS se aplican de una vez.
+
+Re-parse: durante el parse se guarda cada CHECKPOINT_EVERY tokens consumidos
+una copia de la pila (el estado no depende de ningún token posterior). Tras una
+edición se retoma desde el último checkpoint anterior al primer token cambiado
+y, pasada la zona editada, en cuanto la pila coincide con la de un checkpoint
+viejo en la posición equivalente el resto del análisis es idéntico al anterior:
+se reutiliza el resultado (desplazando la posición del error, si lo había) y los
+checkpoints restantes. Así el trabajo de lexer/parser es proporcional al tamaño
+de la edición; lo que sigue siendo lineal es copia a nivel C (concatenar la
+fuente, empalmar listas).
+
+El resultado (tokens, ok y mensaje) es idéntico al de un análisis completo.
+"""
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, NamedTuple, Tuple
+
+from .lexer.regex_scanner import scan_into
+from .syntax.grammar_io import EPS
+from .syntax.grammar_cache import CompiledGrammar
+from .syntax.parser_ll1 import format_expected_from_row, select_production, token_to_symbol
+
+Token = Tuple[str, str, int, int]  # (tipo, lexema, linea, col)
+
+CHECKPOINT_EVERY = 256
+MAX_LINE_SHIFTS = 256
+OK_MESSAGE = "El analisis sintactico ha finalizado exitosamente."
+
+class Checkpoint(NamedTuple):
+    index: int                 # próximo token a leer
+    stack: Tuple[str, ...]     # pila del parser en ese momento
+
+class LineShift(NamedTuple):
+    index: int                 # primer token (en `lexed`) del tramo
+    delta: int                 # líneas a sumar hasta el tramo siguiente
+
+class IncrementalState(NamedTuple):
+    src: str
+    lexed: List[Token]         # tokens con la línea sin corregir
+    line_shifts: List[LineShift]
+    lex_error: str | None
+    checkpoints: List[Checkpoint]
+    ok: bool
+    message: str
+    error_index: int           # token donde se detectó el error sintáctico (-1 si no hay)
+
+    @property
+    def tokens(self) -> List[Token]:
+        """Tokens con su línea definitiva, como los de un análisis completo."""
+        return _apply_shifts(self.lexed, self.line_shifts)
+
+def _shift_at(shifts: List[LineShift], i: int) -> int:
+    k = bisect_right(shifts, i, key=lambda s: s.index) - 1
+    return shifts[k].delta if k >= 0 else 0
+
+def _apply_shifts(lexed: List[Token], shifts: List[LineShift]) -> List[Token]:
+    if not shifts:
+        return lexed
+    out = lexed[:shifts[0].index]
+    for k, (start, d) in enumerate(shifts):
+        stop = shifts[k + 1].index if k + 1 < len(shifts) else len(lexed)
+        if d:
+            out.extend((t, lx, ln + d, c) for t, lx, ln, c in lexed[start:stop])
+        else:
+            out.extend(lexed[start:stop])
+    return out
+
+def _push_shift(shifts: List[LineShift], index: int, delta: int) -> None:
+    """Agrega un tramo, fusionándolo con el anterior si no cambia nada."""
+    if shifts and shifts[-1].index == index:
+        shifts.pop()
+    if (shifts[-1].delta if shifts else 0) != delta:
+        shifts.append(LineShift(index, delta))
+
+def _position(tokens: List[Token], shifts: List[LineShift], i: int) -> Tuple[int, int]:
+    """Posición del token i; el $ final toma la del último token (como parse_ll1)."""
+    if not tokens:
+        return 1, 1
+    i = min(i, len(tokens) - 1)
+    return tokens[i][2] + _shift_at(shifts, i), tokens[i][3]
+
+def _with_position(tokens: List[Token], shifts: List[LineShift], i: int, message: str) -> str:
+    """Cambia el prefijo <linea,col> de un mensaje de error por la posición del token i."""
+    line, col = _position(tokens, shifts, i)
+    return f"<{line},{col}>" + message[message.index(">") + 1:]
+
+class _Converged(NamedTuple):
+    new_index: int
+    old_index: int
+
+def _parse(cg: CompiledGrammar, tokens: List[Token], shifts: List[LineShift], i: int, stack: List[str],
+           every: int, cps: List[Checkpoint], old: Dict[int, Checkpoint] | None = None,
+           delta: int = 0, from_index: int = 0):
+    """Bucle de parse_ll1 por índice, guardando checkpoints. Con `old`, se
+    detiene en cuanto la pila coincide con un checkpoint viejo (índice - delta)
+    a partir de `from_index`. Retorna (ok, mensaje, índice_error) o _Converged."""
+    G, rows, table = cg.G, cg.ROWS, cg.TABLE
+    n = len(tokens)
+    eof = ("EOF", "$") + _position(tokens, shifts, n)
+    while stack:
+        X = stack.pop()
+        tok = tokens[i] if i < n else eof
+        ttype, lex = tok[0], tok[1]
+
+        if X == "$":
+            if lex == "$":
+                return True, OK_MESSAGE, -1
+            line, col = _position(tokens, shifts, i)
+            return False, f"<{line},{col}> Error sintactico: se encontro: \"{lex}\"; se esperaba fin de entrada", i
+
+        if X not in G and X != EPS:
+            if not token_to_symbol(X, tok):
+                line, col = _position(tokens, shifts, i)
+                return False, f"<{line},{col}> Error sintactico: se encontro: \"{lex}\"; se esperaba: \"{X}\"", i
+            i += 1
+            if old is not None and i >= from_index:
+                cp = old.get(i - delta)
+                if cp is not None and len(cp.stack) == len(stack) and cp.stack == tuple(stack):
+                    return _Converged(i, i - delta)
+            if i % every == 0:
+                cps.append(Checkpoint(i, tuple(stack)))
+            continue
+
+        prods = select_production(rows.get(X), ttype, lex)
+        if not prods:
+            esperados = format_expected_from_row(table, X, rows)
+            esperados_str = "\", \"".join(esperados) if esperados else "—"
+            line, col = _position(tokens, shifts, i)
+            return False, f"<{line},{col}> Error sintactico: se encontro: \"{lex}\"; se esperaba: \"{esperados_str}\"", i
+        rhs = prods[0].split()
+        if rhs != [EPS]:
+            stack.extend(reversed(rhs))
+    line, col = _position(tokens, shifts, i)
+    return False, f"<{line},{col}> Error sintactico: entrada no consumida", i
+
+def analyze(src: str, cg: CompiledGrammar, every: int = CHECKPOINT_EVERY) -> IncrementalState:
+    """Análisis completo que deja los checkpoints para ediciones posteriores."""
+    tokens: List[Token] = []
+    err = scan_into(src, tokens)
+    if err is not None:
+        return IncrementalState(src, tokens, [], err, [], False, err, -1)
+    cps = [Checkpoint(0, ("$", cg.start))]
+    ok, msg, at = _parse(cg, tokens, [], 0, ["$", cg.start], every, cps)
+    return IncrementalState(src, tokens, [], None, cps, ok, msg, at)
+
+def apply_edit(state: IncrementalState, cg: CompiledGrammar, start: int, end: int, text: str,
+               every: int = CHECKPOINT_EVERY) -> IncrementalState:
+    """Aplica src[start:end] -> text y re-analiza solo lo necesario."""
+    old_src = state.src
+    if not 0 <= start <= end <= len(old_src):
+        raise ValueError(f"Edición fuera de rango: [{start}, {end}) en {len(old_src)} caracteres")
+    src = old_src[:start] + text + old_src[end:]
+    if state.lex_error is not None:
+        # Sin tokens válidos previos no hay nada que reutilizar
+        return analyze(src, cg, every)
+
+    # 1) Líneas afectadas: [ls, le) en la fuente vieja, [ls, new_le) en la nueva
+    ls = old_src.rfind("\n", 0, start) + 1
+    le = old_src.find("\n", end)
+    if le == -1:
+        le = len(old_src)
+    new_le = le + len(text) - (end - start)
+    first_line = old_src.count("\n", 0, ls) + 1
+    last_line = first_line + old_src.count("\n", ls, le)
+    line_delta = text.count("\n") - old_src.count("\n", start, end)
+
+    # 2) Re-lex de esas líneas y empalme con los tokens viejos; los posteriores
+    #    no se tocan, solo se corren sus tramos de línea
+    old_tokens, old_shifts = state.lexed, state.line_shifts
+
+    def line_of(i: int) -> int:
+        return old_tokens[i][2] + _shift_at(old_shifts, i)
+
+    a = bisect_left(range(len(old_tokens)), first_line, key=line_of)
+    b = bisect_right(range(len(old_tokens)), last_line, lo=a, key=line_of)
+    mid: List[Token] = []
+    err = scan_into(src, mid, first_line, ls, new_le)
+    tokens = old_tokens[:a] + mid + old_tokens[b:]
+    delta = len(mid) - (b - a)
+    k = bisect_left(old_shifts, a, key=lambda s: s.index)
+    shifts = old_shifts[:k]
+    _push_shift(shifts, a, 0)  # los de `mid` ya tienen la línea correcta
+    _push_shift(shifts, a + len(mid), _shift_at(old_shifts, b) + line_delta)
+    for s in old_shifts[bisect_right(old_shifts, b, key=lambda s: s.index):]:
+        _push_shift(shifts, s.index + delta, s.delta + line_delta)
+    if len(shifts) > MAX_LINE_SHIFTS:
+        tokens, shifts = _apply_shifts(tokens, shifts), []
+    if err is not None:
+        # Lo anterior y lo posterior ya eran válidos: este es el primer error léxico
+        return IncrementalState(src, tokens, shifts, err, [], False, err, -1)
+
+    # 3) Re-parse desde el último checkpoint que no depende de tokens cambiados
+    old_cps = state.checkpoints
+    k = bisect_right(old_cps, a, key=lambda cp: cp.index) - 1
+    restart = old_cps[k]
+    cps = old_cps[:k + 1]
+    old_by_index = {cp.index: cp for cp in old_cps[k + 1:] if cp.index >= b}
+    res = _parse(cg, tokens, shifts, restart.index, list(restart.stack), every, cps,
+                 old_by_index, delta, a + len(mid))
+    if not isinstance(res, _Converged):
+        ok, msg, at = res
+        return IncrementalState(src, tokens, shifts, None, cps, ok, msg, at)
+
+    # 4) Convergió: el resto es el análisis anterior desplazado `delta` tokens
+    j = bisect_left(old_cps, res.old_index, key=lambda cp: cp.index)
+    if delta:
+        cps.extend(Checkpoint(cp.index + delta, cp.stack) for cp in old_cps[j:])
+    else:
+        cps.extend(old_cps[j:])
+    if state.ok:
+        return IncrementalState(src, tokens, shifts, None, cps, True, state.message, -1)
+    at = state.error_index + delta
+    return IncrementalState(src, tokens, shifts, None, cps, False,
+                            _with_position(tokens, shifts, at, state.message), at)
@@ -0,0 +1,17 @@
+# -*- coding: utf-8 -*-
+"""
+Registro de motores léxicos seleccionables con --lexer.
+Todos reciben la fuente completa (str) y producen los mismos tokens
+(tipo, lexema, linea, col) y los mismos errores léxicos.
+"""
+from .tokenizer import tokenize
+from .regex_scanner import tokenize_regex
+from .token_store import tokenize_store
+from .parallel import tokenize_parallel
+
+LEXERS = {
+    "classic": tokenize,
+    "regex": tokenize_regex,
+    "compact": tokenize_store,  # TokenStore: arreglos de tipos/offsets, lexemas a demanda
+    "parallel": tokenize_parallel,  # compact por trozos de líneas en un pool de procesos
+}
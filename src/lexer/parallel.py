@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+Lexeo en paralelo de un archivo grande (--lexer parallel).
+- Ningún token cruza un salto de línea (las cadenas no admiten '\\n' y los
+  comentarios terminan en él), así que la fuente se puede cortar en trozos
+  que terminan en '\\n' y lexear cada uno por separado
+- Cada trozo se escanea en un proceso del pool con scan_store_into sobre la
+  fuente completa, así que los desplazamientos ya son absolutos y no hay que
+  corregirlos al unir. La fuente llega a cada proceso una sola vez, al crearse
+  el pool (initargs): con fork (Linux) se hereda sin copiarla; con spawn o
+  forkserver (Windows, macOS) se serializa una vez por proceso
+- Los arreglos de cada trozo se concatenan en orden en un único TokenStore:
+  línea/columna se calculan igual que en el lexer compacto
+- Si algún trozo tiene un error léxico se reporta el del primer trozo con
+  error, que es el primero de la fuente: mismo ValueError que tokenize_store
+- Fuentes chicas (o un solo proceso) se lexean en el proceso actual: crear el
+  pool cuesta más de lo que se gana
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple
+
+from .token_store import TokenStore, scan_store_into, tokenize_store
+
+# Por debajo de este tamaño (caracteres) no se usa el pool
+MIN_PARALLEL = 1 << 22
+# Trozos por proceso (más de uno reparte mejor la carga)
+CHUNKS_PER_JOB = 4
+
+def split_lines(src: str, parts: int) -> List[Tuple[int, int]]:
+    """Corta `src` en a lo sumo `parts` rangos [pos, end) que terminan justo
+    después de un '\\n' (o al final de la fuente)."""
+    n = len(src)
+    size = max(1, -(-n // max(1, parts)))
+    bounds = []
+    pos = 0
+    while pos < n:
+        j = src.find("\n", min(n, pos + size) - 1)
+        end = n if j == -1 else j + 1
+        bounds.append((pos, end))
+        pos = end
+    return bounds
+
+_SRC = ""
+
+def _init_worker(src: str) -> None:
+    global _SRC
+    _SRC = src
+
+def _scan_chunk(bounds: Tuple[int, int]):
+    store = TokenStore(_SRC)
+    bad = scan_store_into(store, *bounds)
+    return store.types.tobytes(), store.starts, store.ends, bad
+
+def tokenize_parallel(src: str, jobs: int | None = None, min_size: int = MIN_PARALLEL) -> TokenStore:
+    """Tokeniza `src` hacia un TokenStore usando `jobs` procesos (por defecto
+    uno por núcleo). Mismos tokens y mismo error léxico que tokenize_store."""
+    jobs = jobs or os.cpu_count() or 1
+    chunks = split_lines(src, jobs * CHUNKS_PER_JOB)
+    if jobs <= 1 or len(src) < min_size or len(chunks) <= 1:
+        return tokenize_store(src)
+    store = TokenStore(src)
+    with ProcessPoolExecutor(max_workers=min(jobs, len(chunks)), initializer=_init_worker, initargs=(src,)) as pool:
+        for types, starts, ends, bad in pool.map(_scan_chunk, chunks):
+            store.types.frombytes(types)
+            store.starts.extend(starts)
+            store.ends.extend(ends)
+            if bad is not None:
+                # Los trozos siguientes no hacen falta: el error es el primero
+                pool.shutdown(wait=False, cancel_futures=True)
+                line = src.count("\n", 0, bad) + 1
+                col = bad - src.rfind("\n", 0, bad)
+                raise ValueError(f"Error léxico(linea:{line},posicion:{col})")
+    return store
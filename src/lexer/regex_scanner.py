@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""
+Motor de escaneo alternativo basado en una expresión regular maestra.
+- El patrón se arma a partir de token_defs (TOKENS, WHITESPACE, COMMENT_START)
+  y de los alfabetos de rules.py, así que reconoce exactamente el mismo lenguaje
+  que tokenizer.tokenize
+- Cada coincidencia consume un lexema completo (no se avanza carácter a carácter)
+- La columna se calcula como desplazamiento desde el inicio de la línea actual;
+  solo los saltos de línea actualizan línea/inicio de línea
+- Produce las mismas tuplas (tipo, lexema, linea, col) y el mismo
+  ValueError("Error léxico(linea:X,posicion:Y)") que el scanner original
+
+Modo tolerante (tokenize_tolerant): en lugar de cortar en el primer error
+léxico los registra todos; se salta el carácter inválido o, si es una comilla
+sin cierre, el resto de la línea, y se sigue escaneando. Opcionalmente deja un
+token ERROR_TYPE en el lugar del error para que el parser con recuperación
+(syntax/recovery.py) lo atraviese.
+
+Nota: en el scanner original '+' y '-' se reconocen como operadores antes de
+intentar match_integer, así que el signo nunca forma parte de un entero; aquí
+los enteros son directamente [0-9]+.
+"""
+import re
+from typing import List, Tuple
+from .token_defs import RESERVED, TOKENS, WHITESPACE, COMMENT_START
+from .rules import LETRAS, LETRAS_DIGITOS, DIGITOS
+
+Token = Tuple[str, str, int, int]  # (tipo, lexema, linea, col)
+
+ERROR_TYPE = "tk_error"
+
+def _char_class(chars) -> str:
+    return "[" + "".join(re.escape(c) for c in sorted(chars)) + "]"
+
+# Índices de grupo del patrón maestro (m.lastindex)
+NL, COMMENT, OP, ID, INT, STR, ERR = range(1, 8)
+
+def _build_master() -> "re.Pattern[str]":
+    # Operadores más largos primero (longest-match)
+    ops = "|".join(re.escape(op) for op in sorted(TOKENS, key=len, reverse=True))
+    strings = "|".join(f"{re.escape(q)}[^{re.escape(q)}\\n]*{re.escape(q)}" for q in ('"', "'"))
+    parts = [
+        r"(\n)",
+        "(" + re.escape(COMMENT_START) + r"[^\n]*)",
+        "(" + ops + ")",
+        "(" + _char_class(LETRAS) + _char_class(LETRAS_DIGITOS) + "*)",
+        "(" + _char_class(DIGITOS) + "+)",
+        "(" + strings + ")",
+        # Cualquier otro carácter (incluida una comilla sin cierre) es error léxico
+        "([^" + _char_class(WHITESPACE)[1:] + ")",
+    ]
+    # Los espacios previos se consumen en la misma coincidencia que el lexema
+    return re.compile(_char_class(WHITESPACE) + "*(?:" + "|".join(parts) + ")")
+
+MASTER = _build_master()
+
+def classify(k: int, lex: str) -> str | None:
+    """Tipo de token de una coincidencia del grupo `k` del patrón maestro
+    (ni salto de línea ni comentario), o None si es un error léxico. Es la
+    única clasificación: la usan scan_into, scan_tolerant_into y stream."""
+    if k == ID:
+        return lex if lex in RESERVED else "identificador"
+    if k == OP:
+        return TOKENS[lex]
+    if k == INT:
+        return "tk_entero"
+    if k == STR:
+        return "tk_cadena"
+    return None
+
+def scan_into(src: str, tokens: List[Token], line: int = 1, pos: int = 0, endpos: int | None = None) -> str | None:
+    """Agrega a `tokens` los tokens de src[pos:endpos] (pos debe ser inicio de
+    línea y `line` su número). Retorna el mensaje del primer error léxico, o
+    None si todo el rango es válido. Los tokens previos al error quedan en la lista."""
+    append = tokens.append
+    line_start = pos
+    # Solo quedan sin coincidencia los espacios finales, que finditer salta.
+    it = MASTER.finditer(src, pos) if endpos is None else MASTER.finditer(src, pos, endpos)
+    for m in it:
+        k = m.lastindex
+        if k == NL:
+            line += 1
+            line_start = m.end()
+            continue
+        if k == COMMENT:
+            continue
+        lex = m[k]
+        col = m.end() - len(lex) - line_start + 1
+        ttype = classify(k, lex)
+        if ttype is None:
+            return f"Error léxico(linea:{line},posicion:{col})"
+        append((ttype, lex, line, col))
+    return None
+
+def tokenize_regex(src: str) -> List[Token]:
+    """Equivalente a tokenizer.tokenize usando el patrón maestro."""
+    tokens: List[Token] = []
+    err = scan_into(src, tokens)
+    if err is not None:
+        raise ValueError(err)
+    return tokens
+
+def scan_tolerant_into(src: str, tokens: List[Token], errors: List[str], error_tokens: bool = False,
+                       line: int = 1, pos: int = 0, endpos: int | None = None) -> None:
+    """Como scan_into, pero sin detenerse: cada error léxico se agrega a
+    `errors` (y, con error_tokens, un token ERROR_TYPE a `tokens`)."""
+    append = tokens.append
+    end = len(src) if endpos is None else endpos
+    line_start = pos
+    while pos < end:
+        for m in MASTER.finditer(src, pos, end):
+            k = m.lastindex
+            if k == NL:
+                line += 1
+                line_start = m.end()
+                continue
+            if k == COMMENT:
+                continue
+            lex = m[k]
+            col = m.end() - len(lex) - line_start + 1
+            ttype = classify(k, lex)
+            if ttype is not None:
+                append((ttype, lex, line, col))
+            else:
+                errors.append(f"Error léxico(linea:{line},posicion:{col})")
+                if lex in "\"'":
+                    # Cadena sin cierre (match_string no admite saltos de línea):
+                    # se resincroniza en el próximo salto de línea
+                    nl = src.find("\n", m.end(), end)
+                    stop = end if nl == -1 else nl
+                    if error_tokens:
+                        append((ERROR_TYPE, src[m.end() - 1:stop], line, col))
+                    pos = stop
+                    break
+                if error_tokens:
+                    append((ERROR_TYPE, lex, line, col))
+        else:
+            return
+
+def tokenize_tolerant(src: str, error_tokens: bool = False) -> Tuple[List[Token], List[str]]:
+    """Tokeniza todo `src` y retorna (tokens, errores léxicos)."""
+    tokens: List[Token] = []
+    errors: List[str] = []
+    scan_tolerant_into(src, tokens, errors, error_tokens)
+    return tokens, errors
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+Tokenizador en flujo (generador) para entradas grandes.
+- Lee la fuente por bloques desde un objeto con .read(n): archivo de texto,
+  archivo binario o mmap (los bytes se decodifican como UTF-8 incrementalmente)
+- Escanea con el patrón maestro de regex_scanner (y su misma clasificación):
+  mismos tokens y mismos mensajes de error que tokenizer.tokenize
+- Cada bloque se escanea hasta la última coincidencia completa y cada token
+  se entrega apenas se reconoce; al bloque siguiente solo pasa el lexema que
+  podría continuar (el que llega al final del bloque, o una comilla sin cierre
+  antes del próximo '\\n'). Los espacios sobrantes se descartan y de un
+  comentario sin terminar solo se conserva el '#': la línea/columna se siguen
+  por desplazamientos, así que una línea larga no se acumula
+- El error léxico se lanza (ValueError) recién cuando el consumidor llega a él;
+  los tokens anteriores ya fueron entregados
+
+La memoria queda acotada por el tamaño de bloque más el lexema más largo.
+"""
+import codecs
+import mmap
+from typing import Iterator, Tuple
+from .regex_scanner import COMMENT, ERR, MASTER, NL, classify
+from .token_defs import COMMENT_START, WHITESPACE
+
+Token = Tuple[str, str, int, int]  # (tipo, lexema, linea, col)
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+def _text_chunks(f, chunk_size: int) -> Iterator[str]:
+    """Bloques de texto con saltos de línea normalizados a '\\n' (como open()
+    en modo texto), aunque `f` entregue bytes."""
+    decoder = None
+    carry_cr = False
+    while True:
+        data = f.read(chunk_size)
+        if isinstance(data, str):
+            text = data
+        else:
+            if decoder is None:
+                decoder = codecs.getincrementaldecoder("utf-8")()
+            text = decoder.decode(data, final=not data)
+            # '\r\n' o '\r' suelto -> '\n'; un '\r' al final espera al bloque siguiente
+            if carry_cr:
+                text = "\r" + text
+            carry_cr = bool(data) and text.endswith("\r")
+            if carry_cr:
+                text = text[:-1]
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+        if not data:
+            if text:
+                yield text
+            return
+        if text:
+            yield text
+
+_SPACES = "".join(WHITESPACE)
+
+def iter_tokens(f, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Token]:
+    """Genera los tokens de `f` bloque a bloque."""
+    buf = ""
+    line = 1
+    line_start = 0  # desplazamiento (en buf, puede ser negativo) del inicio de la línea actual
+    chunks = _text_chunks(f, chunk_size)
+    final = False
+    while not final:
+        text = next(chunks, None)
+        if text is None:
+            final = True
+        else:
+            buf = buf + text if buf else text
+        n = len(buf)
+        pos = 0  # fin de la última coincidencia aceptada
+        carry_comment = False
+        for m in MASTER.finditer(buf):
+            k = m.lastindex
+            end = m.end()
+            if not final and (end == n or (k == ERR and m[k] in "\"'" and buf.find("\n", end) == -1)):
+                # El lexema puede seguir en el bloque siguiente
+                carry_comment = k == COMMENT
+                break
+            pos = end
+            if k == NL:
+                line += 1
+                line_start = end
+                continue
+            if k == COMMENT:
+                continue
+            lex = m[k]
+            col = end - len(lex) - line_start + 1
+            ttype = classify(k, lex)
+            if ttype is None:
+                raise ValueError(f"Error léxico(linea:{line},posicion:{col})")
+            yield (ttype, lex, line, col)
+        if final:
+            return
+        if carry_comment:
+            # Lo que resta de la línea es comentario: basta con recordar que lo es
+            rest = COMMENT_START
+        else:
+            rest = buf[pos:].lstrip(_SPACES)
+        line_start -= n - len(rest)
+        buf = rest
+
+def iter_tokens_path(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE, use_mmap: bool = False) -> Iterator[Token]:
+    """Abre `path` (en modo texto, o mapeado en memoria con use_mmap) y genera
+    sus tokens. El archivo se cierra al agotar o cerrar el generador."""
+    if not use_mmap:
+        with open(path, "r", encoding="utf-8") as f:
+            yield from iter_tokens(f, chunk_size)
+        return
+    with open(path, "rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # mmap de un archivo vacío no está permitido
+            return
+        with mm:
+            yield from iter_tokens(mm, chunk_size)
@@ -0,0 +1,374 @@
+# -*- coding: utf-8 -*-
+"""
+token_io.py
+-----------
+Escritura de flujos de tokens (--mode lex --format text|jsonl|bin) por
+bloques: los tokens se formatean de a `block` y se escriben con una sola
+llamada por bloque (nada de un print / write por token).
+
+Lectura (--mode parse --tokens-in): open_tokens detecta el formato y entrega
+los tokens a demanda, sin armar la lista completa; el formato bin se mapea en
+memoria (TokenFile) y cada tupla se arma recién cuando el parser la pide.
+
+Formatos:
+- text  : las líneas <tipo, lexema, linea, col> de siempre (reporter.format_token);
+          un token de error del lexer tolerante se escribe como su mensaje
+          "Error léxico(linea:X,posicion:Y)"
+- jsonl : un arreglo JSON por token: ["tipo", "lexema", linea, col]
+- bin   : struct-of-arrays, como TokenStore: id de tipo e inicio/fin del
+          lexema (desplazamientos en caracteres dentro de la fuente),
+          opcionalmente seguidos de la fuente misma:
+
+    cabecera  <8sBBBxIQQ32s>  MAGIC, flags, bytes por id de tipo (1|2),
+              bytes por desplazamiento (4|8), cantidad de tipos, de tokens,
+              largo de la fuente (caracteres), sha256 de la fuente (UTF-8)
+    tipos     por tipo: largo (1 byte) + nombre UTF-8
+    (relleno hasta múltiplo de 8)
+    ids       n ids de tipo           (relleno hasta múltiplo de 8)
+    inicios   n desplazamientos
+    fines     n desplazamientos
+    fuente    UTF-8, solo si flags & HAS_SOURCE
+
+  Todo en little-endian. Línea y columna no se guardan: salen de la fuente
+  (la incluida o la original, que se verifica con el sha256). FLAG_ASCII
+  indica que desplazamientos en caracteres y en bytes coinciden.
+"""
+import hashlib
+import json
+import mmap
+import struct
+import sys
+from array import array
+from typing import BinaryIO, Dict, Iterable, Iterator, List, TextIO, Tuple
+
+from ..reporter import format_token
+from .regex_scanner import ERROR_TYPE
+from .token_defs import TOKENS
+from .token_store import TYPE_NAMES, TokenStore
+
+Token = Tuple[str, str, int, int]  # (tipo, lexema, linea, col)
+
+FORMATS = ("text", "jsonl", "bin")
+DEFAULT_BLOCK = 1 << 14
+_JSONL_MEMO = 1 << 16
+
+MAGIC = b"LL1TOK\x00\x01"
+HEADER = struct.Struct("<8sBBBxIQQ32s")
+FLAG_HAS_SOURCE = 1
+FLAG_ASCII = 2
+
+# Tabla de tipos del formato bin: la de TokenStore más el token de error
+BIN_TYPE_NAMES: Tuple[str, ...] = TYPE_NAMES + (ERROR_TYPE,)
+_BIN_TYPE_IDS = {name: i for i, name in enumerate(BIN_TYPE_NAMES)}
+
+def format_line(tok: Token) -> str:
+    """Línea de --format text (sin salto)."""
+    if tok[0] == ERROR_TYPE:
+        return f"Error léxico(linea:{tok[2]},posicion:{tok[3]})"
+    return format_token(tok)
+
+def write_text(tokens: Iterable[Token], out: TextIO, block: int = DEFAULT_BLOCK) -> int:
+    """Escribe las líneas de texto en bloques; retorna la cantidad de tokens.
+    Si `tokens` lanza (error léxico en flujo), lo ya formateado se escribe antes."""
+    buf: List[str] = []
+    append = buf.append
+    n = 0
+    try:
+        for tok in tokens:
+            append(format_line(tok))
+            if len(buf) >= block:
+                n += len(buf)
+                buf.append("")
+                out.write("\n".join(buf))
+                buf.clear()
+    finally:
+        if buf:
+            n += len(buf)
+            buf.append("")
+            out.write("\n".join(buf))
+    return n
+
+def write_jsonl(tokens: Iterable[Token], out: TextIO, block: int = DEFAULT_BLOCK) -> int:
+    dumps = json.dumps
+    # Prefijo ["tipo", "lexema",  ya codificado, por (tipo, lexema): se repiten mucho
+    heads: Dict[Tuple[str, str], str] = {}
+    buf: List[str] = []
+    append = buf.append
+    n = 0
+    try:
+        for ttype, lex, line, col in tokens:
+            head = heads.get((ttype, lex))
+            if head is None:
+                if len(heads) >= _JSONL_MEMO:
+                    heads.clear()
+                head = heads[(ttype, lex)] = f"[{dumps(ttype)}, {dumps(lex, ensure_ascii=False)}, "
+            append(f"{head}{line}, {col}]\n")
+            if len(buf) >= block:
+                n += len(buf)
+                out.write("".join(buf))
+                buf.clear()
+    finally:
+        n += len(buf)
+        out.write("".join(buf))
+    return n
+
+def _line_starts(src: str) -> List[int]:
+    starts = [0]
+    find = src.find
+    j = find("\n")
+    while j != -1:
+        starts.append(j + 1)
+        j = find("\n", j + 1)
+    return starts
+
+def to_arrays(tokens: Iterable[Token], src: str) -> Tuple[array, array, array]:
+    """(ids de tipo, inicios, fines) de tokens en tuplas, a partir de su
+    línea/columna. Un TokenStore ya los tiene (se copian solo si hace falta
+    otro ancho de desplazamiento)."""
+    code = "I" if len(src) < 2 ** 32 else "Q"
+    if isinstance(tokens, TokenStore) and tokens.src is src:
+        starts, ends = tokens.starts, tokens.ends
+        if starts.itemsize != array(code).itemsize:
+            starts, ends = array(code, starts), array(code, ends)
+        return tokens.types, starts, ends
+    types = array("B" if len(BIN_TYPE_NAMES) < 256 else "H")
+    starts, ends = array(code), array(code)
+    ls = _line_starts(src)
+    ids = _BIN_TYPE_IDS
+    for ttype, lex, line, col in tokens:
+        start = ls[line - 1] + col - 1
+        tid = ids.get(ttype)
+        if tid is None:
+            raise ValueError(f"Tokens: tipo desconocido {ttype!r}")
+        types.append(tid)
+        starts.append(start)
+        ends.append(start + len(lex))
+    return types, starts, ends
+
+def _le(a: array) -> array:
+    if sys.byteorder == "big" and a.itemsize > 1:
+        a = array(a.typecode, a)
+        a.byteswap()
+    return a
+
+def _pad(out: BinaryIO, written: int) -> int:
+    extra = -written % 8
+    if extra:
+        out.write(b"\x00" * extra)
+    return written + extra
+
+def write_bin(tokens: Iterable[Token], src: str, out: BinaryIO, include_source: bool = False) -> int:
+    """Formato bin. `src` es la fuente de la que salen los tokens (la misma
+    que se lexeó, con saltos de línea ya normalizados)."""
+    types, starts, ends = to_arrays(tokens, src)
+    data = src.encode("utf-8")
+    flags = (FLAG_HAS_SOURCE if include_source else 0) | (FLAG_ASCII if len(data) == len(src) else 0)
+    head = HEADER.pack(MAGIC, flags, types.itemsize, starts.itemsize, len(BIN_TYPE_NAMES), len(types),
+                       len(src), hashlib.sha256(data).digest())
+    table = b"".join(bytes((len(name),)) + name.encode("utf-8") for name in BIN_TYPE_NAMES)
+    out.write(head)
+    out.write(table)
+    written = _pad(out, len(head) + len(table))
+    for a in (types, starts, ends):
+        out.write(memoryview(_le(a)).cast("B"))
+        written = _pad(out, written + len(a) * a.itemsize)
+    if include_source:
+        out.write(data)
+    return len(types)
+
+def write_tokens(tokens: Iterable[Token], out, fmt: str = "text", src: str | None = None,
+                 include_source: bool = False) -> int:
+    """Escribe `tokens` en el formato pedido; `out` es de texto salvo para bin."""
+    if fmt == "text":
+        return write_text(tokens, out)
+    if fmt == "jsonl":
+        return write_jsonl(tokens, out)
+    if fmt == "bin":
+        if src is None:
+            raise ValueError("El formato bin necesita la fuente")
+        return write_bin(tokens, src, out, include_source)
+    raise ValueError(f"Formato de tokens desconocido: {fmt!r}")
+
+# ---------------------------------------------------------------------------
+# Lectura
+# ---------------------------------------------------------------------------
+
+_SYMBOL_LEXEMES = {ttype: lex for lex, ttype in TOKENS.items()}
+
+def _lex_error(line: int, col: int) -> ValueError:
+    return ValueError(f"Error léxico(linea:{line},posicion:{col})")
+
+def iter_text_tokens(f: TextIO) -> Iterator[Token]:
+    """Tokens de un archivo --format text. Las reservadas y los símbolos no
+    traen lexema: sale del tipo. Una línea "Error léxico(...)" se lanza como
+    ValueError al llegar a ella (igual que el lexer en flujo)."""
+    symbols = _SYMBOL_LEXEMES
+    for raw in f:
+        text = raw.rstrip("\n")
+        if not text:
+            continue
+        if not (text.startswith("<") and text.endswith(">")):
+            if text.startswith("Error léxico("):
+                raise ValueError(text)
+            raise ValueError(f"Tokens: línea no reconocida: {text!r}")
+        head, line, col = text[1:-1].rsplit(", ", 2)
+        ttype, sep, lex = head.partition(", ")
+        if not sep:
+            lex = symbols.get(ttype, ttype)  # reservadas: lexema == tipo
+        yield (ttype, lex, int(line), int(col))
+
+def iter_jsonl_tokens(f: TextIO) -> Iterator[Token]:
+    loads = json.loads
+    for raw in f:
+        if raw.strip():
+            ttype, lex, line, col = loads(raw)
+            if ttype == ERROR_TYPE:
+                raise _lex_error(line, col)
+            yield (ttype, lex, line, col)
+
+class TokenFile:
+    """Archivo --format bin mapeado en memoria. Los arreglos se leen sin
+    copiar (memoryview sobre el mmap) y cada token se arma al iterar; la
+    memoria no depende de la cantidad de tokens.
+
+    La fuente es la incluida en el archivo o `source` (el texto original, que
+    se verifica contra el sha256 de la cabecera)."""
+
+    def __init__(self, path: str, source: str | None = None):
+        self._f = open(path, "rb")
+        try:
+            self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # archivo vacío
+            self._f.close()
+            raise ValueError("Tokens: archivo bin vacío")
+        self._views: List[memoryview] = []
+        try:
+            self._load(source)
+        except BaseException:
+            self.close()
+            raise
+
+    def _view(self, start: int, nbytes: int, code: str):
+        data = memoryview(self._mm)[start:start + nbytes]
+        self._views.append(data)
+        if sys.byteorder == "big" and array(code).itemsize > 1:
+            a = array(code, data.tobytes())  # big-endian: se copia y se invierte
+            a.byteswap()
+            return a
+        view = data.cast(code)
+        self._views.append(view)
+        return view
+
+    def _load(self, source: str | None) -> None:
+        mm = self._mm
+        if len(mm) < HEADER.size:
+            raise ValueError("Tokens: archivo bin truncado")
+        magic, flags, tsize, osize, ntypes, n, nsrc, digest = HEADER.unpack_from(mm)
+        if magic != MAGIC or tsize not in (1, 2) or osize not in (4, 8):
+            raise ValueError("Tokens: formato bin no reconocido")
+        pos = HEADER.size
+        names = []
+        for _ in range(ntypes):
+            k = mm[pos]
+            names.append(mm[pos + 1:pos + 1 + k].decode("utf-8"))
+            pos += 1 + k
+        self.type_names: Tuple[str, ...] = tuple(names)
+        pos += -pos % 8
+        tcode = "B" if tsize == 1 else "H"
+        ocode = "I" if osize == 4 else "Q"
+        self.types = self._view(pos, n * tsize, tcode)
+        pos += n * tsize
+        pos += -pos % 8
+        self.starts = self._view(pos, n * osize, ocode)
+        pos += n * osize
+        pos += -pos % 8
+        self.ends = self._view(pos, n * osize, ocode)
+        pos += n * osize
+        pos += -pos % 8
+        self.n = n
+        if flags & FLAG_HAS_SOURCE:
+            if flags & FLAG_ASCII:
+                # Desplazamientos en caracteres == en bytes: se recorta el mmap
+                self._src = mm
+                self._base = pos
+                self._decode = True
+            else:
+                self._src = mm[pos:].decode("utf-8")
+                self._base = 0
+                self._decode = False
+        else:
+            if source is None:
+                raise ValueError("Tokens: el archivo no incluye la fuente; indicar --input con el archivo original")
+            if len(source) != nsrc or hashlib.sha256(source.encode("utf-8")).digest() != digest:
+                raise ValueError("Tokens: la fuente no corresponde a este archivo de tokens")
+            self._src, self._base, self._decode = source, 0, False
+
+    def __len__(self) -> int:
+        return self.n
+
+    def __iter__(self) -> Iterator[Token]:
+        # La línea avanza con los tokens: cada salto de línea se busca una vez
+        src, base, decode = self._src, self._base, self._decode
+        names, types, ends = self.type_names, self.types, self.ends
+        nl = b"\n" if decode else "\n"
+        find = src.find
+        line, line_start = 1, 0
+        next_nl = find(nl, base) - base if base else find(nl)
+        for k, start in enumerate(self.starts):
+            while 0 <= next_nl < start:
+                line += 1
+                line_start = next_nl + 1
+                j = find(nl, base + line_start)
+                next_nl = j - base if j >= 0 else -1
+            lex = src[base + start:base + ends[k]]
+            if decode:
+                lex = lex.decode("ascii")
+            ttype = names[types[k]]
+            if ttype == ERROR_TYPE:
+                raise _lex_error(line, start - line_start + 1)
+            yield (ttype, lex, line, start - line_start + 1)
+
+    def close(self) -> None:
+        for v in reversed(self._views):
+            v.release()
+        self._views.clear()
+        self._src = None
+        self._mm.close()
+        self._f.close()
+
+    def __enter__(self) -> "TokenFile":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+def detect_format(path: str) -> str:
+    """bin (por su MAGIC), jsonl (la primera línea es un arreglo) o text."""
+    with open(path, "rb") as f:
+        head = f.read(len(MAGIC))
+    if head == MAGIC:
+        return "bin"
+    return "jsonl" if head.lstrip().startswith(b"[") else "text"
+
+class open_tokens:
+    """Contexto que entrega los tokens de un archivo guardado con --mode lex:
+        with open_tokens(ruta, source=texto_o_None) as tokens: parse_ll1(..., tokens)"""
+
+    def __init__(self, path: str, source: str | None = None, fmt: str | None = None):
+        self.path = path
+        self.source = source
+        self.fmt = fmt or detect_format(path)
+        self._closer = None
+
+    def __enter__(self) -> Iterable[Token]:
+        if self.fmt == "bin":
+            tf = TokenFile(self.path, self.source)
+            self._closer = tf.close
+            return tf
+        f = open(self.path, "r", encoding="utf-8")
+        self._closer = f.close
+        return iter_jsonl_tokens(f) if self.fmt == "jsonl" else iter_text_tokens(f)
+
+    def __exit__(self, *exc) -> None:
+        if self._closer is not None:
+            self._closer()
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+Almacén compacto de tokens (struct-of-arrays).
+- En lugar de una tupla (tipo, lexema, linea, col) por token, guarda arreglos
+  paralelos (`array`) con el id de tipo y los desplazamientos de inicio/fin
+  del lexema dentro de la fuente: 9 bytes por token (1 del tipo y 4 por
+  desplazamiento; 17 si la fuente tiene 2**32 caracteres o más)
+- El lexema se recorta de la fuente solo cuando se pide
+- Línea/columna se calculan a demanda con bisect sobre el índice de inicios de
+  línea (que también se arma a demanda, la primera vez que se necesita)
+- Sigue exponiendo la interfaz de tuplas: len(), store[i] e iteración devuelven
+  (tipo, lexema, linea, col), así que sirve tal cual para reporter.print_tokens,
+  run_lex y parse_ll1
+"""
+from array import array
+from bisect import bisect_right
+from typing import Iterator, List, Tuple
+from .token_defs import RESERVED, TOKENS
+from .regex_scanner import MASTER, NL, COMMENT, OP, ID, INT, STR
+
+Token = Tuple[str, str, int, int]  # (tipo, lexema, linea, col)
+
+# Tabla de tipos: id (índice) -> nombre de tipo de token
+TYPE_NAMES: Tuple[str, ...] = (
+    ("identificador", "tk_entero", "tk_cadena")
+    + tuple(sorted(set(TOKENS.values())))
+    + tuple(sorted(RESERVED))
+)
+TYPE_IDS = {name: i for i, name in enumerate(TYPE_NAMES)}
+
+def _offset_typecode(n: int) -> str:
+    # "I" es de 4 bytes; "L" es de 8 en Linux/macOS de 64 bits, como "Q"
+    return "I" if n < 2 ** 32 else "Q"
+
+class TokenStore:
+    __slots__ = ("src", "types", "starts", "ends", "_line_starts")
+
+    def __init__(self, src: str, types: array | None = None, starts: array | None = None, ends: array | None = None):
+        self.src = src
+        code = _offset_typecode(len(src))
+        self.types = types if types is not None else array("B" if len(TYPE_NAMES) < 256 else "H")
+        self.starts = starts if starts is not None else array(code)
+        self.ends = ends if ends is not None else array(code)
+        self._line_starts: array | None = None
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def type_name(self, i: int) -> str:
+        return TYPE_NAMES[self.types[i]]
+
+    def lexeme(self, i: int) -> str:
+        return self.src[self.starts[i]:self.ends[i]]
+
+    def line_starts(self) -> array:
+        """Desplazamientos de inicio de cada línea (índice 0 -> línea 1)."""
+        if self._line_starts is None:
+            ls = array(_offset_typecode(len(self.src)), [0])
+            find = self.src.find
+            j = find("\n")
+            while j != -1:
+                ls.append(j + 1)
+                j = find("\n", j + 1)
+            self._line_starts = ls
+        return self._line_starts
+
+    def position_of(self, offset: int) -> Tuple[int, int]:
+        """(linea, col) 1-indexadas de un desplazamiento de la fuente."""
+        ls = self.line_starts()
+        line = bisect_right(ls, offset)
+        return line, offset - ls[line - 1] + 1
+
+    def position(self, i: int) -> Tuple[int, int]:
+        return self.position_of(self.starts[i])
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[k] for k in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        start = self.starts[i]
+        line, col = self.position_of(start)
+        return (TYPE_NAMES[self.types[i]], self.src[start:self.ends[i]], line, col)
+
+    def __iter__(self) -> Iterator[Token]:
+        # Recorrido secuencial: la línea avanza con el índice, sin bisect por token
+        src, names, ends = self.src, TYPE_NAMES, self.ends
+        ls = self.line_starts()
+        nlines = len(ls)
+        line = 1
+        next_ls = ls[1] if nlines > 1 else None
+        for k, start in enumerate(self.starts):
+            while next_ls is not None and next_ls <= start:
+                line += 1
+                next_ls = ls[line] if line < nlines else None
+            yield (names[self.types[k]], src[start:ends[k]], line, start - ls[line - 1] + 1)
+
+    def to_list(self) -> List[Token]:
+        return list(self)
+
+_OP_TYPE_IDS = {lex: TYPE_IDS[name] for lex, name in TOKENS.items()}
+_RESERVED_TYPE_IDS = {lex: TYPE_IDS[lex] for lex in RESERVED}
+
+def scan_store_into(store: TokenStore, pos: int = 0, endpos: int | None = None) -> int | None:
+    """Agrega al almacén los tokens de store.src[pos:endpos]. Retorna el
+    desplazamiento del primer carácter inválido, o None si no hubo error."""
+    src = store.src
+    types_append = store.types.append
+    starts_append = store.starts.append
+    ends_append = store.ends.append
+    ident, entero, cadena = TYPE_IDS["identificador"], TYPE_IDS["tk_entero"], TYPE_IDS["tk_cadena"]
+    reserved_get = _RESERVED_TYPE_IDS.get
+    it = MASTER.finditer(src, pos) if endpos is None else MASTER.finditer(src, pos, endpos)
+    for m in it:
+        k = m.lastindex
+        if k == NL or k == COMMENT:
+            continue
+        start, end = m.span(k)
+        if k == ID:
+            types_append(reserved_get(src[start:end], ident))
+        elif k == OP:
+            types_append(_OP_TYPE_IDS[src[start:end]])
+        elif k == INT:
+            types_append(entero)
+        elif k == STR:
+            types_append(cadena)
+        else:
+            return start
+        starts_append(start)
+        ends_append(end)
+    return None
+
+def tokenize_store(src: str) -> TokenStore:
+    """Tokeniza `src` hacia un TokenStore. Mismos tokens y mismo
+    ValueError("Error léxico(linea:X,posicion:Y)") que tokenizer.tokenize."""
+    store = TokenStore(src)
+    bad = scan_store_into(store)
+    if bad is not None:
+        line, col = store.position_of(bad)
+        raise ValueError(f"Error léxico(linea:{line},posicion:{col})")
+    return store
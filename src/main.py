@@ -6,117 +6,478 @@ CLI unificada:
 - --mode lex   : solo tokeniza un archivo fuente (.py o .txt) y muestra tokens
 - --mode parse : tokeniza + parsea LL(1) usando una gramática dada (.g)
                  e imprime FIRST, FOLLOW, PREDICT y Tabla si se pide.
+- --mode compile : genera un módulo Python autónomo con el parser de la
+                 gramática (tablas de enteros; mismos resultados que parse_ll1)
+- --mode serve : servidor de larga vida (JSON-lines por stdin/stdout o por un
+                 socket Unix) con las gramáticas compiladas en memoria.
+- --batch      : analiza muchos archivos (directorios, globs, listas) en un solo
+                 proceso o en un pool (--jobs), con resumen JSON al final.
+- --stream     : lee la entrada por bloques y el parser pide los tokens a
+                 demanda (memoria acotada; un error temprano no lexea el resto).
+- --profile    : tiempos y memoria por fase más contadores del lexer, del
+                 análisis de la gramática y del parser (texto o JSON).
+- --result-cache DIR : (parse y --batch parse) resultados en disco por hash de
+                 fuente + gramática + versión; lo que no cambió no se re-analiza.
 
 Ejemplos:
   python -m src.main --mode parse --grammar grammars/ejemplo_p6.g --input examples/ok/expresion1.txt --show-sets --show-table
   python -m src.main --mode parse --grammar grammars/python_subset.g --input examples/python/ok/mini.py
 """
 import argparse
+import io
+import json
+import os
+import sys
+from contextlib import ExitStack, redirect_stdout
 from pathlib import Path
 
 # LEXER
-from .lexer.tokenizer import tokenize
-from .reporter import print_tokens
+from .lexer.engines import LEXERS
+from .lexer.stream import iter_tokens_path
+from .lexer.regex_scanner import tokenize_tolerant
+from .lexer.token_io import FORMATS as TOKEN_FORMATS, open_tokens, write_tokens
+from .analyzer import DEFAULT_MAX_GRAMMARS
+from .batch import collect_inputs, run_batch
+from .result_cache import DEFAULT_MAX_BYTES, ResultCache
+from .server import run_server
 
 # SYNTAX (LL1)
-from .syntax.grammar_io import load_grammar, EPS
-from .syntax.first_follow import compute_first_sets, compute_follow_sets
-from .syntax.predict import compute_predict_sets
-from .syntax.table import build_ll1_table, has_conflicts
+from .syntax.grammar_cache import grammar_digest, load_compiled_grammar
 from .syntax.parser_ll1 import parse_ll1
+from .syntax.program import parse_program, program_for
+from .syntax.cst import CST
+from .syntax.codegen import generate_parser
+from .syntax.deriv import DerivationWriter
+from .syntax.conflicts import parse_ll1_resolve
+from .syntax.recovery import DEFAULT_MAX_ERRORS, parse_ll1_recover
 
-def run_lex(input_path: str, out_path: str | None) -> int:
+# PERFIL
+from .profiling import ParseCounters, Profiler, TokenCounter, format_text, phase
+
+class _Tee:
+    """Escribe cada bloque en varios destinos de texto."""
+
+    def __init__(self, *outs):
+        self.outs = outs
+
+    def write(self, data: str) -> None:
+        for out in self.outs:
+            out.write(data)
+
+def run_lex(
+    input_path: str,
+    out_path: str | None,
+    lexer: str = "classic",
+    stream: bool = False,
+    use_mmap: bool = False,
+    lex_recover: bool = False,
+    profile: Profiler | None = None,
+    fmt: str = "text",
+    with_source: bool = False,
+) -> int:
     p = Path(input_path)
     if not p.exists():
         print(f"Archivo no encontrado: {input_path}")
         return 1
-    src = p.read_text(encoding="utf-8")
+    out = None
+    lex_errors = 0
+    src = None
+    counter = TokenCounter() if profile is not None else None
     try:
-        tokens = tokenize(src)
+        # bin guarda desplazamientos dentro de la fuente: necesita el texto completo
+        lazy = (stream or use_mmap) and not lex_recover and fmt != "bin"
+        with phase(profile, "tokenize"):
+            if lex_recover:
+                # Todos los errores léxicos, cada uno en su lugar entre los tokens
+                src = p.read_text(encoding="utf-8")
+                tokens, errors = tokenize_tolerant(src, error_tokens=True)
+                lex_errors = len(errors)
+            elif lazy:
+                # Los tokens se emiten a medida que se lexean; un error corta la salida ahí.
+                tokens = iter_tokens_path(str(p), use_mmap=use_mmap)
+            else:
+                src = p.read_text(encoding="utf-8")
+                tokens = LEXERS[lexer](src)
+        if counter is not None:
+            if fmt == "bin":
+                for _ in counter.wrap(tokens):
+                    pass
+            else:
+                tokens = counter.wrap(tokens)
         if out_path:
             Path(out_path).parent.mkdir(parents=True, exist_ok=True)
-            with open(out_path, "w", encoding="utf-8") as f:
-                for ttype, lex, line, col in tokens:
-                    if ttype in {"identificador", "tk_entero", "tk_cadena"}:
-                        f.write(f"<{ttype}, {lex}, {line}, {col}>\n")
-                    else:
-                        if ttype.startswith("tk_"):
-                            f.write(f"<{ttype}, {line}, {col}>\n")
-                        else:
-                            f.write(f"<{ttype}, {line}, {col}>\n")
-        print_tokens(tokens)
-        return 0
+            out = open(out_path, "wb") if fmt == "bin" else open(out_path, "w", encoding="utf-8")
+        if fmt == "text":
+            # Como siempre: las líneas van a stdout y, con --out, también al archivo
+            dest = sys.stdout if out is None else _Tee(out, sys.stdout)
+        elif fmt == "bin":
+            dest = out or sys.stdout.buffer
+        else:
+            dest = out or sys.stdout
+        # En flujo, el lexeo ocurre mientras se escribe
+        with phase(profile, "tokenize+output" if lazy else "output"):
+            write_tokens(tokens, dest, fmt, src=src, include_source=with_source)
+        return 1 if lex_errors else 0
     except ValueError as e:
+        sys.stdout.flush()
         print(str(e))
         return 1
+    finally:
+        if out is not None:
+            out.close()
+        if counter is not None:
+            profile.counters.update(counter.as_dict())
 
-def run_parse(grammar_path: str, input_path: str, show_sets: bool, show_table: bool, show_deriv: bool) -> int:
+def run_parse(
+    grammar_path: str,
+    input_path: str,
+    show_sets: bool = False,
+    show_table: bool = False,
+    show_deriv: bool = False,
+    cache_dir: str | None = None,
+    use_cache: bool = True,
+    lexer: str = "classic",
+    stream: bool = False,
+    use_mmap: bool = False,
+    cst_out: str | None = None,
+    cst_format: str = "jsonl",
+    deriv_out: str | None = None,
+    deriv_format: str = "text",
+    recover: bool = False,
+    max_errors: int = DEFAULT_MAX_ERRORS,
+    lex_recover: bool = False,
+    profile: Profiler | None = None,
+    tokens_in: str | None = None,
+    resolve_conflicts: bool = False,
+) -> int:
     gp = Path(grammar_path)
-    ip = Path(input_path)
+    ip = Path(input_path) if input_path else None
     if not gp.exists():
         print(f"Gramática no encontrada: {grammar_path}")
         return 1
-    if not ip.exists():
+    if tokens_in is not None and not Path(tokens_in).exists():
+        print(f"Archivo de tokens no encontrado: {tokens_in}")
+        return 1
+    if ip is not None and not ip.exists():
         print(f"Archivo de entrada no encontrado: {input_path}")
         return 1
 
-    # 1) Cargar gramática
-    start, G = load_grammar(str(gp))
+    # 1) Cargar gramática compilada (FIRST, FOLLOW, PREDICT y Tabla; desde caché si es válida)
+    with phase(profile, "grammar"):
+        cg = load_compiled_grammar(str(gp), cache_dir=cache_dir, use_cache=use_cache,
+                                   stats=profile.counters if profile is not None else None)
+    # Las vistas de strings (FIRST/FOLLOW/PRED) solo se piden donde se usan
+    start, G, TABLE = cg.start, cg.G, cg.TABLE
+
+    # El archivo de --tokens-in (mapeado en memoria si es bin) se cierra al terminar
+    with ExitStack() as resources:
+        # 2) Tokenizar entrada (en modo flujo, los tokens se producen durante el parse)
+        lex_errors = []
+        lazy = tokens_in is not None or ((stream or use_mmap) and not lex_recover)
+        with phase(profile, "tokenize"):
+            if tokens_in is not None:
+                # Tokens ya guardados con --mode lex: sin re-lexear; se leen a demanda
+                # (la fuente de --input solo hace falta para un bin sin fuente incluida)
+                source = ip.read_text(encoding="utf-8") if ip is not None else None
+                try:
+                    tokens = resources.enter_context(open_tokens(tokens_in, source))
+                except ValueError as e:
+                    print(str(e))
+                    return 1
+            elif lex_recover:
+                # Se reportan todos los errores léxicos y se parsea lo demás; con
+                # --recover los tokens de error quedan para que el parser los atraviese
+                tokens, lex_errors = tokenize_tolerant(ip.read_text(encoding="utf-8"), error_tokens=recover)
+                for e in lex_errors:
+                    print(e)
+            elif lazy:
+                tokens = iter_tokens_path(str(ip), use_mmap=use_mmap)
+            else:
+                src = ip.read_text(encoding="utf-8")
+                try:
+                    tokens = LEXERS[lexer](src)
+                except ValueError as e:
+                    print(str(e))
+                    return 1
+        # En flujo (o leyendo --tokens-in), el lexeo/lectura ocurre durante el parse
+        parse_phase = "tokenize+parse" if lazy else "parse"
+
+        # 3) Reportes opcionales
+        if show_sets:
+            print("== PRIMEROS ==")
+            FIRST, FOLLOW = cg.FIRST, cg.FOLLOW
+            for A in G:
+                print(f"{A} :", sorted(FIRST.get(A, set())))
+            print("\n== SIGUIENTES ==")
+            for A in G:
+                print(f"{A} :", sorted(FOLLOW.get(A, set())))
 
-    # 2) Tokenizar entrada
-    src = ip.read_text(encoding="utf-8")
+            print("\n== PREDICCIÓN ==")
+            for (A, rhs), terms in cg.PRED.items():
+                print(f"{A} -> {' '.join(rhs)} : {sorted(terms)}")
+
+        if show_table:
+            print("\n== Tabla LL(1) ==")
+            for (A, a), prods in sorted(TABLE.items()):
+                print(f"[{A},{a}] -> {' / '.join(prods)}")
+            conf = cg.meta["conflicts"]  # contado sobre las máscaras de PREDICT
+            print("\n✓ Sin conflictos LL(1)" if conf == 0 else f"\n✗ Conflictos: {conf}")
+
+        # 4) Parse predictivo (y CST en el mismo recorrido, si se pide)
+        if recover:
+            # Todos los errores sintácticos en una pasada (recuperación con FOLLOW)
+            counter = TokenCounter() if profile is not None else None
+            try:
+                with phase(profile, parse_phase):
+                    # Uno de más: así se sabe si la lista quedó cortada por el tope
+                    ok, errors = parse_ll1_recover(start, G, TABLE, tokens if counter is None else counter.wrap(tokens),
+                                                   cg.FOLLOW, rows=cg.ROWS, max_errors=max_errors + 1)
+            except ValueError as e:
+                print(str(e))
+                return 1
+            finally:
+                if counter is not None:
+                    profile.counters.update(counter.as_dict())
+            truncated = len(errors) > max_errors
+            for msg in errors[:max_errors]:
+                print(msg)
+            if truncated:
+                print(f"Se alcanzo el maximo de {max_errors} errores; el analisis se detuvo.")
+            if ok:
+                print("El analisis sintactico ha finalizado exitosamente.")
+            return 1 if lex_errors else (0 if ok else 2)
+
+        tree = CST(G) if cst_out else None
+        deriv = deriv_file = None
+        if deriv_out:
+            Path(deriv_out).parent.mkdir(parents=True, exist_ok=True)
+            deriv_file = open(deriv_out, "wb") if deriv_format == "bin" else open(deriv_out, "w", encoding="utf-8")
+            deriv = DerivationWriter(G, deriv_file, deriv_format)
+        elif show_deriv:
+            deriv = DerivationWriter(G, sys.stdout)
+        counters = None
+        if profile is not None:
+            # Los contadores se montan sobre el flujo de tokens y el sumidero deriv
+            counters = ParseCounters(cg.ROWS, deriv)
+            tokens, deriv = counters.wrap(tokens), counters
+        try:
+            with phase(profile, parse_phase):
+                if resolve_conflicts and cg.meta["conflicts"]:
+                    # Las celdas con conflicto se resuelven especulando (sin flujo: mira adelante)
+                    ok, msg = parse_ll1_resolve(start, G, TABLE, tokens, deriv=deriv, rows=cg.ROWS, tree=tree,
+                                                stats=profile.counters if profile is not None else None)
+                elif tree is not None:
+                    ok, msg = parse_ll1(start, G, TABLE, tokens, deriv=deriv, rows=cg.ROWS, tree=tree)
+                else:
+                    # Programa de enteros (program.py): mismos resultados, sin armar strings por paso
+                    ok, msg = parse_program(program_for(cg), tokens, deriv=deriv)
+        except ValueError as e:
+            # Solo en modo flujo: error léxico encontrado antes de terminar el parse
+            print(str(e))
+            return 1
+        finally:
+            # La traza queda completa hasta la última producción aplicada (también si hubo error)
+            if deriv is not None:
+                deriv.close()
+            if deriv_file is not None:
+                deriv_file.close()
+            if counters is not None:
+                profile.counters.update(counters.as_dict())
+        print(msg)
+        if ok and tree is not None:
+            with phase(profile, "save_cst"):
+                Path(cst_out).parent.mkdir(parents=True, exist_ok=True)
+                tree.save(cst_out, cst_format)
+        return 1 if lex_errors else (0 if ok else 2)
+
+def run_parse_cached(cache: ResultCache, grammar_path: str, input_path: str, **kw) -> int:
+    """run_parse con caché de resultados: si la fuente, la gramática, la versión
+    y las opciones (`kw`, las de run_parse que no imprimen tablas ni trazas) no
+    cambiaron, se repite la salida guardada (y el CST, si se pidió) sin lexear
+    ni parsear."""
     try:
-        tokens = tokenize(src)
-    except ValueError as e:
-        print(str(e))
+        source = Path(input_path).read_bytes()
+        digest = grammar_digest(Path(grammar_path).read_text(encoding="utf-8"))
+    except (OSError, UnicodeDecodeError):
+        return run_parse(grammar_path, input_path, **kw)  # reporta el error como siempre
+    cst_out = kw.get("cst_out")
+    options = {
+        "mode": "parse",
+        # Con --stream/--mmap se reporta el primer error en orden de entrada
+        # (uno sintáctico puede ganarle a uno léxico posterior)
+        "stream": kw.get("stream", False) or kw.get("use_mmap", False),
+        "lexer": kw.get("lexer", "classic"),
+        "recover": kw.get("recover", False),
+        "max_errors": kw.get("max_errors", DEFAULT_MAX_ERRORS) if kw.get("recover") else None,
+        "lex_recover": kw.get("lex_recover", False),
+        "resolve_conflicts": kw.get("resolve_conflicts", False),
+        "cst_format": kw.get("cst_format", "jsonl") if cst_out else None,
+    }
+    key = cache.key(source, digest, options)
+    hit = cache.get(key)
+    if hit is not None:
+        result, artifacts = hit
+        sys.stdout.write(result["output"])
+        if "cst" in artifacts:
+            Path(cst_out).parent.mkdir(parents=True, exist_ok=True)
+            Path(cst_out).write_bytes(artifacts["cst"])
+        return result["exit_code"]
+
+    def stamp():
+        try:
+            st = os.stat(cst_out)
+            return st.st_mtime_ns, st.st_size, st.st_ino
+        except OSError:
+            return None
+
+    before = stamp() if cst_out else None
+    out = io.StringIO()
+    with redirect_stdout(_Tee(out, sys.stdout)):
+        code = run_parse(grammar_path, input_path, **kw)
+    artifacts = {}
+    # El CST se guarda si run_parse lo escribió (parse OK, también con errores léxicos recuperados)
+    after = stamp() if cst_out else None
+    if after is not None and (code == 0 or after != before):
+        artifacts["cst"] = Path(cst_out).read_bytes()
+    cache.put(key, {"exit_code": code, "output": out.getvalue()}, artifacts)
+    return code
+
+def run_compile(grammar_path: str, out_path: str | None, cache_dir: str | None = None, use_cache: bool = True) -> int:
+    gp = Path(grammar_path)
+    if not gp.exists():
+        print(f"Gramática no encontrada: {grammar_path}")
         return 1
+    text = gp.read_text(encoding="utf-8")
+    cg = load_compiled_grammar(str(gp), cache_dir=cache_dir, use_cache=use_cache)
+    out = Path(out_path or f"outputs/parsers/{gp.stem}_parser.py")
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(generate_parser(cg, text, gp.as_posix()), encoding="utf-8")
+    conf = cg.meta["conflicts"]
+    if conf:
+        print(f"✗ Conflictos: {conf} (se usa la primera producción de cada celda)")
+    print(f"Parser generado: {out}")
+    return 0
 
-    # 3) FIRST, FOLLOW, PREDICT y Tabla
-    FIRST = compute_first_sets(G)
-    FOLLOW = compute_follow_sets(start, G, FIRST)
-    PRED = compute_predict_sets(start, G, FIRST, FOLLOW)
-    TABLE = build_ll1_table(PRED)
-
-    # 4) Reportes opcionales
-    if show_sets:
-        print("== PRIMEROS ==")
-        for A in G:
-            print(f"{A} :", sorted(FIRST.get(A, set())))
-        print("\n== SIGUIENTES ==")
-        for A in G:
-            print(f"{A} :", sorted(FOLLOW.get(A, set())))
-
-        print("\n== PREDICCIÓN ==")
-        for (A, rhs), terms in PRED.items():
-            print(f"{A} -> {' '.join(rhs)} : {sorted(terms)}")
-
-    if show_table:
-        print("\n== Tabla LL(1) ==")
-        for (A, a), prods in sorted(TABLE.items()):
-            print(f"[{A},{a}] -> {' / '.join(prods)}")
-        conf = has_conflicts(TABLE)
-        print("\n✓ Sin conflictos LL(1)" if conf == 0 else f"\n✗ Conflictos: {conf}")
-
-    # 5) Parse predictivo
-    ok, msg = parse_ll1(start, G, TABLE, tokens, show_derivations=show_deriv)
-    print(msg)
-    return 0 if ok else 2
+def _positive_int(text: str) -> int:
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"se esperaba un entero: {text!r}")
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"debe ser al menos 1: {value}")
+    return value
+
+def _main_batch(args) -> int:
+    paths = collect_inputs(args.batch or [], args.files_from, args.pattern)
+    cg = None
+    if args.mode == "parse":
+        if not Path(args.grammar).exists():
+            print(f"Gramática no encontrada: {args.grammar}")
+            return 1
+        cg = load_compiled_grammar(args.grammar, cache_dir=args.grammar_cache, use_cache=not args.no_grammar_cache)
+    return run_batch(args.mode, paths, cg, lexer=args.lexer, jobs=args.jobs, summary_path=args.summary,
+                     result_cache=args.result_cache, result_cache_size=args.result_cache_size)
+
+def _write_profile(profile: Profiler, fmt: str, out_path: str | None) -> None:
+    report = profile.report()
+    text = json.dumps(report, ensure_ascii=False, indent=2) if fmt == "json" else format_text(report)
+    if out_path:
+        Path(out_path).parent.mkdir(parents=True, exist_ok=True)
+        Path(out_path).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text, file=sys.stderr)
 
 def main():
     ap = argparse.ArgumentParser(description="Proyecto Corte 2: Analizador léxico + sintáctico (LL(1)).")
-    ap.add_argument("--mode", choices=["lex", "parse"], required=True, help="lex: solo lexer; parse: LL(1).")
-    ap.add_argument("--input", required=True, help="Ruta del archivo fuente (.py o .txt)")
-    ap.add_argument("--out", help="(lex) archivo de salida de tokens")
+    ap.add_argument("--mode", choices=["lex", "parse", "compile", "serve"], required=True, help="lex: solo lexer; parse: LL(1); compile: genera el módulo parser de --grammar; serve: servidor JSON-lines (ver src/server.py).")
+    ap.add_argument("--input", help="Ruta del archivo fuente (.py o .txt)")
+    ap.add_argument("--batch", nargs="+", metavar="SPEC", help="modo por lotes: directorios, globs o archivos a analizar")
+    ap.add_argument("--files-from", metavar="LISTA", help="(lotes) archivo con una ruta por línea ('-' = stdin)")
+    ap.add_argument("--pattern", default="*.py", help="(lotes) patrón de archivos al recorrer directorios (por defecto *.py)")
+    ap.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="(lotes) procesos del pool (1 = sin pool)")
+    ap.add_argument("--summary", default="-", metavar="RUTA", help="(lotes) destino del resumen JSON ('-' = stdout)")
+    ap.add_argument("--out", help="(lex) archivo de salida de tokens; (compile) módulo a generar (por defecto outputs/parsers/<gramatica>_parser.py)")
+    ap.add_argument("--format", choices=TOKEN_FORMATS, default="text", help="(lex) formato de los tokens: text (<tipo, lexema, linea, col>), jsonl o bin (ids de tipo + desplazamientos; ver src/lexer/token_io.py)")
+    ap.add_argument("--with-source", action="store_true", help="(lex) con --format bin, incluye la fuente en el archivo")
+    ap.add_argument("--lexer", choices=sorted(LEXERS), default="classic", help="motor léxico: classic (carácter a carácter), regex (patrón maestro), compact (patrón maestro hacia un almacén compacto) o parallel (compact por trozos de líneas, un proceso por núcleo)")
+    ap.add_argument("--stream", action="store_true", help="lee la entrada por bloques y lexea a demanda del parser (memoria acotada)")
+    ap.add_argument("--mmap", action="store_true", help="como --stream, pero leyendo la entrada mapeada en memoria")
+    ap.add_argument("--tokens-in", metavar="RUTA", help="(parse) parsea los tokens guardados con --mode lex --out (text, jsonl o bin; se detecta) en lugar de lexear --input; un bin sin fuente incluida usa --input como fuente")
     ap.add_argument("--grammar", help="(parse) gramática .g, ej: grammars/ejemplo_p6.g", default="grammars/ejemplo_p6.g")
     ap.add_argument("--show-sets", action="store_true", help="(parse) imprime FIRST/FOLLOW/PREDICT")
     ap.add_argument("--show-table", action="store_true", help="(parse) imprime la tabla LL(1)")
-    ap.add_argument("--show-deriv", action="store_true", help="(parse) imprime derivaciones aplicadas")
+    ap.add_argument("--show-deriv", action="store_true", help="(parse) imprime las producciones aplicadas (derivación más a la izquierda), a medida que se aplican")
+    ap.add_argument("--deriv-out", metavar="RUTA", help="(parse) escribe la derivación en un archivo en lugar de stdout")
+    ap.add_argument("--deriv-format", choices=["text", "bin"], default="text", help="(parse) formato de --deriv-out: text (A -> α) o bin (ids uint32; decodificar con python -m src.syntax.deriv)")
+    ap.add_argument("--cst-out", metavar="RUTA", help="(parse) guarda el árbol de sintaxis concreta si el análisis es exitoso")
+    ap.add_argument("--cst-format", choices=["jsonl", "bin"], default="jsonl", help="(parse) formato de --cst-out: jsonl (un nodo por línea) o bin (arreglos compactos)")
+    ap.add_argument("--lex-recover", action="store_true", help="no se detiene en el primer error léxico: los reporta todos y sigue (usa el motor regex)")
+    ap.add_argument("--recover", action="store_true", help="(parse) no se detiene en el primer error sintáctico: se recupera con FOLLOW y los reporta todos")
+    ap.add_argument("--resolve-conflicts", action="store_true", help="(parse) en las celdas con varias producciones prueba las alternativas mirando adelante (acotado, con memo) en lugar de tomar siempre la primera")
+    ap.add_argument("--max-errors", type=_positive_int, default=DEFAULT_MAX_ERRORS, help=f"(parse) con --recover, máximo de errores a reportar (por defecto {DEFAULT_MAX_ERRORS})")
+    ap.add_argument("--profile", action="store_true", help="(lex/parse) perfil de la ejecución: tiempo de pared y CPU y memoria por fase, más contadores")
+    ap.add_argument("--profile-format", choices=["text", "json"], default="text", help="formato del perfil (por defecto text)")
+    ap.add_argument("--profile-out", metavar="RUTA", help="archivo del perfil (por defecto stderr, para no mezclarlo con la salida)")
+    ap.add_argument("--profile-no-memory", action="store_true", help="con --profile, no medir memoria (tracemalloc encarece los tiempos)")
+    ap.add_argument("--socket", metavar="RUTA", help="(serve) escucha en este socket Unix en lugar de stdin/stdout")
+    ap.add_argument("--workers", type=int, help="(serve) hilos que atienden pedidos (por defecto min(8, núcleos))")
+    ap.add_argument("--max-grammars", type=int, default=DEFAULT_MAX_GRAMMARS, help=f"(serve) gramáticas compiladas que se mantienen en memoria (LRU; por defecto {DEFAULT_MAX_GRAMMARS})")
+    ap.add_argument("--result-cache", metavar="DIR", help="(parse, también con --batch) guarda cada resultado por hash de fuente + gramática + versión + opciones y lo repite sin re-analizar si nada cambió")
+    ap.add_argument("--result-cache-size", type=int, default=DEFAULT_MAX_BYTES >> 20, metavar="MB", help=f"tamaño máximo de --result-cache; se desalojan las entradas menos usadas (por defecto {DEFAULT_MAX_BYTES >> 20} MB)")
+    ap.add_argument("--grammar-cache", metavar="DIR", help="(parse, compile) directorio de la caché de gramáticas compiladas (por defecto .ll1cache/ junto a la gramática)")
+    ap.add_argument("--no-grammar-cache", action="store_true", help="(parse, compile) no leer ni escribir la caché de gramáticas compiladas")
     args = ap.parse_args()
 
-    if args.mode == "lex":
-        exit(run_lex(args.input, args.out))
-    else:
-        exit(run_parse(args.grammar, args.input, args.show_sets, args.show_table, args.show_deriv))
+    if args.mode == "compile":
+        exit(run_compile(args.grammar, args.out, cache_dir=args.grammar_cache, use_cache=not args.no_grammar_cache))
+    if args.mode == "serve":
+        exit(run_server(args.socket, args.workers, cache_dir=args.grammar_cache, use_cache=not args.no_grammar_cache,
+                        max_grammars=args.max_grammars))
+    if args.batch or args.files_from:
+        # Opciones de un solo archivo que el modo por lotes no implementa
+        unsupported = [flag for flag, on in (
+            ("--input", args.input), ("--stream", args.stream), ("--mmap", args.mmap), ("--tokens-in", args.tokens_in),
+            ("--out", args.out), ("--format", args.format != "text"), ("--with-source", args.with_source),
+            ("--show-sets", args.show_sets), ("--show-table", args.show_table), ("--show-deriv", args.show_deriv),
+            ("--deriv-out", args.deriv_out), ("--cst-out", args.cst_out), ("--lex-recover", args.lex_recover),
+            ("--recover", args.recover), ("--resolve-conflicts", args.resolve_conflicts), ("--profile", args.profile),
+        ) if on]
+        if unsupported:
+            ap.error(f"{', '.join(unsupported)} no se admite con --batch/--files-from")
+        exit(_main_batch(args))
+    if not args.input and not (args.mode == "parse" and args.tokens_in):
+        ap.error("se requiere --input (o --batch/--files-from, o --tokens-in en modo parse)")
+
+    profile = Profiler(memory=not args.profile_no_memory) if args.profile else None
+    try:
+        if args.mode == "lex":
+            code = run_lex(args.input, args.out, lexer=args.lexer, stream=args.stream, use_mmap=args.mmap,
+                           lex_recover=args.lex_recover, profile=profile, fmt=args.format,
+                           with_source=args.with_source)
+        elif (args.result_cache and not (args.show_sets or args.show_table or args.show_deriv)
+              and not (args.deriv_out or args.tokens_in or profile)):
+            # Solo se cachea lo que no imprime tablas, trazas ni perfiles
+            cache = ResultCache(args.result_cache, args.result_cache_size << 20)
+            code = run_parse_cached(cache, args.grammar, args.input,
+                                    cache_dir=args.grammar_cache, use_cache=not args.no_grammar_cache,
+                                    lexer=args.lexer, stream=args.stream, use_mmap=args.mmap,
+                                    cst_out=args.cst_out, cst_format=args.cst_format,
+                                    recover=args.recover, max_errors=args.max_errors, lex_recover=args.lex_recover,
+                                    resolve_conflicts=args.resolve_conflicts)
+        else:
+            code = run_parse(args.grammar, args.input, args.show_sets, args.show_table, args.show_deriv,
+                             cache_dir=args.grammar_cache, use_cache=not args.no_grammar_cache,
+                             lexer=args.lexer, stream=args.stream, use_mmap=args.mmap,
+                             cst_out=args.cst_out, cst_format=args.cst_format,
+                             deriv_out=args.deriv_out, deriv_format=args.deriv_format,
+                             recover=args.recover, max_errors=args.max_errors, lex_recover=args.lex_recover,
+                             profile=profile, tokens_in=args.tokens_in, resolve_conflicts=args.resolve_conflicts)
+    finally:
+        if profile is not None:
+            profile.close()
+    if profile is not None:
+        _write_profile(profile, args.profile_format, args.profile_out)
+    exit(code)
 
 if __name__ == "__main__":
     main()
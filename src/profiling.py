@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""
+profiling.py
+------------
+Perfil de una ejecución de --mode lex / --mode parse (--profile).
+
+- Profiler.phase(nombre): tiempo de pared (perf_counter), tiempo de CPU
+  (process_time) y memoria (tracemalloc) de cada fase: el pico que necesitó
+  la fase por encima de lo que ya había y lo que quedó retenido al terminar.
+  tracemalloc encarece cada asignación: con memory=False
+  (--profile-no-memory) los tiempos no quedan inflados
+- Contadores del análisis de la gramática: FIRST/FOLLOW se calculan con el
+  grafo de dependencias por componentes (bitsets.py), así que en lugar de
+  pasadas de punto fijo se reportan aristas, componentes y la mayor
+  componente; compute_first_sets / compute_follow_sets (cierre clásico)
+  anotan sus iteraciones en el mismo dict. Solo si la gramática se compila
+  (no si sale de la caché)
+- Contadores del parser (ParseCounters): tokens por categoría, búsquedas en
+  la tabla, cuántas se resolvieron por las columnas del tipo del token (el
+  respaldo cuando no hay columna para el lexema), expansiones ε y profundidad
+  máxima de la pila. Se obtienen envolviendo el flujo de tokens y el sumidero
+  `deriv` de parse_ll1, sin tocar su bucle: sin --profile no cuestan nada
+
+Salida: texto legible (format_text) o JSON (Profiler.report()).
+"""
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from .lexer.regex_scanner import ERROR_TYPE
+from .lexer.token_defs import RESERVED, TOKENS
+from .syntax.grammar_io import EPS
+
+Token = Tuple[str, str, int, int]  # (tipo, lexema, linea, col)
+
+_SYMBOL_TYPES = frozenset(TOKENS.values())
+_CATEGORIES = {"identificador": "identificador", "tk_entero": "entero", "tk_cadena": "cadena", ERROR_TYPE: "error"}
+
+def token_category(ttype: str) -> str:
+    """reservada, identificador, entero, cadena, simbolo, error u otro."""
+    if ttype in RESERVED:
+        return "reservada"
+    if ttype in _SYMBOL_TYPES:
+        return "simbolo"
+    return _CATEGORIES.get(ttype, "otro")
+
+class Profiler:
+    """Fases medidas en orden y contadores de la ejecución."""
+
+    def __init__(self, memory: bool = True):
+        self.memory = memory
+        self.phases: List[Dict[str, object]] = []
+        self.counters: Dict[str, object] = {}
+        self._owns_tracemalloc = False
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        if self.memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._owns_tracemalloc = True
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        w0, c0 = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            row: Dict[str, object] = {
+                "phase": name,
+                "wall_s": round(time.perf_counter() - w0, 6),
+                "cpu_s": round(time.process_time() - c0, 6),
+            }
+            if self.memory:
+                current, peak = tracemalloc.get_traced_memory()
+                row["peak_bytes"] = max(0, peak - base)
+                row["retained_bytes"] = current - base
+            self.phases.append(row)
+
+    def close(self) -> None:
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+            self._owns_tracemalloc = False
+
+    def report(self) -> Dict[str, object]:
+        return {
+            "phases": self.phases,
+            "total": {
+                "wall_s": round(sum(p["wall_s"] for p in self.phases), 6),
+                "cpu_s": round(sum(p["cpu_s"] for p in self.phases), 6),
+            },
+            "counters": self.counters,
+        }
+
+class TokenCounter:
+    """Cuenta los tokens de un flujo, por categoría, a medida que pasan."""
+
+    def __init__(self):
+        self.tokens = 0
+        self.by_category: Dict[str, int] = {}
+        self._tok: Token | None = None  # último token entregado (el actual del parser)
+
+    def wrap(self, tokens: Iterable[Token]) -> Iterator[Token]:
+        cats = self.by_category
+        for tok in tokens:
+            self._tok = tok
+            self.tokens += 1
+            c = token_category(tok[0])
+            cats[c] = cats.get(c, 0) + 1
+            yield tok
+        self._tok = None
+
+    def as_dict(self) -> Dict[str, object]:
+        return {"tokens": self.tokens, "tokens_by_category": dict(sorted(self.by_category.items()))}
+
+class ParseCounters(TokenCounter):
+    """Contadores de parse_ll1: parse_ll1(..., tokens=pc.wrap(tokens), deriv=pc).
+    Reenvía cada producción a `deriv` si se pasa (traza de --show-deriv/--deriv-out).
+
+    La profundidad de la pila se reconstruye sin verla: empieza en 2 ($ y el
+    inicial), cada paso saca un símbolo y cada expansión apila su rhs; los
+    terminales sacados son los tokens ya consumidos."""
+
+    def __init__(self, rows: Dict[str, Dict[str, List[str]]], deriv=None):
+        super().__init__()
+        self.rows = rows
+        self.deriv = deriv
+        self.lookups = 0
+        self.type_fallbacks = 0
+        self.epsilon = 0
+        self.max_depth = 2
+        self._pushed = 0
+        self._rhs_len: Dict[Tuple[str, str], int] = {}
+
+    def __call__(self, A: str, prod: str) -> None:
+        self.lookups += 1
+        tok = self._tok
+        # Columna por lexema ($ al agotarse la entrada) o, si no hay, por tipo
+        if (tok[1] if tok is not None else "$") not in self.rows[A]:
+            self.type_fallbacks += 1
+        n = self._rhs_len.get((A, prod))
+        if n is None:
+            n = self._rhs_len[(A, prod)] = 0 if prod == EPS else len(prod.split())
+        if n == 0:
+            self.epsilon += 1
+        self._pushed += n
+        consumed = self.tokens - 1 if tok is not None else self.tokens
+        depth = 2 - self.lookups - consumed + self._pushed
+        if depth > self.max_depth:
+            self.max_depth = depth
+        if self.deriv is not None:
+            self.deriv(A, prod)
+
+    def close(self) -> None:
+        if self.deriv is not None:
+            self.deriv.close()
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            **super().as_dict(),
+            "table_lookups": self.lookups,
+            "type_fallbacks": self.type_fallbacks,
+            "epsilon_expansions": self.epsilon,
+            "max_stack_depth": self.max_depth,
+        }
+
+def format_text(report: Dict[str, object]) -> str:
+    lines = ["== PERFIL =="]
+    for p in report["phases"]:
+        text = f"{p['phase']:<12} pared {p['wall_s'] * 1000:10.3f} ms  cpu {p['cpu_s'] * 1000:10.3f} ms"
+        if "peak_bytes" in p:
+            text += f"  pico {p['peak_bytes'] / (1 << 20):9.2f} MB  retenido {p['retained_bytes'] / (1 << 20):9.2f} MB"
+        lines.append(text)
+    total = report["total"]
+    lines.append(f"{'total':<12} pared {total['wall_s'] * 1000:10.3f} ms  cpu {total['cpu_s'] * 1000:10.3f} ms")
+    counters = report["counters"]
+    if counters:
+        lines.append("-- contadores --")
+        for k, v in counters.items():
+            if isinstance(v, dict):
+                v = ", ".join(f"{c}={n}" for c, n in v.items()) or "—"
+            lines.append(f"{k}: {v}")
+    return "\n".join(lines)
+
+def phase(profiler: "Profiler | None", name: str):
+    """profiler.phase(name), o un contexto vacío si no se perfila."""
+    return profiler.phase(name) if profiler is not None else nullcontext()
@@ -1,19 +1,30 @@
 # -*- coding: utf-8 -*-
 """
 Utilidades de salida para el modo léxico.
+(Los formatos de --mode lex --format y la escritura por bloques están en
+lexer/token_io.py.)
 """
-from typing import List, Tuple
+import sys
+from typing import Iterable, Tuple
 
 Token = Tuple[str, str, int, int]
 
-def print_tokens(tokens: List[Token]) -> None:
-    for ttype, lex, line, col in tokens:
-        if ttype in {"identificador", "tk_entero", "tk_cadena"}:
-            print(f"<{ttype}, {lex}, {line}, {col}>")
-        else:
-            # Reservadas o símbolos (ya traen nombre estándar)
-            if ttype.startswith("tk_"):
-                print(f"<{ttype}, {line}, {col}>")
-            else:
-                # reservadas: tipo = lexema
-                print(f"<{ttype}, {line}, {col}>")
+# Tipos que se reportan con su lexema
+_WITH_LEXEME = frozenset({"identificador", "tk_entero", "tk_cadena"})
+
+def format_token(tok: Token) -> str:
+    ttype, lex, line, col = tok
+    if ttype in _WITH_LEXEME:
+        return f"<{ttype}, {lex}, {line}, {col}>"
+    # Reservadas o símbolos (ya traen nombre estándar; reservadas: tipo = lexema)
+    return f"<{ttype}, {line}, {col}>"
+
+def print_tokens(tokens: Iterable[Token], block: int = 1 << 14) -> None:
+    """Imprime una línea por token, escribiendo en bloques de `block` líneas."""
+    buf = []
+    for tok in tokens:
+        buf.append(format_token(tok) + "\n")
+        if len(buf) >= block:
+            sys.stdout.write("".join(buf))
+            buf.clear()
+    sys.stdout.write("".join(buf))
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""
+result_cache.py
+---------------
+Caché en disco de resultados de parse (--result-cache DIR): si ni la fuente,
+ni la gramática, ni la versión de la herramienta, ni las opciones cambiaron,
+el resultado se lee del disco y no se lexea ni se parsea.
+
+- La clave es un SHA-256 de: formato de la caché, hash de la gramática
+  (grammar_cache.grammar_digest, que ya incluye la versión), las opciones que
+  cambian la salida y los bytes de la fuente
+- Cada entrada es un archivo `DIR/<2 hex>/<clave>.res`: una línea mágica, una
+  línea JSON con el resultado (código de salida, salida impresa, ...) y la
+  lista de artefactos, y después los bytes de cada artefacto (p.ej. el CST)
+- Escritura atómica (tmp + replace): un lector ve la entrada vieja o la
+  nueva completa, nunca una a medias, aunque escriban varios procesos a la vez.
+  Una entrada ilegible se trata como "no hay entrada"
+- LRU por tamaño: cada acierto actualiza el mtime de la entrada; cuando el
+  total supera `max_bytes` se borran las de mtime más viejo hasta bajar al
+  90%. El total no se mide recorriendo el directorio en cada proceso: vive en
+  un índice `DIR/.size` que cada escritura incrementa bajo un lock (fcntl) y
+  que el desalojo recalcula. Es aproximado (reescribir una entrada la cuenta
+  dos veces), pero solo puede adelantar un barrido, que lo corrige. El
+  directorio se recorre solo si el índice no existe
+- El desalojo toma otro lock para que un solo proceso barra a la vez; donde no
+  hay fcntl se trabaja sin locks (los borrados ya son tolerantes)
+"""
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, Tuple
+
+from . import __version__
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+# Subir si cambia el formato de las entradas, lo que se guarda en ellas o el
+# resultado del análisis (2: saltos de línea universales en el modo por lotes).
+RESULT_FORMAT = 2
+MAGIC = b"LL1RES1\n"
+DEFAULT_MAX_BYTES = 512 << 20
+SUFFIX = ".res"
+
+class ResultCache:
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.dir = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = self.misses = self.writes = self.evictions = 0
+
+    @staticmethod
+    def key(source: bytes, grammar_digest: str, options: Dict[str, object]) -> str:
+        h = hashlib.sha256()
+        h.update(f"ll1-result/{__version__}/{RESULT_FORMAT}\n{grammar_digest}\n".encode("utf-8"))
+        h.update(json.dumps(options, sort_keys=True).encode("utf-8") + b"\n")
+        h.update(source)
+        return h.hexdigest()
+
+    def path_for(self, key: str) -> Path:
+        return self.dir / key[:2] / (key + SUFFIX)
+
+    def get(self, key: str) -> Tuple[Dict[str, object], Dict[str, bytes]] | None:
+        """(resultado, artefactos) guardados con `key`, o None."""
+        path = self.path_for(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            if not data.startswith(MAGIC):
+                raise ValueError("entrada inválida")
+            nl = data.index(b"\n", len(MAGIC))
+            head = json.loads(data[len(MAGIC):nl])
+            artifacts: Dict[str, bytes] = {}
+            pos = nl + 1
+            for name, size in head["artifacts"]:
+                artifacts[name] = data[pos:pos + size]
+                pos += size
+            if pos != len(data):
+                raise ValueError("entrada truncada")
+            result = head["result"]
+        except (OSError, ValueError, KeyError, TypeError):
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)  # LRU: uso reciente
+        except OSError:
+            pass
+        self.hits += 1
+        return result, artifacts
+
+    def put(self, key: str, result: Dict[str, object], artifacts: Dict[str, bytes] | None = None) -> None:
+        """Guarda la entrada (atómicamente). Si no se puede escribir, se ignora."""
+        artifacts = artifacts or {}
+        head = {"result": result, "artifacts": [[name, len(blob)] for name, blob in artifacts.items()]}
+        data = MAGIC + json.dumps(head, ensure_ascii=False).encode("utf-8") + b"\n" + b"".join(artifacts.values())
+        path = self.path_for(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(tmp, path)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+        except OSError:
+            return
+        self.writes += 1
+        if self._add_bytes(len(data)) > self.max_bytes:
+            self.prune()
+
+    def _add_bytes(self, n: int | None, total: int | None = None) -> int:
+        """Suma `n` al índice de tamaño (o lo fija en `total`) y retorna el
+        total. Si el índice no existe se mide el directorio."""
+        try:
+            with open(self.dir / ".size", "a+") as f:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+                f.seek(0)
+                text = f.read().strip()
+                if total is None:
+                    # Sin índice, la medición ya incluye la entrada recién escrita
+                    total = int(text) + n if text.isdigit() else self._total_bytes()
+                f.seek(0)
+                f.truncate()
+                f.write(str(total))
+            return total
+        except OSError:
+            return 0
+
+    def _entries(self):
+        for sub in os.scandir(self.dir):
+            if not sub.is_dir():
+                continue
+            for e in os.scandir(sub.path):
+                if e.name.endswith(SUFFIX):
+                    try:
+                        st = e.stat()
+                    except OSError:
+                        continue  # lo borró otro proceso
+                    yield st.st_mtime_ns, st.st_size, e.path
+
+    def _total_bytes(self) -> int:
+        try:
+            return sum(size for _, size, _ in self._entries())
+        except OSError:
+            return 0
+
+    def prune(self, target: int | None = None) -> int:
+        """Borra las entradas menos usadas hasta que el total quede en `target`
+        bytes (por defecto el 90% de max_bytes). Retorna cuántas borró."""
+        target = int(self.max_bytes * 0.9) if target is None else target
+        lock = None
+        try:
+            self.dir.mkdir(parents=True, exist_ok=True)
+            lock = open(self.dir / ".lock", "a+b")
+            if fcntl is not None:
+                try:
+                    fcntl.flock(lock.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except OSError:
+                    return 0  # otro proceso ya está barriendo
+            entries = sorted(self._entries())
+            total = sum(size for _, size, _ in entries)
+            removed = 0
+            for _, size, path in entries:
+                if total <= target:
+                    break
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+                removed += 1
+            self.evictions += removed
+            self._add_bytes(None, total)
+            return removed
+        except OSError:
+            return 0
+        finally:
+            if lock is not None:
+                lock.close()  # libera el flock
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "writes": self.writes, "evictions": self.evictions}
@@ -0,0 +1,278 @@
+# -*- coding: utf-8 -*-
+"""
+server.py
+---------
+Servidor del analizador (--mode serve): un proceso de larga vida que responde
+pedidos JSON-lines por stdin/stdout o por un socket Unix (--socket RUTA), sin
+pagar en cada análisis el arranque del intérprete, los imports ni la
+compilación de la gramática.
+
+Pedido (una línea JSON):
+    {"id": 1, "mode": "parse", "grammar": "grammars/python_subset.g",
+     "source": "x = 1\\n"}                      # o "path": "archivo.py"
+  - mode: "parse" (por defecto) o "lex"
+  - lexer: classic | regex | compact (por defecto classic)
+  - recover / lex_recover / max_errors: como --recover / --lex-recover
+  - tokens: true para incluir los tokens en la respuesta de parse (en lex
+    siempre van)
+  - op: "analyze" (por defecto), "ping", "stats" o "shutdown"
+
+Respuesta (una línea JSON, con el mismo "id"):
+    {"id": 1, "status": "ok", "exit_code": 0,
+     "message": "El analisis sintactico ha finalizado exitosamente.",
+     "errors": [], "elapsed_ms": 0.21}
+  status: ok | lex_error | syntax_error | io_error | bad_request | error;
+  exit_code es el mismo que daría la CLI (0, 1 o 2). Una gramática mal
+  formada o un parámetro inválido dan bad_request; una falla inesperada da
+  error, y el servidor sigue atendiendo los demás pedidos. "errors" lista los errores léxicos
+  y sintácticos (varios con lex_recover / recover).
+
+- Las gramáticas compiladas quedan en memoria (analyzer.Analyzer: LRU por
+  contenido, acotado a --max-grammars); se releen si el archivo cambia (mtime
+  o tamaño)
+- Cada pedido se atiende en un pool de hilos (--workers) desde un bucle
+  asyncio: los pedidos se leen sin esperar a los anteriores y las respuestas
+  salen en orden de finalización (el "id" las empareja). La lectura de
+  archivos se solapa; el análisis en sí comparte el GIL, así que para usar
+  varios núcleos sobre muchos archivos sigue estando --batch --jobs
+
+Ejemplo:
+    python -m src.main --mode serve --socket /tmp/ll1.sock
+    echo '{"id":1,"grammar":"grammars/python_subset.g","path":"examples/python/ok/mini.py"}' | python -m src.main --mode serve
+"""
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Tuple
+
+from .analyzer import DEFAULT_MAX_GRAMMARS, RECOVER_LEXERS, Analyzer
+from .lexer.engines import LEXERS
+from .syntax.grammar_cache import CompiledGrammar
+from .syntax.recovery import DEFAULT_MAX_ERRORS
+
+# Pedidos en vuelo por conexión (acota la memoria si el cliente no lee)
+MAX_PENDING = 256
+
+class BadRequest(Exception):
+    pass
+
+class AnalyzerServer:
+    def __init__(self, workers: int | None = None, cache_dir: str | None = None, use_cache: bool = True,
+                 max_grammars: int = DEFAULT_MAX_GRAMMARS):
+        self.analyzer = Analyzer(max_grammars, cache_dir, use_cache)
+        self.pool = ThreadPoolExecutor(max_workers=workers or min(8, os.cpu_count() or 1))
+        self.requests = 0
+        self._requests_lock = threading.Lock()
+        self._stop: asyncio.Event | None = None
+
+    # -- gramáticas en memoria -------------------------------------------------
+
+    def grammar(self, path: str) -> CompiledGrammar:
+        try:
+            return self.analyzer.load(path)
+        except ValueError as e:
+            raise BadRequest(f"gramática inválida: {path}: {e}")
+
+    # -- un pedido -------------------------------------------------------------
+
+    def handle(self, req: Dict[str, object]) -> Dict[str, object]:
+        """Atiende un pedido ya decodificado (en un hilo del pool)."""
+        t0 = time.perf_counter()
+        with self._requests_lock:
+            self.requests += 1
+        res: Dict[str, object] = {"id": req.get("id")}
+        try:
+            op = req.get("op", "analyze")
+            if op == "ping":
+                res["status"] = "ok"
+            elif op == "stats":
+                stats = self.analyzer.stats()
+                res.update(status="ok", requests=self.requests, grammars=stats.pop("paths"), grammar_cache=stats)
+            elif op == "shutdown":
+                res["status"] = "ok"
+            elif op == "analyze":
+                res.update(self._analyze(req))
+            else:
+                raise BadRequest(f"op desconocida: {op!r}")
+        except BadRequest as e:
+            res.update(status="bad_request", exit_code=1, message=str(e))
+        except (OSError, UnicodeDecodeError) as e:
+            res.update(status="io_error", exit_code=1, message=str(e))
+        except Exception as e:  # un pedido no tumba al servidor
+            res.update(status="error", exit_code=1, message=f"{type(e).__name__}: {e}")
+        res["elapsed_ms"] = round((time.perf_counter() - t0) * 1000, 3)
+        return res
+
+    def _analyze(self, req: Dict[str, object]) -> Dict[str, object]:
+        mode = req.get("mode", "parse")
+        if mode not in ("lex", "parse"):
+            raise BadRequest(f"mode desconocido: {mode!r}")
+        lexer = req.get("lexer", "classic")
+        if lexer not in LEXERS:
+            raise BadRequest(f"lexer desconocido: {lexer!r}")
+        if isinstance(req.get("source"), str):
+            src = req["source"]
+        elif isinstance(req.get("path"), str):
+            try:
+                src = Path(req["path"]).read_text(encoding="utf-8")
+            except FileNotFoundError:
+                raise FileNotFoundError(f"Archivo no encontrado: {req['path']}")
+        else:
+            raise BadRequest("falta 'source' (texto) o 'path'")
+        if req.get("lex_recover") and lexer not in RECOVER_LEXERS:
+            raise BadRequest(f"lex_recover usa el motor regex; no se combina con lexer {lexer!r}")
+        if mode == "lex":
+            # lex_recover: todos los errores léxicos (con sus tokens)
+            result = self.analyzer.tokenize(src, lexer, recover=bool(req.get("lex_recover")))
+        else:
+            if not isinstance(req.get("grammar"), str):
+                raise BadRequest("falta 'grammar'")
+            max_errors = req.get("max_errors", DEFAULT_MAX_ERRORS)
+            if type(max_errors) is not int or max_errors < 0:
+                raise BadRequest(f"max_errors debe ser un entero no negativo: {max_errors!r}")
+            cg = self.grammar(req["grammar"])
+            result = self.analyzer.parse(cg, src, lexer, recover=bool(req.get("recover")),
+                                         lex_recover=bool(req.get("lex_recover")),
+                                         max_errors=max_errors,
+                                         tokens=bool(req.get("tokens")))
+        out: Dict[str, object] = {"status": result.status, "exit_code": result.exit_code,
+                                  "message": result.message, "errors": list(result.errors)}
+        if result.tokens is not None:
+            out["tokens"] = [list(tok) for tok in result.tokens]
+        return out
+
+    def handle_line(self, line: bytes) -> Tuple[bytes, bool]:
+        """Línea JSON -> (línea de respuesta, ¿era un shutdown?)."""
+        try:
+            req = json.loads(line)
+            if not isinstance(req, dict):
+                raise ValueError("se esperaba un objeto JSON")
+        except ValueError as e:
+            res = {"id": None, "status": "bad_request", "exit_code": 1, "message": f"JSON inválido: {e}"}
+            return _encode(res), False
+        return _encode(self.handle(req)), req.get("op") == "shutdown"
+
+    # -- bucle asyncio ---------------------------------------------------------
+
+    async def serve_lines(self, readline: Callable, write: Callable) -> None:
+        """Atiende las líneas que entrega `readline` (corrutina; b"" al final)
+        y pasa cada respuesta a `write` (corrutina)."""
+        loop = asyncio.get_running_loop()
+        slots = asyncio.Semaphore(MAX_PENDING)
+        pending = set()
+
+        async def one(line: bytes) -> None:
+            try:
+                data, shutdown = await loop.run_in_executor(self.pool, self.handle_line, line)
+                await write(data)
+                if shutdown:
+                    self._stop.set()
+            finally:
+                slots.release()
+
+        while True:
+            line = await readline()
+            if not line:
+                break
+            if not line.strip():
+                continue
+            await slots.acquire()
+            task = asyncio.ensure_future(one(line))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+        if pending:
+            await asyncio.gather(*pending)
+
+    async def serve_stdio(self, stdin=None, stdout=None) -> None:
+        stdin = stdin or sys.stdin.buffer
+        stdout = stdout or sys.stdout.buffer
+        loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        lines: asyncio.Queue = asyncio.Queue()
+
+        def reader() -> None:
+            # Hilo daemon: sirve para tuberías, terminales y archivos, y no
+            # retiene la salida del proceso si stdin sigue abierto
+            try:
+                for line in iter(stdin.readline, b""):
+                    loop.call_soon_threadsafe(lines.put_nowait, line)
+                loop.call_soon_threadsafe(lines.put_nowait, b"")
+            except RuntimeError:
+                pass  # el bucle ya terminó (shutdown con stdin abierto)
+
+        threading.Thread(target=reader, name="ll1-stdin", daemon=True).start()
+
+        async def readline() -> bytes:
+            # Tras un shutdown no se leen más pedidos
+            return b"" if self._stop.is_set() else await lines.get()
+
+        async def write(data: bytes) -> None:
+            stdout.write(data)
+            stdout.flush()
+
+        serving = asyncio.ensure_future(self.serve_lines(readline, write))
+        stop = asyncio.ensure_future(self._stop.wait())
+        await asyncio.wait((serving, stop), return_when=asyncio.FIRST_COMPLETED)
+        stop.cancel()
+        if not serving.done():
+            # shutdown con stdin todavía abierto: se terminan los pedidos ya leídos
+            lines.put_nowait(b"")
+        await serving
+
+    async def serve_unix(self, path: str) -> None:
+        self._stop = asyncio.Event()
+        clients: Dict[asyncio.Task, asyncio.StreamReader] = {}
+
+        async def on_client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            clients[asyncio.current_task()] = reader
+
+            async def write(data: bytes) -> None:
+                writer.write(data)
+                await writer.drain()
+            try:
+                await self.serve_lines(reader.readline, write)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                pass  # cliente desconectado
+            finally:
+                writer.close()
+                clients.pop(asyncio.current_task(), None)
+
+        if os.path.exists(path):
+            os.unlink(path)  # socket de una ejecución anterior
+        server = await asyncio.start_unix_server(on_client, path=path, limit=1 << 26)
+        try:
+            async with server:
+                await self._stop.wait()
+            # Cada conexión deja de leer y termina los pedidos que ya tenía
+            for reader in clients.values():
+                reader.feed_eof()
+            await asyncio.gather(*clients, return_exceptions=True)
+        finally:
+            if os.path.exists(path):
+                os.unlink(path)
+
+    def close(self) -> None:
+        self.pool.shutdown()
+
+def _encode(res: Dict[str, object]) -> bytes:
+    return (json.dumps(res, ensure_ascii=False) + "\n").encode("utf-8")
+
+def run_server(socket_path: str | None = None, workers: int | None = None,
+               cache_dir: str | None = None, use_cache: bool = True,
+               max_grammars: int = DEFAULT_MAX_GRAMMARS) -> int:
+    server = AnalyzerServer(workers, cache_dir, use_cache, max_grammars)
+    try:
+        if socket_path:
+            asyncio.run(server.serve_unix(socket_path))
+        else:
+            asyncio.run(server.serve_stdio())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+    return 0
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""
+bitsets.py
+----------
+FIRST / FOLLOW / PREDICT representados como máscaras de bits.
+
+- Los terminales se internan en un alfabeto: bit 0 = ε, bit 1 = $, y luego los
+  terminales de la gramática en orden de aparición
+- Cada conjunto es un int: unión `|`, diferencia `& ~`, inclusión
+  `a & ~b == 0` y conteo `bit_count()` son operaciones enteras, sin copiar sets
+  (los int de Python crecen lo necesario, así que no hay límite de alfabeto)
+- El cálculo sigue el mismo grafo de dependencias por componentes fuertemente
+  conexas que first_follow.compute_*_scc
+- La vista como conjuntos de strings (to_set) solo hace falta para mostrar
+  (--show-sets / --show-table) o para quien espere los dicts de siempre
+"""
+from typing import Dict, List, Set, Tuple
+from .grammar_io import EPS
+from .first_follow import compute_nullable, scc_order
+
+EPS_BIT = 1
+END_BIT = 2
+
+Alphabet = Tuple[str, ...]
+
+def build_alphabet(G: Dict[str, List[List[str]]]) -> Alphabet:
+    symbols: Dict[str, None] = {EPS: None, "$": None}
+    for prods in G.values():
+        for rhs in prods:
+            for a in rhs:
+                if a not in G:
+                    symbols.setdefault(a)
+    return tuple(symbols)
+
+def to_mask(symbols, ids: Dict[str, int]) -> int:
+    mask = 0
+    for s in symbols:
+        mask |= 1 << ids[s]
+    return mask
+
+def to_set(mask: int, alphabet: Alphabet) -> Set[str]:
+    out: Set[str] = set()
+    while mask:
+        low = mask & -mask
+        out.add(alphabet[low.bit_length() - 1])
+        mask ^= low
+    return out
+
+def _propagate(order: List[List[str]], base: Dict[str, int], deps: Dict[str, List[str]]) -> Dict[str, int]:
+    res: Dict[str, int] = {}
+    for comp in order:
+        acc = 0
+        for X in comp:
+            acc |= base[X]
+            for Y in deps[X]:
+                acc |= res.get(Y, 0)   # dentro de la propia componente aún no hay valor
+        for X in comp:
+            res[X] = acc
+    return res
+
+def _graph_stats(stats: Dict[str, int], prefix: str, order: List[List[str]], deps: Dict[str, List[str]]) -> None:
+    """Tamaño del grafo de dependencias resuelto (para --profile)."""
+    stats[f"{prefix}_dependencies"] = sum(len(d) for d in deps.values())
+    stats[f"{prefix}_components"] = len(order)
+    stats[f"{prefix}_largest_component"] = max((len(c) for c in order), default=0)
+
+def first_bits(G: Dict[str, List[List[str]]], ids: Dict[str, int], stats: Dict[str, int] | None = None) -> Dict[str, int]:
+    """FIRST de no-terminales y terminales (el de un terminal es su propio bit).
+    Con `stats` (dict) se anotan las dimensiones del grafo de dependencias."""
+    nullable = compute_nullable(G)
+    base = {A: 0 for A in G}
+    deps: Dict[str, List[str]] = {A: [] for A in G}
+    for A, prods in G.items():
+        for rhs in prods:
+            for a in rhs:
+                if a == EPS:
+                    continue
+                if a not in G:
+                    base[A] |= 1 << ids[a]
+                    break
+                deps[A].append(a)
+                if a not in nullable:
+                    break
+    order = scc_order(G, deps)
+    FIRST = _propagate(order, base, deps)
+    if stats is not None:
+        _graph_stats(stats, "first", order, deps)
+    for A in nullable:
+        FIRST[A] |= EPS_BIT
+    for a, i in ids.items():
+        FIRST.setdefault(a, 1 << i)
+    return FIRST
+
+def sequence_first_bits(seq, FIRST: Dict[str, int]) -> int:
+    out = 0
+    for s in seq:
+        fs = FIRST[s]
+        out |= fs & ~EPS_BIT
+        if not fs & EPS_BIT:
+            return out
+    return out | EPS_BIT
+
+def follow_bits(start: str, G: Dict[str, List[List[str]]], FIRST: Dict[str, int],
+                stats: Dict[str, int] | None = None) -> Dict[str, int]:
+    base = {A: 0 for A in G}
+    base[start] |= END_BIT
+    deps: Dict[str, List[str]] = {A: [] for A in G}
+    for A, prods in G.items():
+        for rhs in prods:
+            tail = EPS_BIT  # FIRST del sufijo vacío
+            for i in range(len(rhs) - 1, -1, -1):
+                B = rhs[i]
+                if B in G:
+                    base[B] |= tail & ~EPS_BIT
+                    if tail & EPS_BIT:
+                        deps[B].append(A)
+                fb = FIRST[B]
+                tail = ((fb & ~EPS_BIT) | tail) if fb & EPS_BIT else fb
+    order = scc_order(G, deps)
+    FOLLOW = _propagate(order, base, deps)
+    if stats is not None:
+        _graph_stats(stats, "follow", order, deps)
+    return {A: FOLLOW[A] for A in G}
+
+def predict_bits(G: Dict[str, List[List[str]]], FIRST: Dict[str, int], FOLLOW: Dict[str, int]) -> Dict[Tuple[str, tuple], int]:
+    """PREDICT(A→α) = (FIRST(α) - {ε}) ∪ (FOLLOW(A) si ε ∈ FIRST(α))"""
+    pred: Dict[Tuple[str, tuple], int] = {}
+    for A, prods in G.items():
+        for rhs in prods:
+            fa = sequence_first_bits(rhs, FIRST)
+            if fa & EPS_BIT:
+                fa = (fa & ~EPS_BIT) | FOLLOW[A]
+            pred[(A, tuple(rhs))] = fa
+    return pred
+
+def build_ll1_table_bits(pred: Dict[Tuple[str, tuple], int], alphabet: Alphabet) -> Dict[Tuple[str, str], List[str]]:
+    """Misma tabla que table.build_ll1_table, con columnas en orden de alfabeto."""
+    table: Dict[Tuple[str, str], List[str]] = {}
+    for (A, rhs), mask in pred.items():
+        prod_str = " ".join(rhs)
+        while mask:
+            low = mask & -mask
+            table.setdefault((A, alphabet[low.bit_length() - 1]), []).append(prod_str)
+            mask ^= low
+    return table
+
+def count_conflicts_bits(pred: Dict[Tuple[str, tuple], int]) -> int:
+    """Celdas con más de una producción (igual que table.has_conflicts), sin armar la tabla."""
+    seen: Dict[str, int] = {}
+    dup: Dict[str, int] = {}
+    for (A, _), mask in pred.items():
+        s = seen.get(A, 0)
+        dup[A] = dup.get(A, 0) | (s & mask)
+        seen[A] = s | mask
+    return sum(m.bit_count() for m in dup.values())
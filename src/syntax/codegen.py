@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""
+codegen.py
+----------
+Generador de parsers: a partir de una gramática compilada (tabla LL(1) ya
+calculada) escribe un módulo Python autónomo, sin dependencias del proyecto,
+con un parser predictivo dirigido por tablas de enteros (las mismas de
+program.py, que recorre ese programa sin generar código).
+
+El bucle de parse no se escribe aparte: el módulo lleva el código fuente de
+ParseProgram y de las funciones de program.py que lo recorren (_RUNTIME, con
+inspect.getsource), así que el parser generado y parse_program son el mismo
+código sobre las mismas tablas (mismos resultados y mensajes que parse_ll1).
+
+Uso:
+    python -m src.main --mode compile --grammar grammars/python_subset.g --out outputs/parsers/python_subset_parser.py
+
+    import python_subset_parser
+    ok, msg = python_subset_parser.parse(tokens)
+"""
+import hashlib
+import inspect
+
+from . import program
+from .grammar_cache import CompiledGrammar
+from .parser_ll1 import SYMBOL_TERMS, TYPE_ALIASES
+from .program import build_program
+
+# Código de program.py que se copia tal cual en el módulo generado; solo usa
+# las constantes que define la plantilla
+_RUNTIME = (
+    program.ParseProgram,
+    program._type_cols,
+    program._by_type,
+    program._TypeClasses,
+    program._error,
+    program._parse_iter,
+)
+
+_TEMPLATE = '''# -*- coding: utf-8 -*-
+"""
+Parser LL(1) generado para {source}
+(sha256 de la gramática: {sha})
+
+Generado por src/syntax/codegen.py; no editar a mano. Regenerar con:
+    python -m src.main --mode compile --grammar {source}
+
+parse(tokens) recibe tuplas (tipo, lexema, linea, col) (lista o cualquier
+iterable) y retorna (ok, mensaje), igual que parse_ll1 con esta gramática.
+"""
+
+from typing import Dict, Iterable, List, NamedTuple, Tuple
+
+Token = Tuple[str, str, int, int]  # (tipo, lexema, linea, col)
+
+GRAMMAR_SHA256 = {sha!r}
+START = {start!r}
+
+# Símbolos: no-terminales 0..{nt_last}, terminales {nt_count}..; END marca el fondo de la pila
+NT_COUNT = {nt_count}
+START_ID = {start_id}
+END = -1
+NO_TERM = -2
+NAMES = {names!r}
+TERM_IDS = {term_ids!r}
+
+# Producciones (A, rhs), su rhs como texto (para deriv) y, por id, el rhs
+# invertido listo para apilar
+PRODUCTIONS = {productions!r}
+PROD_STRS = {prod_strs!r}
+RHS_REV = {rhs_rev!r}
+
+# Tabla LL(1): por no-terminal, id de terminal -> id de producción (primera de la celda)
+ROWS = {rows!r}
+# Orden de columnas de cada fila (desempate si el tipo del token satisface dos)
+ROW_POS = {row_pos!r}
+EXPECTED = {expected!r}
+
+SYMBOL_TERMS = {symbol_terms}
+TYPE_ALIASES = {type_aliases!r}
+OK_MESSAGE = {ok_message!r}
+
+# --- Copiado de src/syntax/program.py ---
+
+{runtime}
+# --- Fin de lo copiado ---
+
+PROGRAM = ParseProgram(
+    start_id=START_ID,
+    nt_count=NT_COUNT,
+    names=NAMES,
+    term_ids=TERM_IDS,
+    productions=PRODUCTIONS,
+    prod_strs=PROD_STRS,
+    rhs_rev=RHS_REV,
+    rows=ROWS,
+    row_pos=ROW_POS,
+    expected=EXPECTED,
+)
+
+def parse(tokens, deriv=None):
+    """Retorna (ok, mensaje); con `deriv` se le pasa cada producción aplicada (A, "X Y Z")."""
+    return _parse_iter(PROGRAM, tokens, deriv)
+'''
+
+def generate_parser(cg: CompiledGrammar, grammar_text: str, source: str = "<texto>") -> str:
+    """Código fuente del módulo parser para la gramática compilada `cg`."""
+    prog = build_program(cg.start, cg.G, cg.ROWS)
+    return _TEMPLATE.format(
+        source=source,
+        sha=hashlib.sha256(grammar_text.encode("utf-8")).hexdigest(),
+        start=cg.start,
+        start_id=prog.start_id,
+        nt_count=prog.nt_count,
+        nt_last=prog.nt_count - 1,
+        names=prog.names,
+        term_ids=prog.term_ids,
+        productions=prog.productions,
+        prod_strs=prog.prod_strs,
+        rhs_rev=prog.rhs_rev,
+        rows=prog.rows,
+        row_pos=prog.row_pos,
+        expected=prog.expected,
+        # repr de un frozenset depende del hash de cada string: orden fijo a mano
+        symbol_terms="frozenset({" + ", ".join(repr(t) for t in sorted(SYMBOL_TERMS)) + "})",
+        type_aliases=TYPE_ALIASES,
+        ok_message=program.OK_MESSAGE,
+        runtime="\n".join(inspect.getsource(obj) for obj in _RUNTIME),
+    )
@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+"""
+conflicts.py
+------------
+Parser LL(1) que resuelve las celdas con conflicto (--resolve-conflicts).
+
+parse_ll1 toma siempre la primera producción de una celda con varias, así que
+rechaza entradas válidas que necesitaban otra. Aquí el recorrido es el mismo
+(mismas reglas de selección, mismos mensajes, deriv y CST) y las celdas sin
+conflicto se predicen igual, con una sola búsqueda. Solo en una celda con
+varias producciones se especula:
+
+- Cada alternativa se reconoce por adelantado sobre los tokens siguientes, a
+  lo sumo `lookahead` tokens (horizonte) y `max_depth` niveles de anidamiento;
+  llegar al horizonte cuenta como alternativa viable
+- Una alternativa que termina antes del horizonte debe dejar un token que la
+  pila pueda continuar (terminal del tope o celda de su no-terminal)
+- Entre las viables se elige la que consume más tokens (la más larga: así el
+  "else" colgante se asocia al "if" más cercano); a igual largo, la primera de
+  la tabla. Si ninguna es viable se usa la primera, como parse_ll1, y el error
+  se reporta en el mismo lugar
+
+El reconocedor es packrat: guarda por (no-terminal, posición) dónde termina (o
+que falla), así que cada par se evalúa a lo sumo una vez por parse y el costo
+total sigue siendo lineal. Dentro del reconocedor los conflictos anidados
+también toman la alternativa más larga. Los resultados que dependen del
+horizonte no se guardan. Una alternativa con recursión directa por izquierda
+(A -> A ...) nunca se elige, ni al especular ni como alternativa por defecto:
+en la pila LL expandiría A sin consumir y no terminaría. La alternativa por
+defecto es entonces la primera sin recursión por izquierda; si todas la
+tienen, se reporta el error de sintaxis normal de la celda.
+
+Los tokens se materializan en una lista: la especulación necesita mirar
+adelante, así que no se parsea en flujo.
+"""
+from typing import Dict, Iterable, List, Tuple
+from .grammar_io import EPS
+from .parser_ll1 import format_expected_from_row, select_production, token_to_symbol
+from .table import build_row_index
+
+Token = Tuple[str, str, int, int]  # (tipo, lexema, linea, col)
+
+DEFAULT_LOOKAHEAD = 64
+DEFAULT_MAX_DEPTH = 200
+
+FAIL = -1
+
+class _Speculator:
+    """Reconocedor packrat acotado sobre la lista de tokens."""
+
+    def __init__(self, G, rows, toks: List[Token], lookahead: int, max_depth: int):
+        self.G = G
+        self.rows = rows
+        self.toks = toks
+        self.lookahead = lookahead
+        self.max_depth = max_depth
+        self.memo: Dict[Tuple[str, int], int] = {}
+        self._rhs: Dict[str, Tuple[str, ...]] = {}
+        self.decisions = 0
+        self.alternatives = 0
+
+    def rhs(self, prod: str) -> Tuple[str, ...]:
+        syms = self._rhs.get(prod)
+        if syms is None:
+            syms = self._rhs[prod] = tuple(prod.split())
+        return syms
+
+    def seq(self, syms: Tuple[str, ...], i: int, horizon: int, depth: int) -> int:
+        """Posición donde termina `syms` reconocido desde i, FAIL, o >= horizon
+        si se llegó al horizonte sin fallar."""
+        G, toks = self.G, self.toks
+        for sym in syms:
+            if i >= horizon:
+                return i
+            if sym == EPS:
+                continue
+            if sym in G:
+                i = self.nonterminal(sym, i, horizon, depth + 1)
+                if i == FAIL:
+                    return FAIL
+            elif token_to_symbol(sym, toks[i]):
+                i += 1
+            else:
+                return FAIL
+        return i
+
+    def nonterminal(self, A: str, i: int, horizon: int, depth: int) -> int:
+        if i >= horizon or depth > self.max_depth:
+            return horizon
+        key = (A, i)
+        hit = self.memo.get(key)
+        if hit is not None:
+            return hit
+        ttype, lex = self.toks[i][0], self.toks[i][1]
+        prods = select_production(self.rows.get(A), ttype, lex)
+        if not prods:
+            self.memo[key] = FAIL
+            return FAIL
+        # Semilla: una recursión por izquierda falla en lugar de no terminar
+        self.memo[key] = FAIL
+        best = FAIL
+        for prod in prods:
+            best = max(best, self.seq(self.rhs(prod), i, horizon, depth))
+            if best >= horizon:
+                break
+        if best >= horizon:
+            del self.memo[key]  # depende del horizonte
+        else:
+            self.memo[key] = best
+        return best
+
+    def continues(self, stack: List[str], tok: Token) -> bool:
+        """¿Puede la pila (sin la producción elegida) seguir con `tok`?"""
+        Y = stack[-1]
+        if Y == "$":
+            return tok[1] == "$"
+        if Y not in self.G:
+            return token_to_symbol(Y, tok)
+        return select_production(self.rows.get(Y), tok[0], tok[1]) is not None
+
+    def choose(self, A: str, prods: List[str], i: int, stack: List[str]) -> str | None:
+        """Producción de la celda con conflicto (A, toks[i]); None si todas
+        sus alternativas son recursivas por izquierda."""
+        self.decisions += 1
+        horizon = i + self.lookahead
+        best, best_end = None, FAIL
+        for prod in prods:
+            syms = self.rhs(prod)
+            if syms[0] == A:
+                continue
+            if best is None:
+                best = prod  # por defecto: la primera sin recursión por izquierda
+            self.alternatives += 1
+            end = self.seq(syms, i, horizon, 0)
+            if end == FAIL or (end < horizon and not self.continues(stack, self.toks[end])):
+                continue
+            if end > best_end:
+                best, best_end = prod, end
+        return best
+
+def parse_ll1_resolve(
+    start: str,
+    G,
+    table,
+    tokens: Iterable[Token],
+    deriv=None,
+    rows=None,
+    tree=None,
+    lookahead: int = DEFAULT_LOOKAHEAD,
+    max_depth: int = DEFAULT_MAX_DEPTH,
+    stats: Dict[str, int] | None = None,
+) -> Tuple[bool, str]:
+    """Como parse_ll1, pero las celdas con conflicto se resuelven especulando.
+    Retorna (ok, mensaje). Con `stats` (dict) agrega conflict_decisions,
+    conflict_alternatives y conflict_memo."""
+    if rows is None:
+        rows = build_row_index(table)
+    toks: List[Token] = tokens if isinstance(tokens, list) else list(tokens)
+    last = toks[-1] if toks else ("EOF", "$", 1, 1)
+    toks = toks + [("EOF", "$", last[2], last[3])]
+    spec = _Speculator(G, rows, toks, lookahead, max_depth)
+    stack: List[str] = ["$", start]
+    nodes: List[int] = [-1, tree.add_root(start)] if tree is not None else []
+    i = 0
+    try:
+        while stack:
+            X = stack.pop()
+            if tree is not None:
+                node = nodes.pop()
+            tok = toks[i]
+            ttype, lex, line, col = tok
+
+            if X == "$":
+                if lex == "$":
+                    return True, "El analisis sintactico ha finalizado exitosamente."
+                return False, f"<{line},{col}> Error sintactico: se encontro: \"{lex}\"; se esperaba fin de entrada"
+
+            if X not in G and X != EPS:
+                if token_to_symbol(X, tok):
+                    if tree is not None:
+                        tree.attach_token(node, tok)
+                    i += 1
+                    continue
+                return False, f"<{line},{col}> Error sintactico: se encontro: \"{lex}\"; se esperaba: \"{X}\""
+
+            prods = select_production(rows.get(X), ttype, lex)
+            # Celda sin conflicto: predicción LL(1); con conflicto: especulación
+            prod = None if not prods else prods[0] if len(prods) == 1 else spec.choose(X, prods, i, stack)
+            if prod is None:
+                esperados = format_expected_from_row(table, X, rows)
+                esperados_str = "\", \"".join(esperados) if esperados else "—"
+                return False, f"<{line},{col}> Error sintactico: se encontro: \"{lex}\"; se esperaba: \"{esperados_str}\""
+            chosen_prod = spec.rhs(prod)
+
+            if deriv is not None:
+                deriv(X, prod)
+            if tree is not None:
+                nodes.extend(reversed(tree.expand(node, X, prod, list(chosen_prod))))
+            if chosen_prod == (EPS,):
+                continue
+            stack.extend(reversed(chosen_prod))
+
+        return False, f"<{toks[i][2]},{toks[i][3]}> Error sintactico: entrada no consumida"
+    finally:
+        if stats is not None:
+            stats["conflict_decisions"] = stats.get("conflict_decisions", 0) + spec.decisions
+            stats["conflict_alternatives"] = stats.get("conflict_alternatives", 0) + spec.alternatives
+            stats["conflict_memo"] = stats.get("conflict_memo", 0) + len(spec.memo)
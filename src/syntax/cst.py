@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+"""
+cst.py
+------
+Árbol de sintaxis concreta (CST) construido durante el parse LL(1).
+
+- Los nodos viven en una arena: arreglos paralelos (`array`) indexados por id
+  de nodo, sin un objeto por nodo:
+      sym[n]          id del símbolo (índice en cst.symbols)
+      prod[n]         id de la producción aplicada (production_list) o -1 en hojas
+      parent[n]       padre (-1 en la raíz)
+      first_child[n]  primer hijo (-1 si no tiene)
+      next_sibling[n] hermano siguiente (-1 si es el último)
+      token[n]        índice del token consumido (en cst.tokens) o -1
+- La raíz es el nodo 0. Una producción ε no crea hijos (prod[n] lo indica).
+- parse_ll1(..., tree=CST(G)) lo llena; sin `tree` el parse no cambia
+- Recorrido: children(n), preorder() (iterativo) y walk(enter, leave)
+- Serialización: JSON-lines (una cabecera + un nodo por línea) o binaria
+  (cabecera, tabla de cadenas con sus largos y los arreglos int32 tal cual,
+  little-endian; load_binary la lee de vuelta)
+"""
+import json
+import struct
+import sys
+from array import array
+from typing import Callable, Dict, Iterator, List, Sequence, Tuple
+
+from .grammar_io import EPS, production_ids, production_list
+
+Token = Tuple[str, str, int, int]  # (tipo, lexema, linea, col)
+
+MAGIC = b"LL1CST\x00\x01"
+_HEADER = struct.Struct("<8sIIII")  # magic, cadenas, producciones, nodos, tokens
+
+_NODE_ARRAYS = ("sym", "prod", "parent", "first_child", "next_sibling", "token")
+
+class CST:
+    __slots__ = ("symbols", "_sym_ids", "productions", "_prod_ids", "_expansions", "tokens") + _NODE_ARRAYS
+
+    def __init__(self, G: Dict[str, List[List[str]]] | None = None):
+        self.symbols: List[str] = []
+        self._sym_ids: Dict[str, int] = {}
+        self.productions: List[Tuple[str, Tuple[str, ...]]] = production_list(G) if G else []
+        # Clave como en la tabla LL(1): (A, "X Y Z")
+        self._prod_ids = production_ids(self.productions)
+        self._expansions: Dict[Tuple[str, str], tuple] = {}  # (A, prod) -> (id, símbolos, -1s)
+        self.tokens: List[Token] = []
+        for name in _NODE_ARRAYS:
+            setattr(self, name, array("i"))
+
+    def __len__(self) -> int:
+        return len(self.sym)
+
+    # --- construcción (la usa parse_ll1) ---
+
+    def _intern(self, s: str) -> int:
+        i = self._sym_ids.get(s)
+        if i is None:
+            i = self._sym_ids[s] = len(self.symbols)
+            self.symbols.append(s)
+        return i
+
+    def _new(self, s: str, parent: int, next_sibling: int) -> int:
+        n = len(self.sym)
+        self.sym.append(self._intern(s))
+        self.prod.append(-1)
+        self.parent.append(parent)
+        self.first_child.append(-1)
+        self.next_sibling.append(next_sibling)
+        self.token.append(-1)
+        return n
+
+    def add_root(self, start: str) -> int:
+        return self._new(start, -1, -1)
+
+    def expand(self, n: int, A: str, prod: str, rhs: List[str]) -> Sequence[int]:
+        """Aplica A -> rhs en el nodo n; retorna los ids de los hijos (izq. a der.)."""
+        key = (A, prod)
+        info = self._expansions.get(key)
+        if info is None:
+            ids = array("i", () if rhs == [EPS] else (self._intern(s) for s in rhs))
+            info = self._expansions[key] = (self._prod_ids.get(key, -1), ids, array("i", [-1]) * len(ids))
+        p, ids, neg = info
+        self.prod[n] = p
+        k = len(ids)
+        if not k:
+            return ()
+        # Los hijos son consecutivos: el hermano de cada uno es el id siguiente
+        first = len(self.sym)
+        self.sym.extend(ids)
+        self.prod.extend(neg)
+        self.parent.extend(array("i", [n]) * k)
+        self.first_child.extend(neg)
+        self.next_sibling.extend(range(first + 1, first + k))
+        self.next_sibling.append(-1)
+        self.token.extend(neg)
+        self.first_child[n] = first
+        return range(first, first + k)
+
+    def attach_token(self, n: int, tok: Token) -> None:
+        self.token[n] = len(self.tokens)
+        self.tokens.append(tok)
+
+    # --- consulta y recorrido ---
+
+    def symbol(self, n: int) -> str:
+        return self.symbols[self.sym[n]]
+
+    def production(self, n: int) -> Tuple[str, Tuple[str, ...]] | None:
+        p = self.prod[n]
+        return self.productions[p] if p >= 0 else None
+
+    def token_of(self, n: int) -> Token | None:
+        t = self.token[n]
+        return self.tokens[t] if t >= 0 else None
+
+    def children(self, n: int) -> Iterator[int]:
+        c = self.first_child[n]
+        nxt = self.next_sibling
+        while c != -1:
+            yield c
+            c = nxt[c]
+
+    def preorder(self, root: int = 0) -> Iterator[Tuple[int, int]]:
+        """(nodo, profundidad) en preorden, sin recursión."""
+        if not len(self.sym):
+            return
+        first, nxt = self.first_child, self.next_sibling
+        stack = [(root, 0)]
+        while stack:
+            n, d = stack.pop()
+            yield n, d
+            # apilar hijos en orden inverso
+            kids = []
+            c = first[n]
+            while c != -1:
+                kids.append(c)
+                c = nxt[c]
+            for c in reversed(kids):
+                stack.append((c, d + 1))
+
+    def walk(self, enter: Callable[[int], object], leave: Callable[[int], object] | None = None, root: int = 0) -> None:
+        """Llama enter(n) al entrar y leave(n) al salir de cada nodo. Si enter
+        retorna False no se visitan los hijos de n."""
+        if not len(self.sym):
+            return
+        first, nxt, par = self.first_child, self.next_sibling, self.parent
+        n = root
+        while True:
+            c = first[n] if enter(n) is not False else -1
+            if c != -1:
+                n = c
+                continue
+            # subir hasta encontrar un hermano
+            while True:
+                if leave is not None:
+                    leave(n)
+                if n == root:
+                    return
+                if nxt[n] != -1:
+                    n = nxt[n]
+                    break
+                n = par[n]
+
+    # --- serialización ---
+
+    def write_jsonl(self, f) -> None:
+        f.write(json.dumps({
+            "format": "ll1-cst", "version": 1, "nodes": len(self),
+            "symbols": self.symbols,
+            "productions": [[A, list(rhs)] for A, rhs in self.productions],
+        }, ensure_ascii=False) + "\n")
+        syms, prods, parent, token, tokens = self.symbols, self.prod, self.parent, self.token, self.tokens
+        for n in range(len(self)):
+            t = token[n]
+            f.write(json.dumps({
+                "id": n, "sym": syms[self.sym[n]], "prod": prods[n], "parent": parent[n],
+                "token": list(tokens[t]) if t >= 0 else None,
+            }, ensure_ascii=False) + "\n")
+
+    def write_binary(self, f) -> None:
+        strings: Dict[str, int] = {}
+        for s in self.symbols:
+            strings.setdefault(s, len(strings))
+        for A, rhs in self.productions:
+            for s in (A,) + rhs:
+                strings.setdefault(s, len(strings))
+        tok_type, tok_lex, tok_line, tok_col = array("i"), array("i"), array("i"), array("i")
+        for ttype, lex, line, col in self.tokens:
+            tok_type.append(strings.setdefault(ttype, len(strings)))
+            tok_lex.append(strings.setdefault(lex, len(strings)))
+            tok_line.append(line)
+            tok_col.append(col)
+        sym_map = array("i", (strings[s] for s in self.symbols))
+        sym = array("i", (sym_map[i] for i in self.sym))
+        prods = array("i")
+        for A, rhs in self.productions:
+            prods.append(len(rhs))
+            prods.extend(strings[s] for s in (A,) + rhs)
+
+        encoded = [s.encode("utf-8") for s in strings]
+        f.write(_HEADER.pack(MAGIC, len(strings), len(self.productions), len(self), len(self.tokens)))
+        lengths = array("i", (len(b) for b in encoded))
+        f.write(struct.pack("<I", len(lengths)))
+        _write_le(f, lengths)
+        f.write(b"".join(encoded))
+        for arr in (prods, sym, self.prod, self.parent, self.first_child, self.next_sibling, self.token,
+                    tok_type, tok_lex, tok_line, tok_col):
+            f.write(struct.pack("<I", len(arr)))
+            _write_le(f, arr)
+
+    def save(self, path: str, fmt: str = "jsonl") -> None:
+        if fmt == "bin":
+            with open(path, "wb") as f:
+                self.write_binary(f)
+        else:
+            with open(path, "w", encoding="utf-8") as f:
+                self.write_jsonl(f)
+
+def _write_le(f, arr: array) -> None:
+    if sys.byteorder == "big":
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    f.write(arr.tobytes())
+
+def _read_le(data: memoryview, pos: int) -> Tuple[array, int]:
+    (n,) = struct.unpack_from("<I", data, pos)
+    pos += 4
+    arr = array("i")
+    arr.frombytes(data[pos:pos + n * arr.itemsize])
+    if sys.byteorder == "big":
+        arr.byteswap()
+    return arr, pos + n * arr.itemsize
+
+def load_binary(data: bytes) -> CST:
+    """Reconstruye un CST escrito con write_binary."""
+    view = memoryview(data)
+    magic, _, nprod, _, _ = _HEADER.unpack_from(view, 0)
+    if magic != MAGIC:
+        raise ValueError("CST: formato binario no reconocido")
+    pos = _HEADER.size
+    lengths, pos = _read_le(view, pos)
+    strings: List[str] = []
+    for n in lengths:
+        strings.append(str(view[pos:pos + n], "utf-8"))
+        pos += n
+    arrays = []
+    for _ in range(11):
+        arr, pos = _read_le(view, pos)
+        arrays.append(arr)
+    prods, sym, prod, parent, first_child, next_sibling, token, tok_type, tok_lex, tok_line, tok_col = arrays
+
+    tree = CST()
+    k = 0
+    for _ in range(nprod):
+        m = prods[k]
+        tree.productions.append((strings[prods[k + 1]], tuple(strings[i] for i in prods[k + 2:k + 2 + m])))
+        k += 2 + m
+    tree._prod_ids = production_ids(tree.productions)
+    tree.sym = array("i", (tree._intern(strings[i]) for i in sym))
+    tree.prod, tree.parent, tree.first_child, tree.next_sibling, tree.token = prod, parent, first_child, next_sibling, token
+    tree.tokens = [(strings[t], strings[x], ln, c) for t, x, ln, c in zip(tok_type, tok_lex, tok_line, tok_col)]
+    return tree
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""
+deriv.py
+--------
+Traza de la derivación más a la izquierda que aplica el parser LL(1).
+
+- El parser llama deriv(A, prod) por cada producción aplicada (prod como en la
+  tabla LL(1): "X Y Z" o "ε"); sin `deriv` no hace nada extra
+- DerivationWriter guarda solo el id de la producción (production_list) en un
+  buffer de tamaño fijo y lo vuelca al destino cada `buffer` producciones:
+  memoria constante aunque la entrada sea enorme
+- Formato text: una línea "A -> α" por producción; el texto de cada producción
+  se arma una sola vez y se reutiliza al volcar
+- Formato bin: cabecera (MAGIC, cantidad de producciones, huella de la
+  gramática) seguida de los ids como uint32 little-endian; iter_ids/render lo
+  decodifican sin cargarlo entero:
+      python -m src.syntax.deriv grammars/python_subset.g traza.bin
+"""
+import hashlib
+import struct
+import sys
+from array import array
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Tuple
+
+from .grammar_io import load_grammar, production_ids, production_list
+
+MAGIC = b"LL1DRV\x00\x01"
+_HEADER = struct.Struct("<8sI16s")  # magic, producciones, huella
+DEFAULT_BUFFER = 1 << 14
+
+Productions = List[Tuple[str, Tuple[str, ...]]]
+
+def productions_digest(productions: Productions) -> bytes:
+    text = "\n".join(f"{A} -> {' '.join(rhs)}" for A, rhs in productions)
+    return hashlib.sha256(text.encode("utf-8")).digest()[:16]
+
+def production_lines(productions: Productions) -> List[str]:
+    return [f"{A} -> {' '.join(rhs)}\n" for A, rhs in productions]
+
+class DerivationWriter:
+    """Sumidero para parse_ll1(..., deriv=w). `out` es un archivo de texto
+    (fmt="text") o binario (fmt="bin"). Llamar close() (o usar `with`) al final."""
+
+    def __init__(self, G, out, fmt: str = "text", buffer: int = DEFAULT_BUFFER):
+        self.productions = production_list(G)
+        self._ids: Dict[Tuple[str, str], int] = production_ids(self.productions)
+        self.out = out
+        self.fmt = fmt
+        self.count = 0
+        self._buf = array("I")
+        self._limit = buffer
+        self._lines = production_lines(self.productions) if fmt == "text" else None
+        if fmt == "bin":
+            out.write(_HEADER.pack(MAGIC, len(self.productions), productions_digest(self.productions)))
+
+    def __call__(self, A: str, prod: str) -> None:
+        buf = self._buf
+        buf.append(self._ids[(A, prod)])
+        if len(buf) >= self._limit:
+            self.flush()
+
+    def flush(self) -> None:
+        buf = self._buf
+        if not buf:
+            return
+        self.count += len(buf)
+        if self._lines is not None:
+            lines = self._lines
+            self.out.write("".join([lines[i] for i in buf]))
+        else:
+            if sys.byteorder == "big":
+                buf.byteswap()
+            self.out.write(buf.tobytes())
+        del buf[:]
+        self.out.flush()
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> "DerivationWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+def iter_ids(f: BinaryIO, productions: Productions | None = None, chunk: int = DEFAULT_BUFFER) -> Iterator[int]:
+    """Ids de producción de una traza binaria, leída por bloques. Si se pasan
+    las producciones, verifica que la traza sea de esa gramática."""
+    head = f.read(_HEADER.size)
+    if len(head) < _HEADER.size:
+        raise ValueError("Traza de derivación: archivo truncado")
+    magic, nprod, digest = _HEADER.unpack(head)
+    if magic != MAGIC:
+        raise ValueError("Traza de derivación: formato no reconocido")
+    if productions is not None and (nprod != len(productions) or digest != productions_digest(productions)):
+        raise ValueError("Traza de derivación: no corresponde a esta gramática")
+    while True:
+        data = f.read(chunk * 4)
+        if not data:
+            return
+        ids = array("I")
+        ids.frombytes(data[:len(data) - len(data) % 4])
+        if sys.byteorder == "big":
+            ids.byteswap()
+        yield from ids
+
+def render(ids: Iterable[int], productions: Productions) -> Iterator[str]:
+    """Texto "A -> α" (con salto de línea) de cada id."""
+    lines = production_lines(productions)
+    for i in ids:
+        yield lines[i]
+
+def main(argv: List[str] | None = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 2:
+        print("uso: python -m src.syntax.deriv GRAMATICA TRAZA.bin")
+        return 1
+    _, G = load_grammar(argv[0])
+    productions = production_list(G)
+    with open(argv[1], "rb") as f:
+        try:
+            sys.stdout.writelines(render(iter_ids(f, productions), productions))
+        except ValueError as e:
+            print(str(e))
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,7 +6,9 @@ Cálculo de conjuntos FIRST y FOLLOW para una gramática.
 - FIRST(X): terminales que pueden iniciar derivaciones desde X (incluye ε si X =>* ε)
 - FOLLOW(A): terminales que pueden aparecer inmediatamente a la derecha de A en alguna derivación; $ en FOLLOW(S)
 
-Implementa las reglas estándar (Presentación 6).
+Implementa las reglas estándar (Presentación 6) con el cierre iterativo clásico
+y, para gramáticas grandes, un motor equivalente por grafo de dependencias
+(compute_first_sets_scc / compute_follow_sets_scc).
 """
 from typing import Dict, List, Set, Tuple
 from .grammar_io import EPS
@@ -15,7 +17,9 @@ def is_terminal(sym: str, G: Dict[str, List[List[str]]]) -> bool:
     """Un símbolo es terminal si NO es un no-terminal definido en la gramática."""
     return sym not in G
 
-def compute_first_sets(G: Dict[str, List[List[str]]]) -> Dict[str, Set[str]]:
+def compute_first_sets(G: Dict[str, List[List[str]]], stats: Dict[str, int] | None = None) -> Dict[str, Set[str]]:
+    """Con `stats` (dict) se anota en stats["first_iterations"] la cantidad de
+    pasadas del cierre iterativo (la última es la que ya no cambia nada)."""
     FIRST: Dict[str, Set[str]] = {}
 
     # Inicializar FIRST para terminals y non-terminals
@@ -27,9 +31,11 @@ def compute_first_sets(G: Dict[str, List[List[str]]]) -> Dict[str, Set[str]]:
                     FIRST.setdefault(a, set()).add(a)
 
     # Cierre iterativo
+    iterations = 0
     changed = True
     while changed:
         changed = False
+        iterations += 1
         for A, prods in G.items():
             for rhs in prods:
                 # FIRST(alpha) para alpha=rhs
@@ -50,6 +56,8 @@ def compute_first_sets(G: Dict[str, List[List[str]]]) -> Dict[str, Set[str]]:
                     if EPS not in FIRST[A]:
                         FIRST[A].add(EPS)
                         changed = True
+    if stats is not None:
+        stats["first_iterations"] = iterations
     return FIRST
 
 def first_of_sequence(seq: List[str], FIRST: Dict[str, Set[str]], G: Dict[str, List[List[str]]]) -> Set[str]:
@@ -69,13 +77,17 @@ def first_of_sequence(seq: List[str], FIRST: Dict[str, Set[str]], G: Dict[str, L
         out.add(EPS)
     return out
 
-def compute_follow_sets(start: str, G: Dict[str, List[List[str]]], FIRST: Dict[str, Set[str]]) -> Dict[str, Set[str]]:
+def compute_follow_sets(start: str, G: Dict[str, List[List[str]]], FIRST: Dict[str, Set[str]],
+                        stats: Dict[str, int] | None = None) -> Dict[str, Set[str]]:
+    """Con `stats` se anota stats["follow_iterations"] (pasadas del cierre)."""
     FOLLOW: Dict[str, Set[str]] = {A: set() for A in G}
     FOLLOW[start].add("$")  # $ en el inicial
 
+    iterations = 0
     changed = True
     while changed:
         changed = False
+        iterations += 1
         for A, prods in G.items():
             for rhs in prods:
                 # Recorremos B en A -> α B β
@@ -99,4 +111,169 @@ def compute_follow_sets(start: str, G: Dict[str, List[List[str]]], FIRST: Dict[s
                         if not FOLLOW[A].issubset(FOLLOW[B]):
                             FOLLOW[B] |= FOLLOW[A]
                             changed = True
+    if stats is not None:
+        stats["follow_iterations"] = iterations
     return FOLLOW
+
+# ---------------------------------------------------------------------------
+# Motor por grafo de dependencias (componentes fuertemente conexas)
+#
+# El cierre iterativo de arriba recorre todas las producciones hasta que nada
+# cambia. Aquí se arma una sola vez el grafo "X depende de Y" (FIRST(Y) ⊆
+# FIRST(X), o FOLLOW(Y) ⊆ FOLLOW(X)), se colapsan sus componentes fuertemente
+# conexas (Tarjan) y los conjuntos se propagan en orden topológico: cada
+# componente se resuelve una vez, después de todas sus dependencias.
+# Devuelve exactamente los mismos diccionarios que compute_first_sets /
+# compute_follow_sets.
+# ---------------------------------------------------------------------------
+
+def scc_order(nodes, edges: Dict[str, List[str]]) -> List[List[str]]:
+    """Tarjan iterativo. Devuelve las componentes de modo que cada una aparece
+    después de todas las componentes de las que depende (aristas de `edges`)."""
+    index: Dict[str, int] = {}
+    low: Dict[str, int] = {}
+    on_stack: Set[str] = set()
+    stack: List[str] = []
+    out: List[List[str]] = []
+    for root in nodes:
+        if root in index:
+            continue
+        index[root] = low[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(edges.get(root, ())))]
+        while work:
+            v, it = work[-1]
+            for w in it:
+                if w not in index:
+                    index[w] = low[w] = len(index)
+                    stack.append(w)
+                    on_stack.add(w)
+                    work.append((w, iter(edges.get(w, ()))))
+                    break
+                if w in on_stack and index[w] < low[v]:
+                    low[v] = index[w]
+            else:
+                work.pop()
+                if work:
+                    u = work[-1][0]
+                    if low[v] < low[u]:
+                        low[u] = low[v]
+                if low[v] == index[v]:
+                    comp: List[str] = []
+                    while True:
+                        w = stack.pop()
+                        on_stack.discard(w)
+                        comp.append(w)
+                        if w == v:
+                            break
+                    out.append(comp)
+    return out
+
+def compute_nullable(G: Dict[str, List[List[str]]]) -> Set[str]:
+    """No-terminales que derivan ε (lista de trabajo con contadores por producción)."""
+    nullable: Set[str] = set()
+    pending: List[int] = []      # por producción: símbolos aún no anulables
+    owner: List[str] = []
+    uses: Dict[str, List[int]] = {}
+    work: List[str] = []
+    for A, prods in G.items():
+        for rhs in prods:
+            k = len(owner)
+            owner.append(A)
+            count = 0
+            for a in rhs:
+                if a == EPS:
+                    continue
+                if a not in G:
+                    count = -1   # contiene un terminal: nunca anulable
+                    break
+                count += 1
+                uses.setdefault(a, []).append(k)
+            pending.append(count)
+            if count == 0 and A not in nullable:
+                nullable.add(A)
+                work.append(A)
+    while work:
+        B = work.pop()
+        for k in uses.get(B, ()):
+            if pending[k] > 0:
+                pending[k] -= 1
+                A = owner[k]
+                if pending[k] == 0 and A not in nullable:
+                    nullable.add(A)
+                    work.append(A)
+    return nullable
+
+def _propagate(order: List[List[str]], base: Dict[str, Set[str]], deps: Dict[str, List[str]]) -> Dict[str, Set[str]]:
+    """Resuelve X = base[X] ∪ ⋃ res[Y] (Y en deps[X]) componente por componente."""
+    res: Dict[str, Set[str]] = {}
+    for comp in order:
+        members = set(comp)
+        acc: Set[str] = set()
+        for X in comp:
+            acc |= base[X]
+            for Y in deps[X]:
+                if Y not in members:
+                    acc |= res[Y]
+        for X in comp:
+            res[X] = acc if len(comp) == 1 else set(acc)
+    return res
+
+def compute_first_sets_scc(G: Dict[str, List[List[str]]]) -> Dict[str, Set[str]]:
+    FIRST: Dict[str, Set[str]] = {}
+    # Mismo orden de claves que compute_first_sets
+    for A, prods in G.items():
+        FIRST.setdefault(A, set())
+        for rhs in prods:
+            for a in rhs:
+                if is_terminal(a, G):
+                    FIRST.setdefault(a, set()).add(a)
+
+    nullable = compute_nullable(G)
+    base: Dict[str, Set[str]] = {A: set() for A in G}
+    deps: Dict[str, List[str]] = {A: [] for A in G}
+    for A, prods in G.items():
+        for rhs in prods:
+            for a in rhs:
+                if a == EPS:
+                    continue
+                if a not in G:
+                    base[A].add(a)
+                    break
+                deps[A].append(a)
+                if a not in nullable:
+                    break
+
+    res = _propagate(scc_order(G, deps), base, deps)
+    for A in G:
+        FIRST[A] = res[A]
+        if A in nullable:
+            FIRST[A].add(EPS)
+    return FIRST
+
+def compute_follow_sets_scc(start: str, G: Dict[str, List[List[str]]], FIRST: Dict[str, Set[str]]) -> Dict[str, Set[str]]:
+    base: Dict[str, Set[str]] = {A: set() for A in G}
+    base[start].add("$")  # $ en el inicial
+    deps: Dict[str, List[str]] = {A: [] for A in G}
+    empty: Set[str] = set()
+    for A, prods in G.items():
+        for rhs in prods:
+            # FIRST de cada sufijo, de derecha a izquierda: una pasada por producción
+            tail: Set[str] = {EPS}
+            for i in range(len(rhs) - 1, -1, -1):
+                B = rhs[i]
+                if B in G:
+                    base[B] |= tail
+                    if EPS in tail:
+                        deps[B].append(A)
+                fb = FIRST.get(B, empty)
+                if EPS in fb:
+                    tail = (fb - {EPS}) | tail
+                else:
+                    tail = fb
+    for A in G:
+        base[A].discard(EPS)
+
+    res = _propagate(scc_order(G, deps), base, deps)
+    return {A: res[A] for A in G}
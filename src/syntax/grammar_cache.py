@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+"""
+grammar_cache.py
+----------------
+Gramática "compilada": FIRST, FOLLOW, PREDICT, Tabla LL(1) e índice por filas
+más metadatos, guardada en disco para no recalcular el análisis en cada
+ejecución.
+
+FIRST/FOLLOW/PREDICT se guardan como máscaras de bits sobre el alfabeto de
+terminales (bitsets.py); las propiedades FIRST, FOLLOW y PRED devuelven la
+vista de conjuntos de strings solo cuando alguien la pide (--show-sets,
+--recover). Cada vista se arma una vez por contenido de gramática (LRU por
+hash) y se comparte: es de solo lectura.
+
+- El artefacto se guarda en un directorio de caché (por defecto `.ll1cache/`
+  junto a la gramática) con nombre `<gramatica>.<hash>.pickle`.
+- La clave es un SHA-256 del contenido de la gramática, la versión de la
+  herramienta y el formato del artefacto: si cualquiera cambia, el artefacto
+  queda obsoleto y se reconstruye automáticamente.
+- Cualquier fallo al leer la caché se trata como "no hay caché".
+
+freeze_grammar devuelve la misma gramática con vistas de solo lectura
+(MappingProxyType y tuplas), para compartirla entre hilos sin que nadie pueda
+modificarla (analyzer.Analyzer guarda así las suyas). Una gramática congelada
+no se puede serializar con pickle.
+"""
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from types import MappingProxyType
+from typing import Callable, Dict, List, NamedTuple, Set, Tuple
+
+from .. import __version__
+from .grammar_io import parse_grammar_text
+from .bitsets import (
+    Alphabet, build_alphabet, first_bits, follow_bits, predict_bits,
+    build_ll1_table_bits, count_conflicts_bits, to_set,
+)
+from .table import build_row_index
+
+# Subir si cambia la forma de CompiledGrammar (invalida artefactos viejos).
+CACHE_FORMAT = 3
+CACHE_DIRNAME = ".ll1cache"
+
+class CompiledGrammar(NamedTuple):
+    start: str
+    G: Dict[str, List[List[str]]]
+    ALPHABET: Alphabet
+    FIRST_BITS: Dict[str, int]
+    FOLLOW_BITS: Dict[str, int]
+    PRED_BITS: Dict[Tuple[str, tuple], int]
+    TABLE: Dict[Tuple[str, str], List[str]]
+    ROWS: Dict[str, Dict[str, List[str]]]
+    meta: Dict[str, object]
+
+    @property
+    def FIRST(self) -> Dict[str, Set[str]]:
+        """Vista de strings, con las mismas claves que compute_first_sets."""
+        return _view(self, "FIRST", self._first_view)
+
+    @property
+    def FOLLOW(self) -> Dict[str, Set[str]]:
+        return _view(self, "FOLLOW", lambda: {A: to_set(m, self.ALPHABET) for A, m in self.FOLLOW_BITS.items()})
+
+    @property
+    def PRED(self) -> Dict[Tuple[str, tuple], Set[str]]:
+        return _view(self, "PRED", lambda: {k: to_set(m, self.ALPHABET) for k, m in self.PRED_BITS.items()})
+
+    def _first_view(self) -> Dict[str, Set[str]]:
+        out: Dict[str, Set[str]] = {}
+        for A, prods in self.G.items():
+            out.setdefault(A, to_set(self.FIRST_BITS[A], self.ALPHABET))
+            for rhs in prods:
+                for a in rhs:
+                    if a not in self.G:
+                        out.setdefault(a, {a})
+        return out
+
+# Vistas de strings ya armadas: (hash de la gramática, nombre) -> vista
+_VIEWS: "OrderedDict[Tuple[str, str], dict]" = OrderedDict()
+_VIEWS_MAX = 3 * 16
+_views_lock = threading.Lock()
+
+def _view(cg: CompiledGrammar, name: str, build: Callable[[], dict]) -> dict:
+    digest = cg.meta.get("digest")
+    if digest is None:
+        return build()
+    key = (digest, name)
+    with _views_lock:
+        view = _VIEWS.get(key)
+        if view is not None:
+            _VIEWS.move_to_end(key)
+            return view
+    view = build()
+    with _views_lock:
+        view = _VIEWS.setdefault(key, view)
+        _VIEWS.move_to_end(key)
+        while len(_VIEWS) > _VIEWS_MAX:
+            _VIEWS.popitem(last=False)
+    return view
+
+def grammar_digest(text: str) -> str:
+    """Hash de contenido de la gramática + versión de la herramienta."""
+    h = hashlib.sha256()
+    h.update(f"ll1/{__version__}/{CACHE_FORMAT}\n".encode("utf-8"))
+    h.update(text.encode("utf-8"))
+    return h.hexdigest()
+
+def compile_grammar(text: str, source: str = "<texto>", stats: Dict[str, int] | None = None) -> CompiledGrammar:
+    """Carga la gramática desde su texto y calcula todo el análisis LL(1).
+    Con `stats` (dict) se anotan los contadores de FIRST/FOLLOW (bitsets.py)."""
+    start, G = parse_grammar_text(text)
+    alphabet = build_alphabet(G)
+    ids = {a: i for i, a in enumerate(alphabet)}
+    FIRST = first_bits(G, ids, stats)
+    FOLLOW = follow_bits(start, G, FIRST, stats)
+    PRED = predict_bits(G, FIRST, FOLLOW)
+    TABLE = build_ll1_table_bits(PRED, alphabet)
+    ROWS = build_row_index(TABLE)
+    meta = {
+        "source": source,
+        "digest": grammar_digest(text),
+        "version": __version__,
+        "format": CACHE_FORMAT,
+        "conflicts": count_conflicts_bits(PRED),
+    }
+    return CompiledGrammar(start, G, alphabet, FIRST, FOLLOW, PRED, TABLE, ROWS, meta)
+
+def freeze_grammar(cg: CompiledGrammar) -> CompiledGrammar:
+    """Copia de `cg` con diccionarios de solo lectura y tuplas en lugar de listas."""
+    return CompiledGrammar(
+        cg.start,
+        MappingProxyType({A: tuple(tuple(rhs) for rhs in prods) for A, prods in cg.G.items()}),
+        tuple(cg.ALPHABET),
+        MappingProxyType(dict(cg.FIRST_BITS)),
+        MappingProxyType(dict(cg.FOLLOW_BITS)),
+        MappingProxyType(dict(cg.PRED_BITS)),
+        MappingProxyType({k: tuple(v) for k, v in cg.TABLE.items()}),
+        MappingProxyType({A: MappingProxyType({a: tuple(v) for a, v in row.items()}) for A, row in cg.ROWS.items()}),
+        MappingProxyType(dict(cg.meta)),
+    )
+
+def cache_path_for(grammar_path: str, digest: str, cache_dir: str | None = None) -> Path:
+    gp = Path(grammar_path)
+    base = Path(cache_dir) if cache_dir else gp.parent / CACHE_DIRNAME
+    return base / f"{gp.stem}.{digest[:16]}.pickle"
+
+def _read_cached(path: Path, digest: str) -> CompiledGrammar | None:
+    try:
+        with open(path, "rb") as f:
+            data = pickle.load(f)
+        cg = CompiledGrammar(**data)
+    except (OSError, pickle.UnpicklingError, EOFError, TypeError, AttributeError, ValueError):
+        return None
+    # El nombre solo usa un prefijo del hash: confirmamos la clave completa.
+    if cg.meta.get("digest") != digest:
+        return None
+    return cg
+
+def _write_cached(path: Path, cg: CompiledGrammar) -> None:
+    """Escritura atómica (tmp + replace) para que procesos concurrentes nunca
+    lean un artefacto a medio escribir. Si no se puede escribir, se ignora."""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(cg._asdict(), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    except OSError:
+        pass
+
+def load_compiled_grammar(
+    grammar_path: str,
+    cache_dir: str | None = None,
+    use_cache: bool = True,
+    stats: Dict[str, int] | None = None,
+) -> CompiledGrammar:
+    """Devuelve la gramática compilada, reutilizando el artefacto en caché si
+    sigue siendo válido y reconstruyéndolo (y guardándolo) si no.
+    Con `stats` se anota stats["grammar_from_cache"] y, si se compila, los
+    contadores de compile_grammar."""
+    with open(grammar_path, "r", encoding="utf-8") as f:
+        text = f.read()
+    return compile_grammar_cached(text, grammar_path, cache_dir, use_cache, stats)
+
+def compile_grammar_cached(
+    text: str,
+    grammar_path: str,
+    cache_dir: str | None = None,
+    use_cache: bool = True,
+    stats: Dict[str, int] | None = None,
+) -> CompiledGrammar:
+    """Como load_compiled_grammar, con el texto de la gramática ya leído."""
+    if not use_cache:
+        if stats is not None:
+            stats["grammar_from_cache"] = False
+        return compile_grammar(text, source=str(grammar_path), stats=stats)
+
+    digest = grammar_digest(text)
+    path = cache_path_for(grammar_path, digest, cache_dir)
+    cg = _read_cached(path, digest)
+    if stats is not None:
+        stats["grammar_from_cache"] = cg is not None
+    if cg is not None:
+        return cg
+    cg = compile_grammar(text, source=str(grammar_path), stats=stats)
+    _write_cached(path, cg)
+    return cg
@@ -21,37 +21,53 @@ from typing import Dict, List, Tuple
 EPS = "ε"
 
 def load_grammar(path: str) -> Tuple[str, Dict[str, List[List[str]]]]:
+    with open(path, "r", encoding="utf-8") as f:
+        return parse_grammar_text(f.read())
+
+def parse_grammar_text(text: str) -> Tuple[str, Dict[str, List[List[str]]]]:
+    """Igual que load_grammar, pero a partir del contenido ya leído."""
     G: Dict[str, List[List[str]]] = {}
     start: str | None = None
 
-    with open(path, "r", encoding="utf-8") as f:
-        for raw in f:
-            line = raw.strip()
-            if not line or line.startswith("#"):
-                continue
-
-            # Normalizar separador: aceptar ->, →, ::=
-            if "->" not in line and "→" in line:
-                line = line.replace("→", "->")
-            if "->" not in line and "::=" in line:
-                line = line.replace("::=", "->")
-
-            if "->" not in line:
-                raise ValueError(f"Gramática: línea inválida (falta '->'): {line}")
-
-            lhs, rhs = [x.strip() for x in line.split("->", 1)]
-            if start is None:
-                start = lhs
-            alts = [alt.strip() for alt in rhs.split("|")]
-            prods: List[List[str]] = []
-            for alt in alts:
-                if alt == EPS:
-                    prods.append([EPS])
-                else:
-                    prods.append(alt.split())
-            G.setdefault(lhs, []).extend(prods)
+    for raw in text.splitlines():
+        line = raw.strip()
+        if not line or line.startswith("#"):
+            continue
+
+        # Normalizar separador: aceptar ->, →, ::=
+        if "->" not in line and "→" in line:
+            line = line.replace("→", "->")
+        if "->" not in line and "::=" in line:
+            line = line.replace("::=", "->")
+
+        if "->" not in line:
+            raise ValueError(f"Gramática: línea inválida (falta '->'): {line}")
+
+        lhs, rhs = [x.strip() for x in line.split("->", 1)]
+        if start is None:
+            start = lhs
+        alts = [alt.strip() for alt in rhs.split("|")]
+        prods: List[List[str]] = []
+        for alt in alts:
+            if alt == EPS:
+                prods.append([EPS])
+            else:
+                prods.append(alt.split())
+        G.setdefault(lhs, []).extend(prods)
 
     if start is None or not G:
         raise ValueError("Gramática vacía o sin producciones válidas.")
     return start, G
 
+def production_list(G: Dict[str, List[List[str]]]) -> List[Tuple[str, Tuple[str, ...]]]:
+    """Producciones (A, rhs) en el orden de la gramática; el índice en esta
+    lista es el id estable de cada producción (CST, trazas de derivación)."""
+    return [(A, tuple(rhs)) for A, prods in G.items() for rhs in prods]
+
+def production_ids(productions: List[Tuple[str, Tuple[str, ...]]]) -> Dict[Tuple[str, str], int]:
+    """(A, "X Y Z") -> id, con la clave de la tabla LL(1). Una producción
+    repetida se queda con su primer id (el que usa la tabla)."""
+    ids: Dict[Tuple[str, str], int] = {}
+    for i, (A, rhs) in enumerate(productions):
+        ids.setdefault((A, " ".join(rhs)), i)
+    return ids
@@ -8,7 +8,9 @@ Entrada:
 - start: símbolo inicial
 - G: gramática
 - table: tabla LL(1)  (M[A,a] -> producción como texto "X Y Z" o "ε")
-- tokens: lista de tuplas (ttype, lex, line, col) producidas por el lexer
+- tokens: tuplas (ttype, lex, line, col) producidas por el lexer; puede ser una
+  lista o cualquier iterable (p.ej. el generador de lexer/stream.py): los tokens
+  se piden de a uno, a medida que el parser los consume
 
 Adaptación de tokens -> terminales de la gramática:
 - Si el terminal del grammar es un literal como '+','*','(',')', se compara con el lexema del token.
@@ -17,14 +19,30 @@ Adaptación de tokens -> terminales de la gramática:
 - Si el terminal coincide con una palabra reservada (p.ej. 'print'), el lexer entrega tipo == 'print'.
 - Para otras coincidencias, probamos por tipo y por lexema de forma directa.
 
+Selección de producción: la fila de X (índice por no-terminal de table.py) se
+consulta primero por el lexema y, si no hay columna, por las columnas que el
+tipo del token puede satisfacer (type_columns). Son a lo sumo tres búsquedas en
+un dict, sin recorrer la tabla.
+
 Salida:
 - True si acepta; sino, False y un mensaje de error formateado.
+- Opcionalmente (deriv=deriv.DerivationWriter(...)) la traza de derivación:
+  se llama deriv(A, prod) por cada producción aplicada.
+- Opcionalmente (tree=cst.CST(G)) el árbol de sintaxis concreta, armado en el
+  mismo recorrido: una pila de nodos paralela a la de símbolos.
 """
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, List, Tuple
 from .grammar_io import EPS
+from .table import build_row_index
 
 Token = Tuple[str, str, int, int]  # (tipo, lexema, linea, col)
 
+# Terminales que solo se comparan contra el lexema literal del archivo
+SYMBOL_TERMS = frozenset({"+", "-", "*", "/", "(", ")", "[", "]", "{", "}", ",", ".", ":", ";", "==", "!=", "<=", ">=", "<", ">", "="})
+
+# Nombres lógicos de terminal por tipo de token
+TYPE_ALIASES = {"identificador": "id", "tk_entero": "NUM"}
+
 def token_to_symbol(term: str, tok: Token) -> bool:
     """Regla de equivalencia terminal-del-grammar vs token del lexer."""
     ttype, lex, *_ = tok
@@ -36,7 +54,7 @@ def token_to_symbol(term: str, tok: Token) -> bool:
         return True
 
     # Símbolos de 1 o 2 chars: comparamos con el lexema literal del archivo
-    if term in {"+", "-", "*", "/", "(", ")", "[", "]", "{", "}", ",", ".", ":", ";", "==", "!=", "<=", ">=", "<", ">", "="}:
+    if term in SYMBOL_TERMS:
         return lex == term
 
     # Palabras reservadas: el tipo del token es el propio lexema (p.ej. 'print', 'if', 'def')
@@ -53,8 +71,43 @@ def token_to_symbol(term: str, tok: Token) -> bool:
 
     return False
 
-def format_expected_from_row(table, A: str) -> List[str]:
+_TYPE_COLUMNS: Dict[str, Tuple[str, ...]] = {}
+
+def type_columns(ttype: str) -> Tuple[str, ...]:
+    """Columnas (terminales) que un token de tipo `ttype` satisface solo por su
+    tipo, según token_to_symbol. El lexema aporta además la columna == lexema.
+    Se calcula una vez por tipo."""
+    cols = _TYPE_COLUMNS.get(ttype)
+    if cols is None:
+        cols = ()
+        if ttype in TYPE_ALIASES:
+            cols += (TYPE_ALIASES[ttype],)
+        if ttype not in SYMBOL_TERMS:
+            cols += (ttype,)
+        _TYPE_COLUMNS[ttype] = cols
+    return cols
+
+def select_production(row: Dict[str, List[str]] | None, ttype: str, lex: str) -> List[str] | None:
+    """Producciones de la celda de `row` que corresponde al token (ttype, lex):
+    primero la columna exacta del lexema y luego las del tipo, respetando el
+    orden de la tabla si el tipo satisface más de una."""
+    if not row:
+        return None
+    prods = row.get(lex)
+    if prods is not None:
+        return prods
+    hits = [c for c in type_columns(ttype) if c in row]
+    if not hits:
+        return None
+    if len(hits) > 1:
+        order = list(row)
+        hits.sort(key=order.index)
+    return row[hits[0]]
+
+def format_expected_from_row(table, A: str, rows: Dict[str, Dict[str, List[str]]] | None = None) -> List[str]:
     """Devuelve los terminales válidos (columnas) para el no-terminal A (útil en mensajes de error)."""
+    if rows is not None:
+        return sorted(rows.get(A, ()))
     cols = []
     for (nt, a), _ in table.items():
         if nt == A:
@@ -62,19 +115,30 @@ def format_expected_from_row(table, A: str) -> List[str]:
     # ordenar para mensaje estable
     return sorted(set(cols))
 
-def parse_ll1(start: str, G, table, tokens: List[Token], show_derivations: bool = False) -> Tuple[bool, str]:
-    """Parser predictivo con pila. Retorna (ok, mensaje)."""
+def parse_ll1(start: str, G, table, tokens: Iterable[Token], deriv=None, rows=None, tree=None) -> Tuple[bool, str]:
+    """Parser predictivo con pila. Retorna (ok, mensaje).
+    `rows` es el índice por filas de la tabla (build_row_index); si no se pasa, se construye aquí.
+    Si `tokens` es un generador que lanza ValueError (error léxico), el error se propaga.
+    Con `deriv` se le pasa cada producción aplicada (A, "X Y Z").
+    Con `tree` (cst.CST vacío) se construye el árbol de sintaxis concreta; si hay
+    error queda el árbol parcial hasta ese punto."""
+    if rows is None:
+        rows = build_row_index(table)
     # Pila inicial: S, $
     stack: List[str] = ["$", start]
-    # flujo de entrada: tokens normal + $ marcador
-    input_tokens = list(tokens) + [("EOF", "$", tokens[-1][2] if tokens else 1, tokens[-1][3] if tokens else 1)]
-
-    i = 0
-    deriv_steps: List[str] = []
+    # Pila de nodos del CST, paralela a `stack` (solo si se pide el árbol)
+    nodes: List[int] = [-1, tree.add_root(start)] if tree is not None else []
+    # flujo de entrada: tokens a demanda; al agotarse, marcador $ en la posición del último token
+    it = iter(tokens)
+    tok = next(it, None)
+    if tok is None:
+        tok = ("EOF", "$", 1, 1)
 
     while stack:
         X = stack.pop()
-        ttype, lex, line, col = input_tokens[i]
+        if tree is not None:
+            node = nodes.pop()
+        ttype, lex, line, col = tok
 
         if X == "$":
             if lex == "$":
@@ -84,40 +148,32 @@ def parse_ll1(start: str, G, table, tokens: List[Token], show_derivations: bool
 
         # X es terminal
         if X not in G and X != EPS:
-            if token_to_symbol(X, input_tokens[i]):
-                i += 1  # consumir
+            if token_to_symbol(X, tok):
+                # consumir
+                if tree is not None:
+                    tree.attach_token(node, tok)
+                tok = next(it, None) or ("EOF", "$", line, col)
                 continue
             else:
                 return False, f"<{line},{col}> Error sintactico: se encontro: \"{lex}\"; se esperaba: \"{X}\""
 
-        # X es no-terminal
-        a = lex  # símbolo “visible” (usamos lex como columna; token_to_symbol hará el mapeo)
-        # buscamos alguna columna “a” que sea compatible con el token actual:
-        # Recorremos todas las columnas de X y probamos si alguna coincide con el token actual
-        chosen_prod: List[str] | None = None
-
-        # Caso rápido: si existe una columna exactamente con 'lex'
-        if (X, a) in table:
-            # Puede haber varias por conflictos; elegimos la primera
-            chosen_prod = table[(X, a)][0].split()
-        else:
-            # Plan B: probar todas las columnas válidas de X y usar token_to_symbol
-            for (nt, colterm), prods in table.items():
-                if nt != X:
-                    continue
-                if token_to_symbol(colterm, input_tokens[i]):
-                    chosen_prod = prods[0].split()
-                    break
+        # X es no-terminal: columna por lexema o por tipo del token (índice por filas)
+        prods = select_production(rows.get(X), ttype, lex)
+        # Puede haber varias por conflictos; elegimos la primera
+        chosen_prod: List[str] | None = prods[0].split() if prods else None
 
         if chosen_prod is None:
             # Sin entrada en la tabla LL(1) -> error con esperado
-            esperados = format_expected_from_row(table, X)
+            esperados = format_expected_from_row(table, X, rows)
             esperados_str = "\", \"".join(esperados) if esperados else "—"
             return False, f"<{line},{col}> Error sintactico: se encontro: \"{lex}\"; se esperaba: \"{esperados_str}\""
 
         # Aplicar producción
-        if show_derivations:
-            deriv_steps.append(f"{X} -> {' '.join(chosen_prod)}")
+        if deriv is not None:
+            deriv(X, prods[0])
+
+        if tree is not None:
+            nodes.extend(reversed(tree.expand(node, X, prods[0], chosen_prod)))
 
         if chosen_prod == [EPS]:
             # no apila nada
@@ -128,5 +184,4 @@ def parse_ll1(start: str, G, table, tokens: List[Token], show_derivations: bool
             stack.append(sym)
 
     # Si salimos sin devolver ok: error genérico
-    last = input_tokens[i] if i < len(input_tokens) else ("EOF", "$", 1, 1)
-    return False, f"<{last[2]},{last[3]}> Error sintactico: entrada no consumida"
+    return False, f"<{tok[2]},{tok[3]}> Error sintactico: entrada no consumida"
@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+"""
+program.py
+----------
+Programa de parse: la tabla LL(1) llevada a enteros para recorrerla en el
+proceso sin escribir ni importar un módulo. codegen.py copia ParseProgram y el
+bucle de _parse_iter (con sus auxiliares) en el parser que genera, así que lo
+que usan debe estar definido también en esa plantilla.
+
+- Símbolos enteros: no-terminales 0..N-1, terminales N.., fondo de pila -1;
+  "es terminal" es `X >= N` y el fondo es `X == -1` (sin buscar en G ni
+  comparar con ε)
+- Cada producción es una tupla de ids ya invertida y sin ε: una expansión es
+  un solo stack.extend, sin split ni tuplas (X, a) por paso
+- Cada fila es un dict id-de-terminal -> id-de-producción (la primera de la
+  celda, como parse_ll1); el token se clasifica una vez al leerlo (id de su
+  lexema y columnas de su tipo)
+- Los tokens se recorren sin copiarlos: una lista tal cual, un generador a
+  demanda y un TokenStore directamente sobre sus arreglos (sin armar tuplas:
+  línea/columna solo para el mensaje de error)
+
+parse_program(prog, tokens, deriv) da los mismos (ok, mensaje) que
+parse_ll1(start, G, table, tokens, deriv=deriv, rows=rows); para el CST se
+sigue usando parse_ll1. Un ParseProgram no se modifica una vez armado.
+"""
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, NamedTuple, Tuple
+
+from ..lexer.token_defs import TOKENS
+from ..lexer.token_store import TYPE_NAMES, TokenStore
+from .bitsets import build_alphabet
+from .grammar_io import EPS, production_ids, production_list
+from .parser_ll1 import SYMBOL_TERMS, TYPE_ALIASES
+
+Token = Tuple[str, str, int, int]  # (tipo, lexema, linea, col)
+
+END = -1
+# Id de lexema que no es terminal de la gramática
+NO_TERM = -2
+
+OK_MESSAGE = "El analisis sintactico ha finalizado exitosamente."
+
+class ParseProgram(NamedTuple):
+    start_id: int
+    nt_count: int
+    names: Tuple[str, ...]  # id -> símbolo
+    term_ids: Dict[str, int]  # terminal -> id
+    productions: Tuple[Tuple[str, Tuple[str, ...]], ...]  # id -> (A, rhs)
+    prod_strs: Tuple[str, ...]  # id -> rhs como en la tabla ("X Y Z" o "ε"), para deriv
+    rhs_rev: Tuple[Tuple[int, ...], ...]  # id -> rhs invertido, sin ε
+    rows: Tuple[Dict[int, int], ...]  # no-terminal -> {terminal: producción}
+    row_pos: Tuple[Dict[int, int], ...]  # no-terminal -> {terminal: orden en la fila}
+    expected: Tuple[str, ...]  # no-terminal -> texto "se esperaba"
+
+def build_program(start: str, G, rows: Dict[str, Dict[str, List[str]]]) -> ParseProgram:
+    """Programa de parse para la gramática `G` y su índice por filas."""
+    nonterminals = list(G)
+    terminals = [a for a in build_alphabet(G) if a != EPS]
+    for row in rows.values():
+        terminals.extend(a for a in row if a not in terminals and a not in G)
+    names = nonterminals + terminals
+    ids: Dict[str, int] = {s: i for i, s in enumerate(names)}
+
+    productions = production_list(G)
+    prod_ids = production_ids(productions)
+
+    prog_rows: List[Dict[int, int]] = []
+    row_pos: List[Dict[int, int]] = []
+    expected: List[str] = []
+    for A in nonterminals:
+        row = rows.get(A, {})
+        prog_rows.append({ids[a]: prod_ids[(A, prods[0])] for a, prods in row.items()})
+        row_pos.append({ids[a]: k for k, a in enumerate(row)})
+        cols = sorted(row)
+        expected.append("\", \"".join(cols) if cols else "—")
+
+    return ParseProgram(
+        start_id=ids[start],
+        nt_count=len(nonterminals),
+        names=tuple(names),
+        term_ids={a: ids[a] for a in terminals},
+        productions=tuple(productions),
+        prod_strs=tuple(" ".join(rhs) for _, rhs in productions),
+        rhs_rev=tuple(tuple(ids[s] for s in reversed(rhs) if s != EPS) for _, rhs in productions),
+        rows=tuple(prog_rows),
+        row_pos=tuple(row_pos),
+        expected=tuple(expected),
+    )
+
+_PROGRAMS: "OrderedDict[str, ParseProgram]" = OrderedDict()
+_PROGRAMS_MAX = 64
+_lock = threading.Lock()
+
+def program_for(cg) -> ParseProgram:
+    """Programa de una gramática compilada, armado una vez por contenido."""
+    key = cg.meta["digest"]
+    with _lock:
+        prog = _PROGRAMS.get(key)
+        if prog is not None:
+            _PROGRAMS.move_to_end(key)
+            return prog
+    prog = build_program(cg.start, cg.G, cg.ROWS)
+    with _lock:
+        _PROGRAMS[key] = prog
+        while len(_PROGRAMS) > _PROGRAMS_MAX:
+            _PROGRAMS.popitem(last=False)
+    return prog
+
+def _type_cols(prog: ParseProgram, ttype: str) -> Tuple[int, ...]:
+    """Ids de los terminales que un token de tipo `ttype` satisface por su tipo
+    (lo mismo que parser_ll1.type_columns, en ids)."""
+    names = []
+    if ttype in TYPE_ALIASES:
+        names.append(TYPE_ALIASES[ttype])
+    if ttype not in SYMBOL_TERMS:
+        names.append(ttype)
+    return tuple(prog.term_ids[n] for n in names if n in prog.term_ids)
+
+def _by_type(prog: ParseProgram, X: int, tc: Tuple[int, ...]) -> int | None:
+    row = prog.rows[X]
+    hits = [c for c in tc if c in row]
+    if not hits:
+        return None
+    if len(hits) > 1:
+        hits.sort(key=prog.row_pos[X].__getitem__)
+    return row[hits[0]]
+
+class _TypeClasses:
+    """Tipos de token vistos en un parse, numerados a medida que aparecen:
+    columnas de cada tipo (tcs[k]) y, por no-terminal, la producción que toca
+    cuando solo decide el tipo (by_type[X][k]). Así la celda de un token que
+    no es terminal por su lexema (identificadores, enteros) sale de una lista."""
+
+    def __init__(self, prog: ParseProgram):
+        self.prog = prog
+        self.ids: Dict[str, int] = {}
+        self.tcs: List[Tuple[int, ...]] = []
+        self.by_type: List[List[int | None]] = [[] for _ in range(prog.nt_count)]
+
+    def add(self, ttype: str) -> int:
+        k = self.ids.get(ttype)
+        if k is None:
+            k = self.ids[ttype] = len(self.tcs)
+            tc = _type_cols(self.prog, ttype)
+            self.tcs.append(tc)
+            for X, row in enumerate(self.by_type):
+                row.append(_by_type(self.prog, X, tc))
+        return k
+
+def _error(prog: ParseProgram, X: int, lex: str, line: int, col: int) -> str:
+    if X == END:
+        return f"<{line},{col}> Error sintactico: se encontro: \"{lex}\"; se esperaba fin de entrada"
+    what = prog.names[X] if X >= prog.nt_count else prog.expected[X]
+    return f"<{line},{col}> Error sintactico: se encontro: \"{lex}\"; se esperaba: \"{what}\""
+
+def parse_program(prog: ParseProgram, tokens: Iterable[Token], deriv=None) -> Tuple[bool, str]:
+    """Parser predictivo sobre el programa. Retorna (ok, mensaje), igual que
+    parse_ll1; con `deriv` se le pasa cada producción aplicada (A, "X Y Z")."""
+    if isinstance(tokens, TokenStore):
+        return _parse_store(prog, tokens, deriv)
+    return _parse_iter(prog, tokens, deriv)
+
+def _parse_iter(prog: ParseProgram, tokens: Iterable[Token], deriv) -> Tuple[bool, str]:
+    rows, rhs_rev, term_ids, nt_count = prog.rows, prog.rhs_rev, prog.term_ids.get, prog.nt_count
+    prod_strs, names = prog.prod_strs, prog.names
+    classes = _TypeClasses(prog)
+    type_ids, tcs, by_type, add_type = classes.ids, classes.tcs, classes.by_type, classes.add
+    stack = [END, prog.start_id]
+    pop, extend = stack.pop, stack.extend
+    # Una lista se recorre tal cual (sin copiarla); un generador, a demanda
+    it = iter(tokens)
+    tok = next(it, None) or ("EOF", "$", 1, 1)
+    lex = tok[1]
+    lt = term_ids(lex, NO_TERM)
+    k = add_type(tok[0])
+    tc = tcs[k]
+
+    while True:
+        X = pop()
+        if X >= nt_count:
+            if X == lt or X in tc:
+                tok = next(it, None) or ("EOF", "$", tok[2], tok[3])
+                lex = tok[1]
+                lt = term_ids(lex, NO_TERM)
+                k = type_ids.get(tok[0])
+                if k is None:
+                    k = add_type(tok[0])
+                tc = tcs[k]
+                continue
+            return False, _error(prog, X, lex, tok[2], tok[3])
+        if X == END:
+            if lex == "$":
+                return True, OK_MESSAGE
+            return False, _error(prog, X, lex, tok[2], tok[3])
+        p = rows[X].get(lt)
+        if p is None:
+            p = by_type[X][k]
+            if p is None:
+                return False, _error(prog, X, lex, tok[2], tok[3])
+        if deriv is not None:
+            deriv(names[X], prod_strs[p])
+        extend(rhs_rev[p])
+
+# Lexema fijo de cada tipo del almacén compacto (reservadas y símbolos);
+# None para identificador/entero/cadena, que se recortan de la fuente
+_FIXED_LEXEMES = tuple(
+    {name: lex for lex, name in TOKENS.items()}.get(name, name)
+    if name not in ("identificador", "tk_entero", "tk_cadena") else None
+    for name in TYPE_NAMES
+)
+
+def _parse_store(prog: ParseProgram, store: TokenStore, deriv) -> Tuple[bool, str]:
+    rows, rhs_rev, term_ids, nt_count = prog.rows, prog.rhs_rev, prog.term_ids.get, prog.nt_count
+    prod_strs, names = prog.prod_strs, prog.names
+    src, types, starts, ends = store.src, store.types, store.starts, store.ends
+    # La clase de tipo k es el id de tipo del almacén; EOF va al final
+    classes = _TypeClasses(prog)
+    for name in TYPE_NAMES + ("EOF",):
+        classes.add(name)
+    tcs, by_type = classes.tcs, classes.by_type
+    eof = len(TYPE_NAMES)
+    fixed_lt = [NO_TERM if lex is None else term_ids(lex, NO_TERM) for lex in _FIXED_LEXEMES]
+    sliced = [lex is None for lex in _FIXED_LEXEMES]
+    stack = [END, prog.start_id]
+    pop, extend = stack.pop, stack.extend
+    n = len(types)
+
+    def fail(X: int, i: int) -> Tuple[bool, str]:
+        if i < n:
+            line, col = store.position(i)
+            return False, _error(prog, X, store.lexeme(i), line, col)
+        line, col = store.position(n - 1) if n else (1, 1)
+        return False, _error(prog, X, "$", line, col)
+
+    i = 0
+    if n:
+        k = types[0]
+        lt = term_ids(src[starts[0]:ends[0]], NO_TERM) if sliced[k] else fixed_lt[k]
+    else:
+        k, lt = eof, term_ids("$", NO_TERM)
+    tc = tcs[k]
+    while True:
+        X = pop()
+        if X >= nt_count:
+            if X == lt or X in tc:
+                i += 1
+                if i < n:
+                    k = types[i]
+                    lt = term_ids(src[starts[i]:ends[i]], NO_TERM) if sliced[k] else fixed_lt[k]
+                else:
+                    k, lt = eof, term_ids("$", NO_TERM)
+                tc = tcs[k]
+                continue
+            return fail(X, i)
+        if X == END:
+            if i >= n:
+                return True, OK_MESSAGE
+            return fail(X, i)
+        p = rows[X].get(lt)
+        if p is None:
+            p = by_type[X][k]
+            if p is None:
+                return fail(X, i)
+        if deriv is not None:
+            deriv(names[X], prod_strs[p])
+        extend(rhs_rev[p])
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""
+recovery.py
+-----------
+Parser LL(1) con recuperación de errores en modo pánico: reporta todos los
+errores sintácticos de la entrada en una sola pasada.
+
+Mismo recorrido que parse_ll1 (mismas reglas de selección y mismos mensajes
+"<l,c> Error sintactico: ..."); al encontrar un error, en lugar de terminar:
+
+- Terminal X en la pila que no coincide: se reporta y se saca X de la pila
+  (como si se hubiera insertado)
+- No-terminal A sin celda para el token: se reporta y se descartan tokens hasta
+  uno de sincronización de A:
+    · una columna de la fila de A (FIRST / PREDICT): se retoma A
+    · un terminal de FOLLOW(A) (o $): se saca A de la pila
+- $ en la pila con entrada sobrante: se reporta y se retoma el símbolo inicial
+  en el próximo token que pueda comenzarlo (los demás se descartan). Si desde
+  el último reinicio no se consumió ningún token (p.ej. el inicial derivó ε),
+  antes se descarta el token actual: así el parse siempre avanza
+
+Para no reportar errores en cascada, después de un error no se reporta otro
+hasta que el parser consuma algún token correctamente. El primer error
+reportado es siempre el mismo que devuelve parse_ll1.
+
+Los tokens de error del lexer tolerante (regex_scanner.ERROR_TYPE) ya fueron
+reportados como errores léxicos: se descartan sin reportar y cuentan como un
+error previo (no se reporta el error sintáctico que provoquen en cascada).
+"""
+from typing import Dict, Iterable, List, Set, Tuple
+from ..lexer.regex_scanner import ERROR_TYPE
+from .grammar_io import EPS
+from .parser_ll1 import format_expected_from_row, select_production, token_to_symbol, type_columns
+from .table import build_row_index
+
+Token = Tuple[str, str, int, int]  # (tipo, lexema, linea, col)
+
+DEFAULT_MAX_ERRORS = 100
+
+def _token_columns(tok: Token) -> Set[str]:
+    """Terminales de la gramática que el token puede satisfacer."""
+    return {tok[1], *type_columns(tok[0])}
+
+def parse_ll1_recover(
+    start: str,
+    G,
+    table,
+    tokens: Iterable[Token],
+    FOLLOW: Dict[str, Set[str]],
+    rows=None,
+    max_errors: int = DEFAULT_MAX_ERRORS,
+) -> Tuple[bool, List[str]]:
+    """Retorna (ok, errores). Se detiene al llegar a `max_errors` errores."""
+    if rows is None:
+        rows = build_row_index(table)
+    errors: List[str] = []
+    stack: List[str] = ["$", start]
+    it = iter(tokens)
+    quiet = False  # True desde un error hasta el próximo token consumido
+    pos = 0  # tokens leídos
+    restarted_at = -1  # pos del último reinicio desde el símbolo inicial
+
+    def report(msg: str) -> bool:
+        """Registra el error (si no es en cascada); True si se llegó al tope."""
+        if not quiet:
+            errors.append(msg)
+        return len(errors) >= max_errors
+
+    def advance(tok: Token) -> Token:
+        nonlocal quiet, pos
+        pos += 1
+        nxt = next(it, None)
+        while nxt is not None and nxt[0] == ERROR_TYPE:
+            quiet = True
+            nxt = next(it, None)
+        return nxt or ("EOF", "$", tok[2], tok[3])
+
+    tok = advance(("EOF", "$", 1, 1))
+
+    while stack:
+        X = stack.pop()
+        ttype, lex, line, col = tok
+
+        if X == "$":
+            if lex == "$":
+                break
+            if report(f"<{line},{col}> Error sintactico: se encontro: \"{lex}\"; se esperaba fin de entrada"):
+                break
+            quiet = True
+            if pos == restarted_at:
+                # El reinicio anterior no consumió nada: descartar este token
+                tok = advance(tok)
+                lex = tok[1]
+            # Retomar el símbolo inicial donde pueda comenzar
+            start_cols = rows.get(start, {})
+            while lex != "$" and not (_token_columns(tok) & start_cols.keys()):
+                tok = advance(tok)
+                lex = tok[1]
+            restarted_at = pos
+            stack.append("$")
+            if lex != "$":
+                stack.append(start)
+            continue
+
+        # X es terminal
+        if X not in G and X != EPS:
+            if token_to_symbol(X, tok):
+                quiet = False
+                tok = advance(tok)
+                continue
+            if report(f"<{line},{col}> Error sintactico: se encontro: \"{lex}\"; se esperaba: \"{X}\""):
+                break
+            quiet = True
+            continue  # X sacado de la pila
+
+        row = rows.get(X)
+        prods = select_production(row, ttype, lex)
+        if not prods:
+            esperados = format_expected_from_row(table, X, rows)
+            esperados_str = "\", \"".join(esperados) if esperados else "—"
+            if report(f"<{line},{col}> Error sintactico: se encontro: \"{lex}\"; se esperaba: \"{esperados_str}\""):
+                break
+            quiet = True
+            # Pánico: descartar hasta un token de FIRST (retomar X) o de FOLLOW (sacar X)
+            follow = FOLLOW.get(X, set())
+            while True:
+                if select_production(row, tok[0], tok[1]):
+                    stack.append(X)
+                    break
+                if tok[1] == "$" or _token_columns(tok) & follow:
+                    break
+                tok = advance(tok)
+            continue
+
+        rhs = prods[0].split()
+        if rhs != [EPS]:
+            stack.extend(reversed(rhs))
+
+    return not errors, errors
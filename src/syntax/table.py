@@ -6,6 +6,8 @@ Construcción de la tabla LL(1):
   M[A, a] = producción (A→α) para todo a ∈ PREDICT(A→α)
 
 Detecta conflictos si una celda recibe más de una producción.
+También arma el índice por filas (A -> {a: producciones}) que usa el parser
+para resolver cada expansión con búsquedas O(1).
 """
 from typing import Dict, List, Set, Tuple
 
@@ -23,3 +25,13 @@ def build_ll1_table(
 def has_conflicts(table: Dict[Tuple[str, str], List[str]]) -> int:
     """Devuelve el número de celdas con múltiples producciones (conflictos)."""
     return sum(1 for v in table.values() if len(v) > 1)
+
+def build_row_index(
+    table: Dict[Tuple[str, str], List[str]]
+) -> Dict[str, Dict[str, List[str]]]:
+    """Índice por no-terminal: rows[A][a] == table[(A, a)].
+    Conserva el orden de inserción de la tabla dentro de cada fila."""
+    rows: Dict[str, Dict[str, List[str]]] = {}
+    for (A, a), prods in table.items():
+        rows.setdefault(A, {})[a] = prods
+    return rows
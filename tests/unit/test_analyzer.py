@@ -0,0 +1,74 @@
+import threading
+import unittest
+
+from src.analyzer import Analyzer
+
+GRAMMAR = "grammars/python_subset.g"
+EXPR = "E -> T E'\nE' -> + T E' | ε\nT -> id | NUM\n"
+
+class TestAnalyzer(unittest.TestCase):
+    def setUp(self):
+        self.an = Analyzer(max_grammars=2, use_cache=False)
+
+    def test_results(self):
+        cg = self.an.load(GRAMMAR)
+        res = self.an.parse(cg, b"x = 1\nprint( x )\n", tokens=True, tree=True)
+        self.assertTrue(res.ok)
+        self.assertEqual((res.exit_code, res.errors, len(res.tokens)), (0, (), 7))
+        self.assertIsNotNone(res.tree)
+        res = self.an.parse(GRAMMAR, "x = = 1\n")
+        self.assertEqual((res.status, res.exit_code, res.message), ("syntax_error", 2, res.errors[0]))
+        self.assertTrue(res.message.startswith("<1,5> Error sintactico"))
+        res = self.an.parse(cg, "x = $\n")
+        self.assertEqual((res.status, res.exit_code, res.message), ("lex_error", 1, "Error léxico(linea:1,posicion:5)"))
+        res = self.an.parse(cg, "x = = 1\ny = $\nz = (\n", recover=True, lex_recover=True)
+        self.assertEqual((res.status, len(res.errors), res.message), ("lex_error", 3, "Error léxico(linea:2,posicion:5)"))
+        res = self.an.tokenize("a $ b ?", recover=True)
+        self.assertEqual((res.status, len(res.errors), [t[1] for t in res.tokens]), ("lex_error", 2, ["a", "b"]))
+
+    def test_recover_lexer_and_follow_once(self):
+        cg = self.an.load(GRAMMAR)
+        for lexer in ("compact", "parallel"):
+            with self.assertRaises(ValueError):
+                self.an.tokenize("x = 1", lexer=lexer, recover=True)
+            with self.assertRaises(ValueError):
+                self.an.parse(cg, "x = 1", lexer=lexer, lex_recover=True)
+        self.assertTrue(self.an.tokenize("x = 1", lexer="regex", recover=True).ok)
+        self.assertIs(self.an.follow(cg), self.an.follow(cg))
+        self.assertEqual(self.an.follow(cg), cg.FOLLOW)
+        res = self.an.parse(cg, "x = = 1\ny = (\n", recover=True)
+        self.assertEqual(len(res.errors), 2)
+
+    def test_lru_by_content(self):
+        a = self.an.load(GRAMMAR)
+        with open(GRAMMAR, encoding="utf-8") as f:
+            self.assertIs(self.an.compile(f.read()), a)
+        b = self.an.compile(EXPR)
+        self.assertIs(self.an.compile(EXPR.encode()), b)
+        self.an.compile(EXPR + "T -> ( E )\n")  # desaloja la menos usada (python_subset)
+        st = self.an.stats()
+        self.assertEqual((st["grammars"], st["hits"], st["misses"], st["evictions"]), (2, 2, 3, 1))
+        self.assertEqual(st["paths"], [])
+        self.assertIsNot(self.an.load(GRAMMAR), a)
+
+    def test_compiled_grammar_is_read_only_and_shared(self):
+        cg = self.an.compile(EXPR)
+        with self.assertRaises(TypeError):
+            cg.ROWS["E"]["id"] = ("NUM",)
+        with self.assertRaises(TypeError):
+            cg.G["E"] = ()
+        with self.assertRaises(AttributeError):
+            cg.start = "T"
+        results = []
+
+        def work(i):
+            results.append(self.an.parse(cg, " + ".join(f"x{k}" for k in range(i + 1))).ok)
+        threads = [threading.Thread(target=work, args=(i,)) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(results, [True] * 8)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from src import main as cli
+from src.batch import collect_inputs, run_batch
+from src.main import run_parse
+from src.syntax.grammar_cache import load_compiled_grammar
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        self.cg = load_compiled_grammar("grammars/python_subset.g", use_cache=False)
+
+    def _run(self, paths, jobs):
+        with tempfile.TemporaryDirectory() as tmp:
+            summary = os.path.join(tmp, "summary.json")
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out):
+                code = run_batch("parse", paths, self.cg, jobs=jobs, summary_path=summary)
+            with open(summary, encoding="utf-8") as f:
+                return code, out.getvalue(), json.load(f)
+
+    def test_collect_inputs(self):
+        paths = collect_inputs(["examples/python/ok", "examples/python/ok/mini.py", "examples/python/bad/error*.py"])
+        self.assertEqual(paths[0], "examples/python/ok/mini.py")
+        self.assertEqual(paths.count("examples/python/ok/mini.py"), 1)
+        self.assertIn("examples/python/bad/error_lex.py", paths)
+
+    def test_ordered_output_and_summary(self):
+        paths = ["examples/python/ok/mini.py", "examples/python/bad/error1.py", "examples/python/ok/print1.py"]
+        for jobs in (1, 2):
+            code, out, summary = self._run(paths, jobs)
+            self.assertEqual(code, 2)
+            headers = [line[3:-3] for line in out.splitlines() if line.startswith("== ")]
+            self.assertEqual(headers, paths)
+            self.assertEqual([f["status"] for f in summary["files"]], ["ok", "syntax_error", "ok"])
+            self.assertEqual(summary["totals"]["failed"], 1)
+
+    def test_lexical_error_wins_exit_code(self):
+        code, _, summary = self._run(["examples/python/bad/error1.py", "examples/python/bad/error_lex.py", "no/existe.py"], 1)
+        self.assertEqual(code, 1)
+        self.assertEqual([f["status"] for f in summary["files"]], ["syntax_error", "lex_error", "io_error"])
+
+    def test_newlines_like_single_file_mode(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "crlf.py")
+            with open(path, "wb") as f:
+                f.write(b"x = 1\r\ny = 2\rz = = 3\r\n")
+            single = io.StringIO()
+            with contextlib.redirect_stdout(single):
+                code = run_parse("grammars/python_subset.g", path, use_cache=False)
+            batch_code, out, summary = self._run([path], 1)
+        self.assertEqual((batch_code, code), (2, 2))
+        self.assertEqual(summary["files"][0]["message"], single.getvalue().strip())
+        self.assertTrue(summary["files"][0]["message"].startswith("<3,5>"))
+
+    def test_rejects_single_file_options(self):
+        for extra in (["--stream"], ["--recover"], ["--lex-recover"], ["--cst-out", "x.jsonl"], ["--profile"]):
+            err = io.StringIO()
+            argv = ["main", "--mode", "parse", "--grammar", "grammars/python_subset.g", "--batch", "examples/python/ok", *extra]
+            with mock.patch("sys.argv", argv), contextlib.redirect_stderr(err), self.assertRaises(SystemExit) as cm:
+                cli.main()
+            self.assertEqual(cm.exception.code, 2)
+            self.assertIn(extra[0], err.getvalue())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,32 @@
+import unittest
+
+from src.bench import build_input, compare, parse_size, run_bench
+
+class TestBench(unittest.TestCase):
+    def test_parse_size(self):
+        self.assertEqual(parse_size("64K"), 65536)
+        self.assertEqual(parse_size("1.5m"), 1572864)
+        self.assertEqual(parse_size("1000"), 1000)
+
+    def test_build_input_keeps_whole_lines(self):
+        src = build_input("x = 1", 100)
+        self.assertGreaterEqual(len(src), 100)
+        self.assertEqual(set(src.splitlines()), {"x = 1"})
+
+    def test_run_and_compare(self):
+        report = run_bench("grammars/python_subset.g", [2048], lexer="regex", warmup=0, repeats=1,
+                           memory=True, log=lambda _: None)
+        phases = [r["phase"] for r in report["results"]]
+        self.assertEqual(phases, ["load_grammar", "first_follow", "predict", "table", "tokenize", "parse", "parse_ll1"])
+        parse = report["results"][-2]
+        self.assertGreater(parse["tokens"], 0)
+        self.assertIn("peak_bytes", parse)
+        self.assertEqual(report["results"][-1]["tokens"], parse["tokens"])
+
+        slower = {"results": [dict(r, median_s=r["median_s"] / 2) for r in report["results"]]}
+        flagged = compare(report, slower, 0.10, min_time=0)
+        self.assertEqual(len(flagged), len(report["results"]))
+        self.assertEqual(compare(report, slower, 0.10, min_time=3600), [])
+
+if __name__ == "__main__":
+    unittest.main()
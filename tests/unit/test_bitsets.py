@@ -0,0 +1,53 @@
+import random
+import unittest
+
+from src.syntax.bitsets import build_alphabet, count_conflicts_bits, to_mask, to_set
+from src.syntax.first_follow import compute_first_sets, compute_follow_sets
+from src.syntax.grammar_cache import compile_grammar
+from src.syntax.grammar_io import EPS
+from src.syntax.predict import compute_predict_sets
+from src.syntax.table import build_ll1_table, has_conflicts
+
+def _random_grammar_text(rng):
+    nts = [f"N{i}" for i in range(rng.randint(1, 7))]
+    terms = [f"t{i}" for i in range(rng.randint(1, 4))]
+    lines = []
+    for A in nts:
+        alts = [EPS if rng.random() < 0.2 else " ".join(rng.choice(nts + terms) for _ in range(rng.randint(1, 4)))
+                for _ in range(rng.randint(1, 3))]
+        lines.append(f"{A} -> " + " | ".join(alts))
+    return "\n".join(lines)
+
+class TestBitsets(unittest.TestCase):
+    def _check(self, text):
+        cg = compile_grammar(text)
+        first = compute_first_sets(cg.G)
+        follow = compute_follow_sets(cg.start, cg.G, first)
+        pred = compute_predict_sets(cg.start, cg.G, first, follow)
+        table = build_ll1_table(pred)
+        self.assertEqual(cg.FIRST, first)
+        self.assertEqual(cg.FOLLOW, follow)
+        self.assertEqual(cg.PRED, pred)
+        self.assertEqual({k: sorted(v) for k, v in cg.TABLE.items()}, {k: sorted(v) for k, v in table.items()})
+        self.assertEqual(cg.meta["conflicts"], has_conflicts(table))
+        self.assertEqual(count_conflicts_bits(cg.PRED_BITS), has_conflicts(table))
+
+    def test_project_grammars(self):
+        for path in ("grammars/ejemplo_p6.g", "grammars/python_subset.g"):
+            with open(path, encoding="utf-8") as f:
+                self._check(f.read())
+
+    def test_random_grammars(self):
+        rng = random.Random(1)
+        for _ in range(300):
+            self._check(_random_grammar_text(rng))
+
+    def test_mask_roundtrip(self):
+        cg = compile_grammar("E -> T + E | T\nT -> id\n")
+        alphabet = build_alphabet(cg.G)
+        ids = {a: i for i, a in enumerate(alphabet)}
+        self.assertEqual(to_set(to_mask({"+", "$"}, ids), alphabet), {"+", "$"})
+        self.assertEqual(cg.meta["conflicts"], 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import contextlib
+import inspect
+import io
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from src.lexer.tokenizer import tokenize
+from src.main import run_compile
+from src.syntax.codegen import generate_parser
+from src.syntax.grammar_cache import compile_grammar
+from src.syntax.parser_ll1 import parse_ll1
+from src.syntax.program import _parse_iter, parse_program, program_for
+
+SHIPPED = "outputs/parsers/python_subset_parser.py"
+
+def _load(code):
+    ns = {}
+    exec(compile(code, "<generado>", "exec"), ns)
+    return ns["parse"]
+
+class TestCodegen(unittest.TestCase):
+    def _check(self, text, pieces, trials=2000, seed=5):
+        cg = compile_grammar(text)
+        parse = _load(generate_parser(cg, text))
+        rng = random.Random(seed)
+        for _ in range(trials):
+            tokens = tokenize(" ".join(rng.choice(pieces) for _ in range(rng.randint(0, 20))))
+            self.assertEqual(parse(tokens), parse_ll1(cg.start, cg.G, cg.TABLE, tokens, rows=cg.ROWS), tokens)
+
+    def test_same_results_as_parse_ll1(self):
+        with open("grammars/python_subset.g", encoding="utf-8") as f:
+            self._check(f.read(), ["x", "=", "1", "+", "*", "(", ")", "print", "\n", "-", "if", "'s'", "id"])
+        with open("grammars/ejemplo_p6.g", encoding="utf-8") as f:
+            self._check(f.read(), ["id", "+", "*", "(", ")", "x", "1"])
+
+    def test_type_columns_tie_break(self):
+        self._check("S -> identificador | id x\n", ["foo", "x", "id"], trials=200)
+
+    def test_parse_loop_is_program_source(self):
+        with open("grammars/python_subset.g", encoding="utf-8") as f:
+            text = f.read()
+        cg = compile_grammar(text)
+        code = generate_parser(cg, text)
+        self.assertIn(inspect.getsource(_parse_iter), code)
+        tokens = tokenize("x = (1 + y) * 2\nprint( x )\n")
+        got, want = [], []
+        self.assertEqual(_load(code)(tokens, lambda A, rhs: got.append((A, rhs))),
+                         parse_program(program_for(cg), tokens, lambda A, rhs: want.append((A, rhs))))
+        self.assertEqual(got, want)
+
+    def test_shipped_parser_is_up_to_date(self):
+        with open("grammars/python_subset.g", encoding="utf-8") as f:
+            text = f.read()
+        with open(SHIPPED, encoding="utf-8") as f:
+            shipped = f.read()
+        self.assertEqual(shipped, generate_parser(compile_grammar(text), text, "grammars/python_subset.g"))
+
+    def test_compile_respects_grammar_cache_options(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            grammar = shutil.copy("grammars/ejemplo_p6.g", tmp)
+            out, cache = os.path.join(tmp, "p.py"), os.path.join(tmp, "cache")
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.assertEqual(run_compile(grammar, out, use_cache=False), 0)
+                self.assertFalse(os.path.exists(os.path.join(tmp, ".ll1cache")))
+                self.assertEqual(run_compile(grammar, out, cache_dir=cache), 0)
+            self.assertTrue(os.listdir(cache))
+            self.assertFalse(os.path.exists(os.path.join(tmp, ".ll1cache")))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import os
+import tempfile
+import unittest
+
+from src.lexer.tokenizer import tokenize
+from src.main import run_parse
+from src.syntax.conflicts import parse_ll1_resolve
+from src.syntax.cst import CST
+from src.syntax.grammar_cache import compile_grammar
+from src.syntax.parser_ll1 import parse_ll1
+
+# Prefijo común en S, y en A una alternativa que es prefijo de la otra
+PREFIX = "S -> id = E | id ( E )\nE -> id | NUM\n"
+SUFFIX = "L -> A ; L | ε\nA -> X | X ,\nX -> id\n"
+# La más larga no siempre sirve: debe quedar un token que la pila pueda seguir
+FOLLOWED = "S -> A b\nA -> a | a b\n"
+# Celda con recursión por izquierda: esa alternativa nunca se elige
+LEFT_REC = "E -> E + T | T\nT -> id\n"
+ONLY_LEFT_REC = "S -> a\nS -> S a | S b\n"
+
+class TestResolveConflicts(unittest.TestCase):
+    def _both(self, grammar, src, **kw):
+        cg = compile_grammar(grammar)
+        self.assertGreater(cg.meta["conflicts"], 0)
+        plain = parse_ll1(cg.start, cg.G, cg.TABLE, tokenize(src), rows=cg.ROWS)
+        return plain, parse_ll1_resolve(cg.start, cg.G, cg.TABLE, tokenize(src), rows=cg.ROWS, **kw)
+
+    def test_accepts_what_first_production_rejects(self):
+        for grammar, src in ((PREFIX, "f ( y )"), (SUFFIX, "x ; y , ; z ;"), (FOLLOWED, "a b b")):
+            plain, resolved = self._both(grammar, src)
+            self.assertFalse(plain[0], src)
+            self.assertEqual(resolved, (True, "El analisis sintactico ha finalizado exitosamente."))
+        self.assertTrue(self._both(FOLLOWED, "a b")[1][0])
+
+    def test_invalid_input_reports_like_parse_ll1(self):
+        for grammar, src in ((PREFIX, "f = ="), (PREFIX, "f ( 1 ) ="), (SUFFIX, "x , , ;"), (FOLLOWED, "a")):
+            plain, resolved = self._both(grammar, src)
+            self.assertEqual(resolved, plain)
+
+    def test_left_recursive_cell_terminates(self):
+        # parse_ll1 tomaría "E + T" y no terminaría: solo se prueba el resolutor
+        def resolve(grammar, src):
+            cg = compile_grammar(grammar)
+            return parse_ll1_resolve(cg.start, cg.G, cg.TABLE, tokenize(src), rows=cg.ROWS)
+        self.assertEqual(resolve(LEFT_REC, "x"), (True, "El analisis sintactico ha finalizado exitosamente."))
+        for src in ("x y", "x *", "x + y + z"):
+            ok, msg = resolve(LEFT_REC, src)
+            self.assertFalse(ok, src)
+            self.assertTrue(msg.startswith("<1,3> Error sintactico"), msg)
+        self.assertTrue(resolve(ONLY_LEFT_REC, "a")[0])
+        self.assertFalse(resolve(ONLY_LEFT_REC, "a a")[0])
+
+    def test_memo_stats_and_tree(self):
+        cg = compile_grammar(SUFFIX)
+        src = " ; ".join(f"x{i} ," for i in range(200)) + " ;"
+        stats, tree, deriv = {}, CST(cg.G), []
+        ok, _ = parse_ll1_resolve(cg.start, cg.G, cg.TABLE, tokenize(src), rows=cg.ROWS, tree=tree,
+                                  deriv=lambda A, p: deriv.append(p), stats=stats, lookahead=4)
+        self.assertTrue(ok)
+        self.assertEqual(stats["conflict_decisions"], 200)
+        self.assertEqual(deriv.count("X ,"), 200)
+        self.assertEqual([t[1] for t in tree.tokens], [t[1] for t in tokenize(src)])
+
+    def test_cli_flag(self):
+        path = os.path.join(tempfile.mkdtemp(), "prefijo.g")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(PREFIX)
+        src = os.path.join(os.path.dirname(path), "in.txt")
+        with open(src, "w", encoding="utf-8") as f:
+            f.write("f ( y )\n")
+        self.assertEqual(run_parse(path, src, use_cache=False), 2)
+        self.assertEqual(run_parse(path, src, use_cache=False, resolve_conflicts=True), 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import io
+import unittest
+
+from src.lexer.tokenizer import tokenize
+from src.syntax.cst import CST, load_binary
+from src.syntax.grammar_cache import compile_grammar
+from src.syntax.parser_ll1 import parse_ll1
+
+SRC = "x = 1 + 2 * 3\nprint( x )\ny = (x + 10) * 2\n"
+
+class TestCST(unittest.TestCase):
+    def setUp(self):
+        with open("grammars/python_subset.g", encoding="utf-8") as f:
+            self.cg = compile_grammar(f.read())
+        self.tokens = tokenize(SRC)
+        self.tree = CST(self.cg.G)
+        ok, _ = parse_ll1(self.cg.start, self.cg.G, self.cg.TABLE, self.tokens, rows=self.cg.ROWS, tree=self.tree)
+        self.assertTrue(ok)
+
+    def test_leaves_in_order_are_the_tokens(self):
+        t = self.tree
+        leaves = [t.token_of(n) for n, _ in t.preorder() if t.token[n] >= 0]
+        self.assertEqual(leaves, self.tokens)
+
+    def test_children_follow_productions(self):
+        t = self.tree
+        self.assertEqual(t.symbol(0), self.cg.start)
+        for n in range(len(t)):
+            p = t.production(n)
+            kids = [t.symbol(c) for c in t.children(n)]
+            if p is None:
+                self.assertEqual(kids, [])
+            else:
+                self.assertEqual(p[0], t.symbol(n))
+                self.assertEqual(kids, [s for s in p[1] if s != "ε"])
+            for c in t.children(n):
+                self.assertEqual(t.parent[c], n)
+
+    def test_walk_matches_preorder(self):
+        seen, left = [], []
+        self.tree.walk(seen.append, left.append)
+        self.assertEqual(seen, [n for n, _ in self.tree.preorder()])
+        self.assertEqual(sorted(left), list(range(len(self.tree))))
+
+    def test_binary_round_trip(self):
+        buf = io.BytesIO()
+        self.tree.write_binary(buf)
+        back = load_binary(buf.getvalue())
+        self.assertEqual(back.productions, self.tree.productions)
+        self.assertEqual(back.tokens, self.tree.tokens)
+        self.assertEqual([(back.symbol(n), d) for n, d in back.preorder()],
+                         [(self.tree.symbol(n), d) for n, d in self.tree.preorder()])
+
+    def test_jsonl_one_line_per_node(self):
+        buf = io.StringIO()
+        self.tree.write_jsonl(buf)
+        self.assertEqual(len(buf.getvalue().splitlines()), len(self.tree) + 1)
+
+    def test_duplicate_production_uses_first_id(self):
+        # Como la tabla LL(1) y el programa de parse: una producción repetida es la primera
+        cg = compile_grammar("S -> a S | a S\nS -> ε\n")
+        tree = CST(cg.G)
+        self.assertTrue(parse_ll1(cg.start, cg.G, cg.TABLE, tokenize("a a"), rows=cg.ROWS, tree=tree)[0])
+        self.assertEqual([tree.prod[n] for n, _ in tree.preorder() if tree.prod[n] >= 0], [0, 0, 2])
+        buf = io.BytesIO()
+        tree.write_binary(buf)
+        self.assertEqual(load_binary(buf.getvalue())._prod_ids[("S", "a S")], 0)
+
+if __name__ == "__main__":
+    unittest.main()
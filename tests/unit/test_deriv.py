@@ -0,0 +1,61 @@
+import io
+import unittest
+
+from src.lexer.tokenizer import tokenize
+from src.syntax.cst import CST
+from src.syntax.deriv import DerivationWriter, iter_ids, render
+from src.syntax.grammar_cache import compile_grammar
+from src.syntax.grammar_io import parse_grammar_text, production_list
+from src.syntax.parser_ll1 import parse_ll1
+
+SRC = "x = 1 + 2 * 3\nprint( x )\ny = (x + 10) * 2\n"
+
+class TestDerivation(unittest.TestCase):
+    def setUp(self):
+        with open("grammars/python_subset.g", encoding="utf-8") as f:
+            self.cg = compile_grammar(f.read())
+        self.productions = production_list(self.cg.G)
+
+    def _parse(self, deriv, tree=None):
+        return parse_ll1(self.cg.start, self.cg.G, self.cg.TABLE, tokenize(SRC), deriv=deriv, rows=self.cg.ROWS, tree=tree)
+
+    def test_binary_trace_is_the_leftmost_derivation(self):
+        buf = io.BytesIO()
+        tree = CST(self.cg.G)
+        with DerivationWriter(self.cg.G, buf, "bin", buffer=3) as w:
+            self.assertTrue(self._parse(w, tree)[0])
+        buf.seek(0)
+        ids = list(iter_ids(buf, self.productions, chunk=5))
+        self.assertEqual(ids, [tree.prod[n] for n, _ in tree.preorder() if tree.prod[n] >= 0])
+        self.assertEqual(w.count, len(ids))
+
+    def test_text_trace_matches_decoded_binary(self):
+        text, data = io.StringIO(), io.BytesIO()
+        with DerivationWriter(self.cg.G, text, buffer=4) as w:
+            self._parse(w)
+        with DerivationWriter(self.cg.G, data, "bin") as w:
+            self._parse(w)
+        data.seek(0)
+        self.assertEqual(text.getvalue(), "".join(render(iter_ids(data), self.productions)))
+        self.assertTrue(text.getvalue().startswith("S -> stmt S\nstmt -> assign\nassign -> id = expr\n"))
+
+    def test_trace_from_other_grammar_is_rejected(self):
+        data = io.BytesIO()
+        with DerivationWriter(self.cg.G, data, "bin") as w:
+            self._parse(w)
+        data.seek(0)
+        _, other = parse_grammar_text("S -> a S | ε\n")
+        with self.assertRaises(ValueError):
+            list(iter_ids(data, production_list(other)))
+
+    def test_duplicate_production_uses_first_id(self):
+        # Como la tabla LL(1) y el CST: una producción repetida es la primera
+        cg = compile_grammar("S -> a S | a S\nS -> ε\n")
+        buf = io.BytesIO()
+        with DerivationWriter(cg.G, buf, "bin") as w:
+            self.assertTrue(parse_ll1(cg.start, cg.G, cg.TABLE, tokenize("a a"), deriv=w, rows=cg.ROWS)[0])
+        buf.seek(0)
+        self.assertEqual(list(iter_ids(buf, production_list(cg.G))), [0, 0, 2])
+
+if __name__ == "__main__":
+    unittest.main()
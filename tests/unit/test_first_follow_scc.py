@@ -0,0 +1,52 @@
+import random
+import unittest
+
+from src.syntax.first_follow import (
+    compute_first_sets, compute_follow_sets,
+    compute_first_sets_scc, compute_follow_sets_scc, compute_nullable,
+)
+from src.syntax.grammar_io import EPS, load_grammar
+
+def _random_grammar(rng):
+    nts = [f"N{i}" for i in range(rng.randint(1, 8))]
+    terms = [f"t{i}" for i in range(rng.randint(1, 4))] + [EPS]
+    G = {}
+    for A in nts:
+        G[A] = []
+        for _ in range(rng.randint(1, 3)):
+            if rng.random() < 0.2:
+                G[A].append([EPS])
+            else:
+                G[A].append([rng.choice(nts + terms) for _ in range(rng.randint(1, 4))])
+    return nts[0], G
+
+class TestFirstFollowScc(unittest.TestCase):
+    def _check(self, start, G):
+        first = compute_first_sets(G)
+        self.assertEqual(compute_first_sets_scc(G), first)
+        self.assertEqual(compute_follow_sets_scc(start, G, first), compute_follow_sets(start, G, first))
+
+    def test_project_grammars(self):
+        for path in ("grammars/ejemplo_p6.g", "grammars/python_subset.g"):
+            self._check(*load_grammar(path))
+
+    def test_random_grammars(self):
+        rng = random.Random(0)
+        for _ in range(500):
+            self._check(*_random_grammar(rng))
+
+    def test_nullable(self):
+        start, G = load_grammar("grammars/python_subset.g")
+        self.assertEqual(compute_nullable(G), {"S", "expr'", "term'"})
+
+    def test_long_chain_is_fast(self):
+        # El cierre iterativo necesita ~n pasadas sobre n producciones aquí
+        G = {f"A{i}": [[f"A{i + 1}", f"t{i}"], [EPS]] for i in range(3000)}
+        G["A3000"] = [["x"]]
+        first = compute_first_sets_scc(G)
+        self.assertEqual(len(first["A0"]), 3001)  # t0..t2998, x y ε
+        follow = compute_follow_sets_scc("A0", G, first)
+        self.assertEqual(follow["A3000"], {"t2999"})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import io
+import json
+import unittest
+
+from src.gen_corpus import generate, min_heights, write_corpus
+from src.lexer.regex_scanner import tokenize_regex
+from src.lexer.tokenizer import tokenize
+from src.reporter import format_token
+from src.syntax.grammar_cache import compile_grammar
+from src.syntax.parser_ll1 import parse_ll1
+
+def _grammar(path):
+    with open(path, encoding="utf-8") as f:
+        return compile_grammar(f.read())
+
+def _corpus(cg, fmt="source", **kw):
+    out, manifest = io.StringIO(), io.StringIO()
+    write_corpus(generate(cg, **kw), out, fmt, manifest)
+    return out.getvalue(), [json.loads(line) for line in manifest.getvalue().splitlines()]
+
+class TestGenCorpus(unittest.TestCase):
+    def test_valid_and_deterministic(self):
+        for path in ("grammars/python_subset.g", "grammars/ejemplo_p6.g"):
+            cg = _grammar(path)
+            for seed in range(5):
+                src, _ = _corpus(cg, size=2000, seed=seed, max_depth=10)
+                self.assertGreater(len(src), 1800)  # tamaño aproximado
+                ok, msg = parse_ll1(cg.start, cg.G, cg.TABLE, tokenize(src), rows=cg.ROWS)
+                self.assertTrue(ok, msg)
+                self.assertEqual(src, _corpus(cg, size=2000, seed=seed, max_depth=10)[0])
+
+    def test_token_format_matches_lexer(self):
+        cg = _grammar("grammars/python_subset.g")
+        src, _ = _corpus(cg, size=1000, seed=1)
+        toks, _ = _corpus(cg, "tokens", size=1000, seed=1)
+        self.assertEqual(toks, "".join(format_token(t) + "\n" for t in tokenize(src)))
+
+    def test_injected_errors_are_reported_where_recorded(self):
+        cg = _grammar("grammars/python_subset.g")
+        for kind in ("lex", "syntax"):
+            for seed in range(5):
+                src, manifest = _corpus(cg, size=3000, seed=seed, errors=kind, error_rate=0.02)
+                self.assertTrue(manifest)
+                first = manifest[0]
+                if kind == "lex":
+                    with self.assertRaises(ValueError) as cm:
+                        tokenize_regex(src)
+                    self.assertEqual(str(cm.exception), first["message"])
+                else:
+                    ok, msg = parse_ll1(cg.start, cg.G, cg.TABLE, tokenize(src), rows=cg.ROWS)
+                    self.assertFalse(ok)
+                    self.assertTrue(msg.startswith(f"<{first['line']},{first['col']}> Error sintactico"), msg)
+
+    def test_min_heights(self):
+        cg = _grammar("grammars/ejemplo_p6.g")
+        self.assertEqual(min_heights(cg.G), {"E": 3, "E'": 1, "T": 2, "T'": 1, "F": 1})
+
+if __name__ == "__main__":
+    unittest.main()
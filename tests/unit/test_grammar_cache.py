@@ -0,0 +1,57 @@
+import contextlib
+import io
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from src.main import run_parse
+from src.syntax import grammar_cache
+from src.syntax.grammar_cache import cache_path_for, grammar_digest, load_compiled_grammar
+
+class TestGrammarCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.grammar = self.tmp / "g.g"
+        shutil.copy("grammars/ejemplo_p6.g", self.grammar)
+        self.cache = self.tmp / "cache"
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_reuses_valid_artifact(self):
+        first = load_compiled_grammar(str(self.grammar), cache_dir=str(self.cache))
+        digest = grammar_digest(self.grammar.read_text(encoding="utf-8"))
+        self.assertTrue(cache_path_for(str(self.grammar), digest, str(self.cache)).exists())
+        second = load_compiled_grammar(str(self.grammar), cache_dir=str(self.cache))
+        self.assertEqual(first.TABLE, second.TABLE)
+        self.assertEqual(first.FOLLOW, second.FOLLOW)
+
+    def test_string_views_built_once_and_only_on_demand(self):
+        cg = load_compiled_grammar(str(self.grammar), use_cache=False)
+        self.assertIs(cg.FIRST, cg.FIRST)
+        self.assertIs(cg.FOLLOW, load_compiled_grammar(str(self.grammar), use_cache=False).FOLLOW)
+        src = self.tmp / "in.txt"
+        src.write_text("id + id * id\n", encoding="utf-8")
+        with mock.patch.object(grammar_cache, "_view", side_effect=AssertionError("vista armada")), \
+                contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(run_parse(str(self.grammar), str(src), cache_dir=str(self.cache)), 0)
+
+    def test_rebuilds_when_grammar_changes(self):
+        load_compiled_grammar(str(self.grammar), cache_dir=str(self.cache))
+        with open(self.grammar, "a", encoding="utf-8") as f:
+            f.write("F -> NUM\n")
+        cg = load_compiled_grammar(str(self.grammar), cache_dir=str(self.cache))
+        self.assertIn(("F", "NUM"), cg.TABLE)
+
+    def test_corrupt_artifact_is_ignored(self):
+        digest = grammar_digest(self.grammar.read_text(encoding="utf-8"))
+        path = cache_path_for(str(self.grammar), digest, str(self.cache))
+        path.parent.mkdir(parents=True)
+        path.write_bytes(b"no es un pickle")
+        cg = load_compiled_grammar(str(self.grammar), cache_dir=str(self.cache))
+        self.assertEqual(cg.start, "E")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import random
+import unittest
+from unittest import mock
+
+from src import incremental
+from src.incremental import analyze, apply_edit
+from src.lexer.regex_scanner import tokenize_regex
+from src.syntax.grammar_cache import compile_grammar
+from src.syntax.parser_ll1 import parse_ll1
+
+PIECES = ["x = 1\n", "print( x )\n", "y = (x + 2) * 3\n", "z = ", "(", ")", "+", "\n", " ", "$", "a", "1", "'s'", "#c\n"]
+
+class TestIncremental(unittest.TestCase):
+    def setUp(self):
+        with open("grammars/python_subset.g", encoding="utf-8") as f:
+            self.cg = compile_grammar(f.read())
+
+    def _full(self, src):
+        try:
+            tokens = tokenize_regex(src)
+        except ValueError as e:
+            return None, False, str(e)
+        ok, msg = parse_ll1(self.cg.start, self.cg.G, self.cg.TABLE, tokens, rows=self.cg.ROWS)
+        return tokens, ok, msg
+
+    def test_random_edits_match_full_analysis(self):
+        rng = random.Random(0)
+        for _ in range(150):
+            src = "".join(rng.choice(PIECES[:3]) for _ in range(40))
+            state = analyze(src, self.cg, every=4)
+            for _ in range(6):
+                start = rng.randint(0, len(src))
+                end = min(len(src), start + rng.randint(0, 6))
+                text = "".join(rng.choice(PIECES) for _ in range(rng.randint(0, 2)))
+                state = apply_edit(state, self.cg, start, end, text, every=4)
+                src = src[:start] + text + src[end:]
+                tokens, ok, msg = self._full(src)
+                self.assertEqual((state.ok, state.message), (ok, msg), repr(src))
+                if tokens is not None:
+                    self.assertEqual(state.tokens, tokens)
+
+    def test_converges_and_shifts_error(self):
+        src = "x = 1\n" * 50 + "y = = 2\n" + "z = 3\n" * 50
+        state = analyze(src, self.cg, every=8)
+        self.assertEqual(state.message[:6], "<51,5>")
+        state = apply_edit(state, self.cg, 0, 0, "a = 0\nb = 1\n", every=8)
+        self.assertEqual(state.message, self._full(state.src)[2])
+        self.assertEqual(state.message[:6], "<53,5>")
+
+    def test_new_lines_do_not_renumber_tail(self):
+        src = "x = 1\n" * 2000
+        state = analyze(src, self.cg)
+        tail = state.lexed[-1]
+        for n in range(1, 6):
+            state = apply_edit(state, self.cg, 6, 6, "y = 2\n")
+            self.assertIs(state.lexed[-1], tail)  # el mismo objeto: no se reescribió
+            self.assertEqual(state.tokens[-1][2], 2000 + n)
+        self.assertEqual(state.tokens, self._full(state.src)[0])
+
+    def test_line_shifts_are_compacted(self):
+        rng = random.Random(1)
+        src = "x = 1\n" * 200
+        state = analyze(src, self.cg, every=4)
+        with mock.patch.object(incremental, "MAX_LINE_SHIFTS", 4):
+            for _ in range(60):
+                start = rng.randint(0, len(src))
+                text = rng.choice(["\n", "a = 2\n", ""])
+                end = start if text else min(len(src), start + 1)
+                state = apply_edit(state, self.cg, start, end, text, every=4)
+                src = state.src
+                self.assertLessEqual(len(state.line_shifts), 4)
+                tokens, ok, msg = self._full(src)
+                self.assertEqual((state.tokens, state.ok, state.message), (tokens, ok, msg))
+
+if __name__ == "__main__":
+    unittest.main()
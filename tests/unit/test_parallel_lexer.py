@@ -0,0 +1,36 @@
+import unittest
+
+from src.lexer.parallel import split_lines, tokenize_parallel
+from src.lexer.token_store import tokenize_store
+
+SRC = "x = 1\nif x == 1 :\n    print( 'a # b' , x )\n# comentario\ny = [ 1 , 2 ]\n" * 50
+
+class TestParallelLexer(unittest.TestCase):
+    def test_split_lines_covers_source_at_newlines(self):
+        for src in (SRC, SRC.rstrip("\n"), "x", "\n\n\n"):
+            bounds = split_lines(src, 7)
+            self.assertEqual(bounds[0][0], 0)
+            self.assertEqual(bounds[-1][1], len(src))
+            for (_, end), (pos, _) in zip(bounds, bounds[1:]):
+                self.assertEqual(end, pos)
+                self.assertEqual(src[end - 1], "\n")
+
+    def test_same_tokens_as_compact(self):
+        got = tokenize_parallel(SRC, jobs=2, min_size=0)
+        self.assertEqual(list(got), list(tokenize_store(SRC)))
+
+    def test_empty_and_single_chunk(self):
+        for src in ("", "x = 1", "\n"):
+            self.assertEqual(list(tokenize_parallel(src, jobs=2, min_size=0)), list(tokenize_store(src)))
+
+    def test_earliest_error_like_sequential(self):
+        src = SRC + "z = $\n" + SRC + "w = ?\n"
+        with self.assertRaises(ValueError) as seq:
+            tokenize_store(src)
+        with self.assertRaises(ValueError) as par:
+            tokenize_parallel(src, jobs=2, min_size=0)
+        self.assertEqual(str(par.exception), str(seq.exception))
+        self.assertEqual(str(par.exception), f"Error léxico(linea:{SRC.count(chr(10)) + 1},posicion:5)")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+
+from src.lexer.tokenizer import tokenize
+from src.syntax.grammar_cache import compile_grammar
+from src.syntax.parser_ll1 import parse_ll1, select_production, token_to_symbol
+
+def _plan_b(table, X, tok):
+    """Selección original: columna exacta por lexema o recorrido de toda la tabla."""
+    if (X, tok[1]) in table:
+        return table[(X, tok[1])]
+    for (nt, colterm), prods in table.items():
+        if nt == X and token_to_symbol(colterm, tok):
+            return prods
+    return None
+
+class TestRowIndex(unittest.TestCase):
+    def setUp(self):
+        with open("grammars/python_subset.g", encoding="utf-8") as f:
+            self.cg = compile_grammar(f.read())
+
+    def test_select_matches_full_scan(self):
+        tokens = tokenize("x = 1 + (y * 3)\nprint( x ) if 'a' ==") + [("EOF", "$", 1, 1)]
+        for X in self.cg.G:
+            for tok in tokens:
+                self.assertEqual(
+                    select_production(self.cg.ROWS.get(X), tok[0], tok[1]),
+                    _plan_b(self.cg.TABLE, X, tok),
+                )
+
+    def test_ambiguous_type_columns_follow_table_order(self):
+        cg = compile_grammar("S -> identificador | id x\n")
+        tok = ("identificador", "foo", 1, 1)
+        self.assertEqual(select_production(cg.ROWS["S"], *tok[:2]), _plan_b(cg.TABLE, "S", tok))
+
+    def test_expected_message_from_row(self):
+        tokens = tokenize("x = \n")
+        ok, msg = parse_ll1(self.cg.start, self.cg.G, self.cg.TABLE, tokens, rows=self.cg.ROWS)
+        self.assertFalse(ok)
+        self.assertEqual(msg, '<1,3> Error sintactico: se encontro: "$"; se esperaba: "(", "NUM", "id"')
+
+if __name__ == "__main__":
+    unittest.main()
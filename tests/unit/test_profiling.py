@@ -0,0 +1,93 @@
+import io
+import json
+import unittest
+
+from src.lexer.tokenizer import tokenize
+from src.profiling import ParseCounters, Profiler, TokenCounter, format_text
+from src.syntax.deriv import DerivationWriter
+from src.syntax.first_follow import compute_first_sets, compute_follow_sets
+from src.syntax.grammar_cache import compile_grammar
+from src.syntax.grammar_io import EPS
+from src.syntax.parser_ll1 import parse_ll1, select_production
+
+SRC = "x = 1\nprint( x )\ny = ( x + 2 ) * 3\nz = x * ( y + 1 )\n"
+
+def reference_counts(cg, tokens):
+    """Mismo recorrido que parse_ll1, mirando la pila directamente."""
+    stack = ["$", cg.start]
+    lookups = by_type = eps = 0
+    depth = len(stack)
+    it = iter(tokens)
+    tok = next(it, None) or ("EOF", "$", 1, 1)
+    while stack:
+        X = stack.pop()
+        if X == "$":
+            break
+        if X not in cg.G:
+            tok = next(it, None) or ("EOF", "$", 0, 0)
+            continue
+        row = cg.ROWS[X]
+        prods = select_production(row, tok[0], tok[1])
+        lookups += 1
+        by_type += tok[1] not in row
+        rhs = prods[0].split()
+        if rhs == [EPS]:
+            eps += 1
+            continue
+        stack.extend(reversed(rhs))
+        depth = max(depth, len(stack))
+    return lookups, by_type, eps, depth
+
+class TestProfiling(unittest.TestCase):
+    def setUp(self):
+        with open("grammars/python_subset.g", encoding="utf-8") as f:
+            self.stats = {}
+            self.cg = compile_grammar(f.read(), stats=self.stats)
+
+    def test_parse_counters_match_the_parser_stack(self):
+        cg = self.cg
+        tokens = tokenize(SRC)
+        out = io.StringIO()
+        pc = ParseCounters(cg.ROWS, DerivationWriter(cg.G, out))
+        ok, _ = parse_ll1(cg.start, cg.G, cg.TABLE, pc.wrap(tokens), deriv=pc, rows=cg.ROWS)
+        pc.close()
+        self.assertTrue(ok)
+        lookups, by_type, eps, depth = reference_counts(cg, tokens)
+        counts = pc.as_dict()
+        self.assertEqual(counts["tokens"], len(tokens))
+        self.assertEqual(sum(counts["tokens_by_category"].values()), len(tokens))
+        self.assertEqual(counts["tokens_by_category"]["reservada"], 1)
+        self.assertEqual(
+            (counts["table_lookups"], counts["type_fallbacks"], counts["epsilon_expansions"], counts["max_stack_depth"]),
+            (lookups, by_type, eps, depth),
+        )
+        # La traza envuelta sigue completa
+        self.assertEqual(out.getvalue().count("\n"), lookups)
+
+    def test_grammar_counters(self):
+        self.assertFalse(any(k.startswith("first_iter") for k in self.stats))
+        self.assertGreater(self.stats["first_components"], 0)
+        self.assertGreater(self.stats["follow_dependencies"], 0)
+        stats = {}
+        FIRST = compute_first_sets(self.cg.G, stats)
+        compute_follow_sets(self.cg.start, self.cg.G, FIRST, stats)
+        self.assertGreaterEqual(stats["first_iterations"], 2)
+        self.assertGreaterEqual(stats["follow_iterations"], 2)
+
+    def test_report_phases(self):
+        prof = Profiler(memory=True)
+        try:
+            with prof.phase("tokenize"):
+                tc = TokenCounter()
+                n = sum(1 for _ in tc.wrap(tokenize(SRC)))
+        finally:
+            prof.close()
+        prof.counters.update(tc.as_dict())
+        report = json.loads(json.dumps(prof.report()))
+        self.assertEqual([p["phase"] for p in report["phases"]], ["tokenize"])
+        self.assertIn("peak_bytes", report["phases"][0])
+        self.assertEqual(report["counters"]["tokens"], n)
+        self.assertIn("tokens_by_category:", format_text(report))
+
+if __name__ == "__main__":
+    unittest.main()
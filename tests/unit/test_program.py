@@ -0,0 +1,49 @@
+import random
+import unittest
+
+from src.lexer.token_store import tokenize_store
+from src.lexer.tokenizer import tokenize
+from src.syntax.grammar_cache import compile_grammar
+from src.syntax.parser_ll1 import parse_ll1
+from src.syntax.program import build_program, parse_program, program_for
+
+class TestParseProgram(unittest.TestCase):
+    def _check(self, text, pieces, trials=1500, seed=7):
+        cg = compile_grammar(text)
+        prog = build_program(cg.start, cg.G, cg.ROWS)
+        rng = random.Random(seed)
+        for _ in range(trials):
+            src = " ".join(rng.choice(pieces) for _ in range(rng.randint(0, 20)))
+            tokens = tokenize(src)
+            ref_deriv, deriv = [], []
+            ref = parse_ll1(cg.start, cg.G, cg.TABLE, tokens, rows=cg.ROWS, deriv=lambda A, p: ref_deriv.append((A, p)))
+            self.assertEqual(parse_program(prog, tokens, deriv=lambda A, p: deriv.append((A, p))), ref, src)
+            self.assertEqual(deriv, ref_deriv, src)
+            self.assertEqual(parse_program(prog, iter(tokens)), ref, src)
+            self.assertEqual(parse_program(prog, tokenize_store(src)), ref, src)
+
+    def test_same_results_as_parse_ll1(self):
+        with open("grammars/python_subset.g", encoding="utf-8") as f:
+            self._check(f.read(), ["x", "=", "1", "+", "*", "(", ")", "print", "\n", "-", "if", "'s'", "id"])
+        with open("grammars/ejemplo_p6.g", encoding="utf-8") as f:
+            self._check(f.read(), ["id", "+", "*", "(", ")", "x", "1"])
+
+    def test_type_columns_tie_break_and_conflicts(self):
+        self._check("S -> identificador | id x\n", ["foo", "x", "id"], trials=200)
+        self._check("S -> id = NUM | id ( id )\n", ["f", "=", "1", "(", ")"], trials=300)
+
+    def test_duplicate_production_uses_first_id(self):
+        cg = compile_grammar("S -> a S | a S\nS -> ε\n")
+        prog = build_program(cg.start, cg.G, cg.ROWS)
+        self.assertEqual(prog.rows[0][prog.term_ids["a"]], 0)
+        deriv = []
+        self.assertTrue(parse_program(prog, tokenize("a a"), deriv=lambda A, p: deriv.append(p))[0])
+        self.assertEqual(deriv, ["a S", "a S", "ε"])
+
+    def test_program_is_shared_per_grammar(self):
+        with open("grammars/python_subset.g", encoding="utf-8") as f:
+            text = f.read()
+        self.assertIs(program_for(compile_grammar(text)), program_for(compile_grammar(text)))
+
+if __name__ == "__main__":
+    unittest.main()
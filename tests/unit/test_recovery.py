@@ -0,0 +1,78 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from src import main as cli
+from src.lexer.regex_scanner import tokenize_tolerant
+from src.lexer.tokenizer import tokenize
+from src.syntax.grammar_cache import compile_grammar
+from src.syntax.parser_ll1 import parse_ll1
+from src.syntax.recovery import parse_ll1_recover
+
+BAD = "x = = 1\ny = 2\nprint( x\nz = (1 + ) * 3\nw = 4 4\nq = 5\n"
+
+class TestRecovery(unittest.TestCase):
+    def setUp(self):
+        with open("grammars/python_subset.g", encoding="utf-8") as f:
+            self.cg = compile_grammar(f.read())
+
+    def _recover(self, src, **kw):
+        cg = self.cg
+        return parse_ll1_recover(cg.start, cg.G, cg.TABLE, tokenize(src), cg.FOLLOW, rows=cg.ROWS, **kw)
+
+    def test_reports_every_error_in_one_pass(self):
+        ok, errors = self._recover(BAD)
+        self.assertFalse(ok)
+        self.assertEqual([e.split(" ")[0] for e in errors], ["<1,5>", "<4,1>", "<4,10>", "<5,7>"])
+
+    def test_first_error_matches_parse_ll1(self):
+        cg = self.cg
+        for src in (BAD, "x = \n", "print( 1 \n", "1 = x\n", "x = 1 )\n"):
+            _, msg = parse_ll1(cg.start, cg.G, cg.TABLE, tokenize(src), rows=cg.ROWS)
+            ok, errors = self._recover(src)
+            self.assertFalse(ok)
+            self.assertEqual(errors[0], msg)
+
+    def test_valid_input_and_error_cap(self):
+        self.assertEqual(self._recover("x = 1\nprint( x )\n"), (True, []))
+        ok, errors = self._recover(BAD, max_errors=2)
+        self.assertEqual(len(errors), 2)
+
+    def test_cli_error_cap(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".py", delete=False, encoding="utf-8") as f:
+            f.write(BAD)
+        self.addCleanup(os.unlink, f.name)
+        for cap, printed, cut in ((2, 2, True), (4, 4, False), (10, 4, False)):
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out):
+                code = cli.run_parse("grammars/python_subset.g", f.name, recover=True, max_errors=cap, use_cache=False)
+            lines = out.getvalue().splitlines()
+            self.assertEqual(code, 2)
+            self.assertEqual(sum("Error sintactico" in l for l in lines), printed)
+            self.assertEqual(any("maximo" in l for l in lines), cut, cap)
+        for bad in ("0", "-1", "x"):
+            argv = ["main", "--grammar", "grammars/python_subset.g", "--input", f.name, "--recover", "--max-errors", bad]
+            with mock.patch("sys.argv", argv), contextlib.redirect_stderr(io.StringIO()), \
+                    self.assertRaises(SystemExit) as cm:
+                cli.main()
+            self.assertEqual(cm.exception.code, 2)
+
+    def test_restart_always_advances(self):
+        # S deriva ε en "b": reiniciar desde S sin consumir no debe ciclar
+        cg = compile_grammar("S -> a S b | ε\n")
+        for src, n in (("b b", 1), ("a b b a", 2), ("a a b b", 0)):
+            ok, errors = parse_ll1_recover(cg.start, cg.G, cg.TABLE, tokenize(src), cg.FOLLOW, rows=cg.ROWS)
+            self.assertEqual((ok, len(errors)), (n == 0, n), src)
+
+    def test_lexical_error_tokens_are_skipped(self):
+        cg = self.cg
+        tokens, lex_errors = tokenize_tolerant("x = 1 @ 2\ny = $ 3\nw = = 1\n", error_tokens=True)
+        self.assertEqual(len(lex_errors), 2)
+        ok, errors = parse_ll1_recover(cg.start, cg.G, cg.TABLE, tokens, cg.FOLLOW, rows=cg.ROWS)
+        self.assertEqual(errors, ['<3,5> Error sintactico: se encontro: "="; se esperaba: "(", "NUM", "id"'])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import glob
+import random
+import unittest
+
+from src.lexer.tokenizer import tokenize
+from src.lexer.regex_scanner import ERROR_TYPE, tokenize_regex, tokenize_tolerant
+
+def _run(lex, src):
+    try:
+        return lex(src)
+    except ValueError as e:
+        return str(e)
+
+class TestRegexScanner(unittest.TestCase):
+    def test_examples_match_classic(self):
+        for path in sorted(glob.glob("examples/python/*/*")):
+            with open(path, encoding="utf-8") as f:
+                src = f.read()
+            self.assertEqual(_run(tokenize_regex, src), _run(tokenize, src), path)
+
+    def test_random_inputs_match_classic(self):
+        alphabet = list("ab_9 \t\r\n#+-*/<>=!()[],.:;\"'$@é") + ["==", "<=", "if", "print"]
+        rng = random.Random(7)
+        for _ in range(3000):
+            src = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 25)))
+            self.assertEqual(_run(tokenize_regex, src), _run(tokenize, src), repr(src))
+
+    def test_error_position(self):
+        with self.assertRaisesRegex(ValueError, r"^Error léxico\(linea:2,posicion:5\)$"):
+            tokenize_regex("x = 1\ny = 'abc\n")
+
+    def test_tolerant_reports_every_error(self):
+        tokens, errors = tokenize_tolerant("x = 1 @ 2\ny = 'abc + 1\nz = $\n", error_tokens=True)
+        self.assertEqual(errors, [
+            "Error léxico(linea:1,posicion:7)",
+            "Error léxico(linea:2,posicion:5)",
+            "Error léxico(linea:3,posicion:5)",
+        ])
+        self.assertIn((ERROR_TYPE, "'abc + 1", 2, 5), tokens)
+        self.assertEqual([t for t in tokens if t[0] != ERROR_TYPE],
+                         tokenize("x = 1   2\ny = \nz = \n"))
+
+    def test_tolerant_first_error_matches_classic(self):
+        alphabet = list("ab9 \n#+=()\"'$@é") + ["print"]
+        rng = random.Random(11)
+        for _ in range(2000):
+            src = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 25)))
+            tokens, errors = tokenize_tolerant(src)
+            expected = _run(tokenize, src)
+            if isinstance(expected, str):
+                self.assertEqual(errors[0], expected, repr(src))
+            else:
+                self.assertEqual((tokens, errors), (expected, []), repr(src))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from src import main as cli
+from src.batch import run_batch
+from src.result_cache import ResultCache
+from src.syntax.grammar_cache import load_compiled_grammar
+
+GRAMMAR = "grammars/python_subset.g"
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip_and_key(self):
+        cache = ResultCache(self.dir)
+        key = cache.key(b"x = 1\n", "g", {"recover": False})
+        self.assertNotEqual(key, cache.key(b"x = 2\n", "g", {"recover": False}))
+        self.assertNotEqual(key, cache.key(b"x = 1\n", "h", {"recover": False}))
+        self.assertNotEqual(key, cache.key(b"x = 1\n", "g", {"recover": True}))
+        self.assertIsNone(cache.get(key))
+        cache.put(key, {"exit_code": 0, "output": "ñ\n"}, {"cst": b"{}\n", "otro": b""})
+        self.assertEqual(cache.get(key), ({"exit_code": 0, "output": "ñ\n"}, {"cst": b"{}\n", "otro": b""}))
+        self.assertEqual(cache.stats(), {"hits": 1, "misses": 1, "writes": 1, "evictions": 0})
+        # Una entrada truncada o ajena se trata como fallo
+        path = cache.path_for(key)
+        path.write_bytes(path.read_bytes()[:-1])
+        self.assertIsNone(cache.get(key))
+        path.write_bytes(b"basura")
+        self.assertIsNone(cache.get(key))
+
+    def test_lru_eviction(self):
+        cache = ResultCache(self.dir, max_bytes=10**6)
+        keys = [cache.key(str(i).encode(), "g", {}) for i in range(5)]
+        for i, key in enumerate(keys):
+            cache.put(key, {"output": "x" * 200})
+            os.utime(cache.path_for(key), ns=(i * 10**9, i * 10**9))
+        size = cache.path_for(keys[0]).stat().st_size
+        cache.max_bytes = 5 * size + size // 2  # caben 5; la sexta obliga a desalojar
+        cache.get(keys[0])  # uso reciente: sobrevive
+        cache.put(cache.key(b"otro", "g", {}), {"output": "x" * 200})
+        self.assertGreater(cache.evictions, 0)
+        self.assertIsNotNone(cache.get(keys[0]))
+        self.assertIsNone(cache.get(keys[1]))
+        total = sum(p.stat().st_size for p in Path(self.dir).glob("*/*.res"))
+        self.assertLessEqual(total, cache.max_bytes * 0.9)
+
+    def test_size_index_avoids_scans(self):
+        ResultCache(self.dir).put("ab" * 32, {"output": "x"})
+        size = ResultCache(self.dir).path_for("ab" * 32).stat().st_size
+        other = ResultCache(self.dir)  # otro proceso: no recorre el directorio
+        with mock.patch.object(ResultCache, "_total_bytes", side_effect=AssertionError("recorrió")):
+            other.put("cd" * 32, {"output": "x"})
+        self.assertEqual(int(Path(self.dir, ".size").read_text()), 2 * size)
+        other.max_bytes = size
+        other.put("ef" * 32, {"output": "x"})
+        self.assertEqual(int(Path(self.dir, ".size").read_text()), 0)
+
+    def _cli(self, *argv):
+        out = io.StringIO()
+        with mock.patch("sys.argv", ["main", "--mode", "parse", "--grammar", GRAMMAR, "--no-grammar-cache",
+                                     "--result-cache", self.dir, *argv]), contextlib.redirect_stdout(out):
+            with self.assertRaises(SystemExit) as cm:
+                cli.main()
+        return cm.exception.code, out.getvalue()
+
+    def test_cli_hit_skips_parse(self):
+        cst = os.path.join(self.dir, "out", "cst.jsonl")
+        for path, expected in (("examples/python/ok/mini.py", 0), ("examples/python/bad/error1.py", 2)):
+            first = self._cli("--input", path, "--cst-out", cst)
+            self.assertEqual(first[0], expected)
+            written = Path(cst).read_bytes() if expected == 0 else None
+            if written is not None:
+                os.unlink(cst)
+            with mock.patch.object(cli, "run_parse", side_effect=AssertionError("no debía parsear")):
+                self.assertEqual(self._cli("--input", path, "--cst-out", cst), first)
+            if written is not None:
+                self.assertEqual(Path(cst).read_bytes(), written)
+        # Otras opciones son otra entrada (también --stream: otro orden de errores)
+        with mock.patch.object(cli, "run_parse", return_value=2) as run:
+            self._cli("--input", "examples/python/bad/error1.py", "--stream")
+        run.assert_called_once()
+        with mock.patch.object(cli, "run_parse", return_value=2) as run:
+            self._cli("--input", "examples/python/bad/error1.py", "--recover")
+        run.assert_called_once()
+
+    def test_batch_cached_flag(self):
+        cg = load_compiled_grammar(GRAMMAR, use_cache=False)
+        paths = ["examples/python/ok/mini.py", "examples/python/bad/error_lex.py", "no/existe.py"]
+        runs = []
+        for _ in range(2):
+            summary = os.path.join(self.dir, "summary.json")
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out):
+                code = run_batch("parse", paths, cg, summary_path=summary, result_cache=os.path.join(self.dir, "rc"))
+            with open(summary, encoding="utf-8") as f:
+                files = json.load(f)["files"]
+            runs.append((code, out.getvalue(), files))
+        (code1, out1, files1), (code2, out2, files2) = runs
+        self.assertEqual((code1, out1), (code2, out2))
+        self.assertEqual([f.get("cached", False) for f in files1], [False, False, False])
+        self.assertEqual([f.get("cached", False) for f in files2], [True, True, False])
+        self.assertEqual([f["status"] for f in files2], ["ok", "lex_error", "io_error"])
+        # Otro lexer es otra entrada
+        with contextlib.redirect_stdout(io.StringIO()):
+            run_batch("parse", paths, cg, lexer="regex", summary_path=summary, result_cache=os.path.join(self.dir, "rc"))
+        with open(summary, encoding="utf-8") as f:
+            self.assertFalse(any(f.get("cached", False) for f in json.load(f)["files"]))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import asyncio
+import io
+import json
+import os
+import socket
+import tempfile
+import threading
+import unittest
+
+from src.server import AnalyzerServer
+
+GRAMMAR = "grammars/python_subset.g"
+
+class TestServer(unittest.TestCase):
+    def setUp(self):
+        self.server = AnalyzerServer(workers=2)
+
+    def tearDown(self):
+        self.server.close()
+
+    def test_handle_parse_lex_and_errors(self):
+        h = self.server.handle
+        res = h({"id": 1, "grammar": GRAMMAR, "path": "examples/python/ok/mini.py"})
+        self.assertEqual((res["id"], res["status"], res["exit_code"]), (1, "ok", 0))
+        res = h({"id": 2, "grammar": GRAMMAR, "source": "x = = 1\ny = (\n", "recover": True})
+        self.assertEqual((res["status"], res["exit_code"], len(res["errors"])), ("syntax_error", 2, 2))
+        res = h({"id": 3, "mode": "lex", "source": "x = 1"})
+        self.assertEqual(res["tokens"], [["identificador", "x", 1, 1], ["tk_asignacion", "=", 1, 3], ["tk_entero", "1", 1, 5]])
+        res = h({"id": 4, "mode": "lex", "source": "x $"})
+        self.assertEqual((res["status"], res["message"]), ("lex_error", "Error léxico(linea:1,posicion:3)"))
+        self.assertEqual(h({"grammar": "no/existe.g", "source": ""})["status"], "io_error")
+        self.assertEqual(h({"grammar": GRAMMAR})["status"], "bad_request")
+        # La gramática se compila una vez y queda en memoria
+        self.assertEqual(h({"op": "stats"})["grammars"], [os.path.abspath(GRAMMAR)])
+
+    def test_stdio_json_lines(self):
+        lines = [
+            {"id": i, "grammar": GRAMMAR, "source": f"x{i} = {i}\n"} for i in range(20)
+        ]
+        stdin = io.BytesIO(b"".join((json.dumps(r) + "\n").encode() for r in lines) + b"not json\n")
+        stdout = io.BytesIO()
+        asyncio.run(self.server.serve_stdio(stdin, stdout))
+        out = [json.loads(l) for l in stdout.getvalue().splitlines()]
+        self.assertEqual(len(out), 21)
+        self.assertEqual(sorted(r["id"] for r in out if r["id"] is not None), list(range(20)))
+        self.assertTrue(all(r["status"] == "ok" for r in out if r["id"] is not None))
+        self.assertEqual([r["status"] for r in out if r["id"] is None], ["bad_request"])
+
+    def test_bad_request_does_not_stop_server(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".g", delete=False, encoding="utf-8") as g:
+            g.write("S -> a\nesto no es una produccion\n")
+        self.addCleanup(os.unlink, g.name)
+        lines = [
+            {"id": 1, "grammar": g.name, "source": "a"},
+            {"id": 2, "grammar": GRAMMAR, "source": "x = 1\n", "recover": True, "max_errors": "abc"},
+            {"id": 3, "grammar": GRAMMAR, "source": "x = 1\n"},
+        ]
+        stdin = io.BytesIO(b"".join((json.dumps(r) + "\n").encode() for r in lines))
+        stdout = io.BytesIO()
+        asyncio.run(self.server.serve_stdio(stdin, stdout))
+        out = {r["id"]: r for r in map(json.loads, stdout.getvalue().splitlines())}
+        self.assertEqual({i: r["status"] for i, r in out.items()}, {1: "bad_request", 2: "bad_request", 3: "ok"})
+        self.assertIn("gramática inválida", out[1]["message"])
+        self.assertEqual(self.server.handle({"op": "stats"})["requests"], 4)
+
+    @unittest.skipUnless(hasattr(socket, "AF_UNIX"), "requiere sockets Unix")
+    def test_unix_socket_and_shutdown(self):
+        path = os.path.join(tempfile.mkdtemp(), "ll1.sock")
+        t = threading.Thread(target=lambda: asyncio.run(self.server.serve_unix(path)))
+        t.start()
+        for _ in range(200):
+            if os.path.exists(path):
+                break
+            threading.Event().wait(0.01)
+        with socket.socket(socket.AF_UNIX) as s:
+            s.connect(path)
+            f = s.makefile("rwb")
+            f.write(b'{"id": "a", "grammar": "grammars/python_subset.g", "source": "print( 1 )\\n"}\n')
+            f.write(b'{"id": "b", "op": "shutdown"}\n')
+            f.flush()
+            got = {json.loads(f.readline())["id"] for _ in range(2)}
+        t.join(5)
+        self.assertFalse(t.is_alive())
+        self.assertEqual(got, {"a", "b"})
+        self.assertFalse(os.path.exists(path))
+
+if __name__ == "__main__":
+    unittest.main()
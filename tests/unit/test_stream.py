@@ -0,0 +1,81 @@
+import io
+import random
+import unittest
+
+from src.lexer.tokenizer import tokenize
+from src.lexer.stream import iter_tokens
+from src.syntax.grammar_cache import compile_grammar
+from src.syntax.parser_ll1 import parse_ll1
+
+SRC = "x = 1 + 2 * 3  # comentario\nprint( x )\ns = 'hola'\n\ny = (x + 10) * 2"
+
+class TestStream(unittest.TestCase):
+    def test_same_tokens_for_any_chunk_size(self):
+        expected = tokenize(SRC)
+        for size in (1, 2, 3, 7, 64):
+            self.assertEqual(list(iter_tokens(io.StringIO(SRC), chunk_size=size)), expected)
+            self.assertEqual(list(iter_tokens(io.BytesIO(SRC.encode("utf-8")), chunk_size=size)), expected)
+
+    def test_crlf_bytes_split_across_chunks(self):
+        data = "x = 1\r\ny = 'é'\r\rz = 2\r\n".encode("utf-8")
+        expected = tokenize("x = 1\ny = 'é'\n\nz = 2\n")
+        for size in (1, 2, 5):
+            self.assertEqual(list(iter_tokens(io.BytesIO(data), chunk_size=size)), expected)
+
+    def test_random_sources_match_tokenize(self):
+        rng = random.Random(3)
+        pieces = ["x", "if", "12", "==", "=", "<", "<=", " ", "  ", "\t", "\n", "# c", "'s s'", "\"t", "(", "$", "\r"]
+        for _ in range(300):
+            src = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 30)))
+            try:
+                expected, err = tokenize(src.replace("\r", "")), None
+            except ValueError as e:
+                expected, err = None, str(e)
+            for size in (1, 2, 3, 5, 8):
+                got = []
+                try:
+                    for tok in iter_tokens(io.StringIO(src.replace("\r", "")), chunk_size=size):
+                        got.append(tok)
+                except ValueError as e:
+                    self.assertEqual(str(e), err, repr(src))
+                    continue
+                self.assertEqual(got, expected, repr(src))
+
+    def test_long_line_is_not_accumulated(self):
+        class Reader(io.StringIO):
+            reads = 0
+            def read(self, n=-1):
+                Reader.reads += 1
+                return super().read(n)
+
+        src = "x = 1 $ " + "y + " * 200000 + "\n"
+        with self.assertRaisesRegex(ValueError, r"linea:1,posicion:7"):
+            list(iter_tokens(Reader(src), chunk_size=64))
+        self.assertLessEqual(Reader.reads, 2)
+        src = "# " + "c" * 100000 + "\n" + "a = 'x" + "y" * 50 + "'" + " b" * 50000
+        expected = tokenize(src)
+        self.assertEqual(list(iter_tokens(io.StringIO(src), chunk_size=7)), expected)
+
+    def test_lexical_error_raised_when_reached(self):
+        it = iter_tokens(io.StringIO("x = 1\ny = 2 $ 3\n"), chunk_size=4)
+        self.assertEqual(next(it), ("identificador", "x", 1, 1))
+        with self.assertRaisesRegex(ValueError, r"linea:2,posicion:7"):
+            list(it)
+
+    def test_parser_pulls_tokens_on_demand(self):
+        with open("grammars/python_subset.g", encoding="utf-8") as f:
+            cg = compile_grammar(f.read())
+        pulled = []
+
+        def tokens():
+            for tok in iter_tokens(io.StringIO("x = = 1\n" + "y = 2\n" * 1000)):
+                pulled.append(tok)
+                yield tok
+
+        ok, msg = parse_ll1(cg.start, cg.G, cg.TABLE, tokens(), rows=cg.ROWS)
+        self.assertFalse(ok)
+        self.assertTrue(msg.startswith("<1,5> Error sintactico"))
+        self.assertEqual(len(pulled), 3)
+
+if __name__ == "__main__":
+    unittest.main()
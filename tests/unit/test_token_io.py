@@ -0,0 +1,121 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from src.lexer.regex_scanner import tokenize_tolerant
+from src.lexer.token_io import (
+    FLAG_ASCII, FLAG_HAS_SOURCE, HEADER, MAGIC, detect_format, open_tokens, write_text, write_tokens,
+)
+from src.lexer.token_store import tokenize_store
+from src.lexer.tokenizer import tokenize
+from src.main import run_parse
+from src.reporter import format_token
+
+SRC = "x = 1\nif x == 1 :\n    print( 'hola' , x )\n# comentario\ny = [ 1 , 2 ]\n"
+
+class TestTokenIO(unittest.TestCase):
+    def test_text_matches_format_token_in_blocks(self):
+        tokens = tokenize(SRC)
+        out = io.StringIO()
+        n = write_tokens(tokens, out, "text")
+        self.assertEqual(n, len(tokens))
+        self.assertEqual(out.getvalue(), "".join(format_token(t) + "\n" for t in tokens))
+        small = io.StringIO()
+        write_text(tokens, small, block=3)
+        self.assertEqual(small.getvalue(), out.getvalue())
+
+    def test_text_writes_tokens_before_a_lexical_error(self):
+        def gen():
+            yield from tokenize("x = 1")
+            raise ValueError("Error léxico(linea:2,posicion:1)")
+        out = io.StringIO()
+        with self.assertRaises(ValueError):
+            write_tokens(gen(), out, "text")
+        self.assertEqual(len(out.getvalue().splitlines()), 3)
+
+    def test_jsonl_round_trip(self):
+        tokens = tokenize(SRC)
+        out = io.StringIO()
+        write_tokens(tokens, out, "jsonl")
+        self.assertEqual([tuple(json.loads(l)) for l in out.getvalue().splitlines()], tokens)
+
+    def test_bin_from_tuples_equals_bin_from_store(self):
+        a, b = io.BytesIO(), io.BytesIO()
+        write_tokens(tokenize(SRC), a, "bin", src=SRC)
+        write_tokens(tokenize_store(SRC), b, "bin", src=SRC)
+        self.assertEqual(a.getvalue(), b.getvalue())
+        magic, flags, tsize, osize, _, ntok, nsrc, _ = HEADER.unpack_from(a.getvalue())
+        self.assertEqual((magic, flags, tsize, osize, ntok, nsrc), (MAGIC, FLAG_ASCII, 1, 4, len(tokenize(SRC)), len(SRC)))
+        c = io.BytesIO()
+        write_tokens(tokenize(SRC), c, "bin", src=SRC, include_source=True)
+        self.assertTrue(c.getvalue().endswith(SRC.encode()))
+        self.assertTrue(HEADER.unpack_from(c.getvalue())[1] & FLAG_HAS_SOURCE)
+
+    def test_error_tokens(self):
+        tokens, errors = tokenize_tolerant("x = $ 1\n", error_tokens=True)
+        out = io.StringIO()
+        write_tokens(tokens, out, "text")
+        self.assertIn(errors[0], out.getvalue().splitlines())
+        write_tokens(tokens, io.BytesIO(), "bin", src="x = $ 1\n")
+
+class TestTokenReaders(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def _save(self, tokens, fmt, src=None, include_source=False):
+        path = os.path.join(self.dir, f"tokens.{fmt}")
+        with open(path, "wb" if fmt == "bin" else "w", encoding=None if fmt == "bin" else "utf-8") as f:
+            write_tokens(tokens, f, fmt, src=src, include_source=include_source)
+        return path
+
+    def test_round_trip_every_format(self):
+        src = SRC + "z = 'á, ñ'\n"
+        tokens = tokenize(src)
+        for fmt in ("text", "jsonl", "bin"):
+            path = self._save(tokens, fmt, src, include_source=True)
+            self.assertEqual(detect_format(path), fmt)
+            with open_tokens(path) as it:
+                self.assertEqual(list(it), tokens, fmt)
+
+    def test_bin_without_source_needs_the_original(self):
+        tokens = tokenize(SRC)
+        path = self._save(tokens, "bin", SRC)
+        with self.assertRaises(ValueError):
+            with open_tokens(path):
+                pass
+        with self.assertRaises(ValueError):
+            with open_tokens(path, source=SRC + " "):
+                pass
+        with open_tokens(path, source=SRC) as it:
+            self.assertEqual(len(it), len(tokens))
+            self.assertEqual(list(it), tokens)
+
+    def test_saved_lexical_error_is_raised_in_place(self):
+        tokens, _ = tokenize_tolerant("x = 1\ny = $ 2\n", error_tokens=True)
+        for fmt in ("text", "jsonl", "bin"):
+            path = self._save(tokens, fmt, "x = 1\ny = $ 2\n", include_source=True)
+            got = []
+            with self.assertRaises(ValueError) as cm:
+                with open_tokens(path) as it:
+                    got.extend(it)
+            self.assertEqual(str(cm.exception), "Error léxico(linea:2,posicion:5)")
+            self.assertEqual(len(got), 5)
+
+    def test_run_parse_from_saved_tokens(self):
+        g = "grammars/python_subset.g"
+        src_path = "examples/python/ok/mini2.py"
+        with open(src_path, encoding="utf-8") as f:
+            src = f.read()
+        tokens = tokenize(src)
+        text_path = self._save(tokens, "text")
+        self.assertEqual(run_parse(g, None, tokens_in=text_path), 0)
+        bin_path = self._save(tokens, "bin", src)
+        self.assertEqual(run_parse(g, src_path, tokens_in=bin_path), 0)
+        self.assertEqual(run_parse(g, None, tokens_in=bin_path), 1)  # sin la fuente
+        bad = self._save(tokenize("x = = 1\n"), "jsonl")
+        self.assertEqual(run_parse(g, None, tokens_in=bad), 2)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,36 @@
+import unittest
+
+from src.lexer.token_io import to_arrays
+from src.lexer.tokenizer import tokenize
+from src.lexer.token_store import tokenize_store
+
+SRC = "x = 1 + 2  # c\n\nif x >= 10:\n\tprint('hola', x)\n"
+
+class TestTokenStore(unittest.TestCase):
+    def test_tuple_interface_matches_tokenize(self):
+        store = tokenize_store(SRC)
+        expected = tokenize(SRC)
+        self.assertEqual(len(store), len(expected))
+        self.assertEqual(list(store), expected)
+        self.assertEqual([store[i] for i in range(len(store))], expected)
+        self.assertEqual(store[-1], expected[-1])
+        self.assertEqual(store[2:4], expected[2:4])
+
+    def test_lazy_accessors(self):
+        store = tokenize_store(SRC)
+        self.assertEqual(store.lexeme(12), "'hola'")
+        self.assertEqual(store.type_name(12), "tk_cadena")
+        self.assertEqual(store.position(12), (4, 8))
+
+    def test_compact_offsets(self):
+        store = tokenize_store(SRC)
+        self.assertEqual((store.types.itemsize, store.starts.itemsize, store.ends.itemsize), (1, 4, 4))
+        self.assertEqual(store.line_starts().itemsize, 4)
+        self.assertIs(to_arrays(store, SRC)[1], store.starts)  # sin copiar al guardar
+
+    def test_same_error_message(self):
+        with self.assertRaisesRegex(ValueError, r"^Error léxico\(linea:2,posicion:3\)$"):
+            tokenize_store("x\ny $")
+
+if __name__ == "__main__":
+    unittest.main()